@@ -3,13 +3,40 @@ import argparse
 import yaml
 import os
 import re
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from utils.md_parser import parse_code_from_md
 
-from llm.llm import query
-from llm.agent.content_gen import generate_resume_content, generate_resume_content_with_eval
+from llm.llm import query, warm_clients
+from llm.agent.content_gen import generate_resume_content, generate_resume_content_with_eval, generate_resume_patch_with_eval
 from llm.agent.eval import eval_content
 
+from llm.token_budget import budget_components, count_tokens
+
+from scraper.url_canonical import canonicalize_url
+from scraper.scrape_cache import get_cached_scrape, get_stale_scrape, refresh_scrape, store_scrape
+from scraper.driver_pool import configure_driver_pools, close_driver_pools, warm_site_driver
+from scraper.engine import ScrapeEngine
+from scraper.readerapi_scraper import configure_reader_api, get_reader_client
+from scraper.driver_resolver import configure_chromedriver
+from scraper.readiness import configure_readiness
+from scraper.resource_blocking import configure_resource_blocking
+
+from builder.renderer import render_all
+from builder.layout_estimator import estimate_layout, fit_feedback, single_page_required
+
+from utils.keywords import load_skills_lexicon, load_corpus_stats, get_or_build_keyword_index, format_keywords_for_prompt, score_keyword_coverage
+from utils.profile_slicer import build_profile_slices, render_profile_slice, save_profile_slices
+from utils.job_normalizer import normalize_job_markdown, save_normalized_job
+from utils.run_index import compute_run_fingerprint, profile_fingerprint, lookup_run, record_run
+from utils.near_dup import minhash_signature, find_near_duplicates, confirm_reuse, add_job
+from utils.resume_sections import parse_resume_sections, extract_resume_feedback, flagged_sections, apply_section_patches
+from utils.fact_verifier import build_profile_index, verify_resume, format_fact_report, save_fact_check
+from utils.artifact_store import RunState, load_artifact
+from utils.job_archive import archive_runs, restore_archived
+from utils.profile_render import find_profile_json, load_profile_json, render_factual_sections, merge_factual_sections, LOCAL_SECTIONS
+
 def load_config():
     """
     Load configuration from config.yaml file.
@@ -44,7 +71,8 @@ def parse_arguments():
     print(f"Using content generation model: {content_gen_model}")
 
     parser = argparse.ArgumentParser(description="Resume Builder")
-    parser.add_argument('--url', type=str, required=True, help='URL to scrape data from')
+    parser.add_argument('--url', type=str, help='URL to scrape data from')
+    parser.add_argument('--batch', type=str, help='Text file with one job URL per line, processed with a shared warm browser pool')
 
     parser.add_argument("--verbose-strategies", default=True, action="store_true", help="Generate detailed resume tailoring strategies with reasoning and keyword highlights."
 )
@@ -54,9 +82,51 @@ def parse_arguments():
     parser.add_argument('--code-gen-model', type=str, default=code_gen_model, help='Model to use for code generation')
     parser.add_argument('--output-format', type=str, choices=['pdf', 'docx'], default=output_format, help='Output format for the resume')
     parser.add_argument('--content-iter', type=int, default=content_gen_iter, help='Number of iterations for content generation')
+    parser.add_argument('--force', action='store_true', help='Run the full pipeline even if results exist for the same job, profile and configuration')
+    parser.add_argument('--rescrape', action='store_true', help='Scrape the job posting again even if a recent scrape is cached')
 
     return parser.parse_args()
 
+def validate_url(url):
+    """
+    Validate a job posting URL.
+
+    Args:
+        url (str): The URL.
+
+    Raises:
+        ValueError: If the URL is invalid.
+    """
+    if not url.startswith('http'):
+        raise ValueError("Invalid URL provided. It should start with 'http' or 'https'.")
+    
+    link_regex  = r'^https?://(?:www\.)?[^\s/$.?#].[^\s]*$'
+
+    if not re.match(link_regex, url):
+        raise ValueError("Invalid URL format. Please provide a valid URL. It should start with 'http' or 'https' and be a valid web address.\n Example: https://example.com")
+
+
+def load_batch_urls(batch_file):
+    """
+    Read the job URLs of a batch file.
+
+    Blank lines and lines starting with '#' are ignored.
+
+    Args:
+        batch_file (str): Path of the batch file.
+
+    Returns:
+        list: Validated URLs, in file order.
+    """
+    with open(batch_file, 'r', encoding='utf-8') as f:
+        urls = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+    for url in urls:
+        validate_url(url)
+    if not urls:
+        raise ValueError(f"No URLs found in batch file '{batch_file}'.")
+    return urls
+
+
 def validate_arguments(args):
     """
     Validate the command line arguments.
@@ -67,13 +137,14 @@ def validate_arguments(args):
     Raises:
         ValueError: If any argument is invalid.
     """
-    if not args.url.startswith('http'):
-        raise ValueError("Invalid URL provided. It should start with 'http' or 'https'.")
-    
-    link_regex  = r'^https?://(?:www\.)?[^\s/$.?#].[^\s]*$'
+    if not args.url and not args.batch:
+        raise ValueError("URL must be provided for scraping data. Use --url, or --batch with a file of URLs.")
 
-    if not re.match(link_regex, args.url):
-        raise ValueError("Invalid URL format. Please provide a valid URL. It should start with 'http' or 'https' and be a valid web address.\n Example: https://example.com")
+    if args.batch and not os.path.exists(args.batch):
+        raise ValueError(f"Batch file '{args.batch}' does not exist.")
+
+    if args.url:
+        validate_url(args.url)
 
     # store data/profle-data/profiles in var of the profile path
     # check if profile path is an existing file
@@ -107,40 +178,85 @@ def validate_arguments(args):
     if not args.code_gen_model:
         raise ValueError("Code generation model must be specified.")
     
-    if not args.url:
-        raise ValueError("URL must be provided for scraping data.")
-    
     if not args.profile:
         raise ValueError("User profile must be provided for resume generation.")
     
     print("All arguments are valid.")
 
 
-def scrape_url(url, args):
+def scrape_url(url, args, cfg=None):
+    """
+    Scrape a job posting, reusing a recent scrape of the same posting.
+
+    An expired scrape is reused when a conditional request (ETag /
+    Last-Modified) shows the page is unchanged. Otherwise a plain HTTP fetch
+    (JSON-LD JobPosting or server-rendered HTML) is tried first; Selenium or
+    the Reader API is only used when it fails.
+
+    Args:
+        url (str): Job posting URL.
+        args (argparse.Namespace): Parsed command line arguments.
+        cfg (dict): Configuration dictionary (uses the optional 'scrape-cache' and 'http-first' sections).
+
+    Returns:
+        tuple: (job store key, Markdown file path).
+    """
+    cache_cfg = (cfg or {}).get('scrape-cache', {})
+    # The canonical form only identifies the posting; the URL is fetched as given
+    canonical = canonicalize_url(url)
+    use_cache = cache_cfg.get('enabled', True) and not getattr(args, 'rescrape', False)
+    if use_cache:
+        cached = get_cached_scrape(canonical['key'], cache_cfg.get('ttl_hours', 24))
+        if cached:
+            print(f"♻️ Using cached scrape of {canonical['key']}: {cached[1]}")
+            return cached
+        stale = get_stale_scrape(canonical['key']) if cache_cfg.get('revalidate', True) else None
+        if stale:
+            from scraper.http_scraper import revalidate
+            if revalidate(url, stale.get('etag'), stale.get('last_modified')):
+                refresh_scrape(canonical['key'])
+                print(f"♻️ Page unchanged since last scrape (304), reusing {stale['md_file']}")
+                return (stale.get('job_key'), stale['md_file'])
+
+    files, validators = None, {}
+    http_cfg = (cfg or {}).get('http-first', {})
+    if http_cfg.get('enabled', True):
+        from scraper.http_scraper import scrape_http
+        files, validators = scrape_http(url, canonical['site'], http_cfg.get('timeout', 10), http_cfg.get('min_description_chars', 200))
+        if not files:
+            print("🌐 Escalating to browser scraping...")
+    if not files:
+        files = _scrape(url)
+    if files and cache_cfg.get('enabled', True):
+        store_scrape(canonical['key'], url, files, validators)
+    return files
+
+
+def _scrape(url):
 
     try:
         if "linkedin" in url:
-            if args.url.startswith("https://www.linkedin.com/jobs/view/"):
+            if url.startswith("https://www.linkedin.com/jobs/view/"):
                 from scraper.linkedin_scraper import scrape_linkedin_job
-                return scrape_linkedin_job(args.url)
+                return scrape_linkedin_job(url)
             else:
                 raise ValueError("Invalid LinkedIn job URL. Please provide a valid LinkedIn job URL starting with 'https://www.linkedin.com/jobs/view/'.")
             
         elif "indeed" in url:
             if "indeed.com/viewjob?jk=" in url:
                 from scraper.indeed_scraper import scrape_indeed_job
-                return scrape_indeed_job(args.url)
+                return scrape_indeed_job(url)
             else:
                 raise ValueError("Invalid Indeed job URL. Please provide a valid Indeed job URL starting with 'https://www.indeed.com/viewjob?jk='.")
         elif "glassdoor" in url:
             if "/job-listing/" in url:
                 from scraper.glassdoor_scraper import scrape_glassdoor_job
-                return scrape_glassdoor_job(args.url)
+                return scrape_glassdoor_job(url)
             else:
                 raise ValueError("Invalid Glassdoor job URL. Please provide a valid Glassdoor job URL containing '/job-listing/'.")
         elif url not in ["linkedin", "indeed", "glassdoor"]:
             from scraper.readerapi_scraper import scrape_with_readerapi
-            return scrape_with_readerapi(args.url)
+            return scrape_with_readerapi(url)
         else:
             raise ValueError("Unsupported job site. Please provide a valid LinkedIn, Indeed, or Glassdoor job URL.")
     except Exception as e:
@@ -150,179 +266,361 @@ def scrape_url(url, args):
 
 
 
-def main():
+def load_profile(profile_name):
+    """
+    Resolve and read the applicant profile.
+
+    Args:
+        profile_name (str): Profile file name ending in '.json' or '.md'.
+
+    Returns:
+        dict: 'file', 'content', 'json_file' (None if there is no profile JSON) and 'data'.
+    """
+    profile_dir = os.path.join('data', 'profile-data', 'profiles')
+    if profile_name.endswith('.json'):
+        profile_file = os.path.join(profile_dir, 'json', profile_name)
+    elif profile_name.endswith('.md'):
+        profile_file = os.path.join(profile_dir, 'md', profile_name)
+    else:
+        raise ValueError("Profile file must be a JSON or Markdown file. Please provide a valid profile name ending with '.json' or '.md'.")
+    if not os.path.exists(profile_file):
+        raise ValueError(f"Profile file '{profile_name}' does not exist in {profile_dir}. Please provide a valid profile name.")
+    print(f"Profile file to be used: {profile_file}")
+    
+    with open(profile_file, 'r', encoding='utf-8') as f:
+        profile_content = f.read()
+
+    profile_json_file = find_profile_json(profile_file)
+    profile_data = load_profile_json(profile_json_file) if profile_json_file else None
+    return {'file': profile_file, 'content': profile_content, 'json_file': profile_json_file, 'data': profile_data}
+
+
+def _warm(label, warm_up):
+    """Run a warm-up step; failures only cost the time the step would have saved."""
     try:
-        config = load_config()
-        args = parse_arguments()
-        cfg = config.copy()
+        warm_up()
+    except Exception as e:
+        print(f"⚠️ Warm start of {label} failed, it will be set up on first use: {e}")
 
-        validate_arguments(args)
-        
-        cfg['agent']['content-gen']['model'] = args.content_gen_model if args.content_gen_model else cfg['agent']['content-gen']['model']
-        cfg['agent']['eval']['model'] = args.evaluation_model if args.evaluation_model else cfg['agent']['eval']['model']
-        cfg['agent']['code-gen']['model'] = args.code_gen_model if args.code_gen_model else cfg['agent']['code-gen']['model']
-        cfg['output']['format'] = args.output_format if args.output_format else cfg['output']['format']
-        cfg['agent']['content-gen']['iter'] = args.content_iter if args.content_iter else cfg['agent']['content-gen']['iter']
-        
 
-        print(f"Configuration loaded successfully: {cfg}")
+def _warm_scraper(url, args, cfg):
+    """
+    Open the connection the URL's scraper will use first.
 
-        # Scrape the URL provided in the arguments
-        ( output_file, output_md_file ) = scrape_url(args.url, args)
-        print("URL scraping completed successfully.")
-        
-        
-        profile_dir = os.path.join('data', 'profile-data', 'profiles')
-        if args.profile.endswith('.json'):
-            profile_file = os.path.join(profile_dir, 'json', args.profile)
-        elif args.profile.endswith('.md'):
-            profile_file = os.path.join(profile_dir, 'md', args.profile)
-        else:
-            raise ValueError("Profile file must be a JSON or Markdown file. Please provide a valid profile name ending with '.json' or '.md'.")
-        if not os.path.exists(profile_file):
-            raise ValueError(f"Profile file '{args.profile}' does not exist in {profile_dir}. Please provide a valid profile name.")
-        print(f"Profile file to be used: {profile_file}")
-        
-        with open(profile_file, 'r', encoding='utf-8') as f:
-            profile_content = f.read()
+    With http-first enabled that is the pooled HTTP session; the browser or the
+    Reader API connection is only prepared when http-first is disabled, since
+    the HTTP path usually succeeds without them.
+    """
+    canonical = canonicalize_url(url)
+    cache_cfg = cfg.get('scrape-cache', {})
+    if cache_cfg.get('enabled', True) and not getattr(args, 'rescrape', False) \
+            and get_cached_scrape(canonical['key'], cache_cfg.get('ttl_hours', 24)):
+        return
+    http_cfg = cfg.get('http-first', {})
+    if http_cfg.get('enabled', True):
+        from scraper.http_scraper import warm_session
+        warm_session(url, http_cfg.get('timeout', 10))
+    elif canonical['site'] == 'web':
+        get_reader_client().warm()
+    elif warm_site_driver(canonical['site']):
+        print(f"🔥 Browser for {canonical['site']} started in the background")
+
+
+def start_warmup(url, args, cfg):
+    """
+    Start the slow setup steps of a run in the background.
 
-        job_details_md = output_md_file
-        # Read the job details content  
-        with open(job_details_md, 'r', encoding='utf-8') as f:
-            job_content = f.read()
-        
+    The scraper's HTTP session (or, without http-first, its browser or Reader
+    API connection), the profile, the keyword lexicon and corpus statistics,
+    the tokenizer and the LLM clients are set up in parallel, so the scraper's
+    setup overlaps the rest instead of adding to it.
 
-        
-        strategy_prompt = [
-        {
-            "role": "system",
-            "content": (
-                "You are a professional career strategist and resume optimizer.\n"
-                "Your task is to analyze a job description and generate diverse resume-tailoring strategies that emphasize different aspects of the applicant's background.\n"
-                "Each strategy should take a unique angle (e.g., technical strength, leadership, project innovation, etc.).\n"
-                "These will later guide an AI in writing multiple resume versions.\n"
-                "CRITICAL: Base strategies ONLY on the provided profile information. Do not assume or add any details not explicitly mentioned.\n"
-                "Please do not add any additional information, sentences or context beyond the strategies.\n"
-                "Each strategy should be concise, focused, and actionable.\n"
-                "The strategies should be distinct and cover a wide range of angles to ensure comprehensive coverage of the applicant's qualifications. The strategies should be very descriptive.\n"
-                
-            )
-        },
-        {
-            "role": "user",
-            "content": (
-                f"**Job Description:**\n\n{job_content}\n\n"
-                f"**Profile Information:**\n\n{profile_content}\n\n"
-                f"Generate {cfg['agent']['content-gen']['iter']} distinct strategies for tailoring a resume to this job. Return them as a numbered Markdown list. Each strategy should be 1-2 sentences describing the emphasis or narrative angle."
-            )
-        }
-        ]
-        
+    Args:
+        url (str): First job posting URL.
+        args (argparse.Namespace): Parsed command line arguments.
+        cfg (dict): Configuration dictionary (uses the optional 'warm-start' section).
+
+    Returns:
+        Future: Resolves to the load_profile result; it re-raises profile errors.
+    """
+    warm_cfg = cfg.get('warm-start', {})
+    models = [cfg['agent'][agent]['model'] for agent in ('content-gen', 'eval', 'code-gen')]
+    executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="warm")
+    if warm_cfg.get('scraper', True):
+        executor.submit(_warm, "the scraper", lambda: _warm_scraper(url, args, cfg))
+    profile = executor.submit(load_profile, args.profile)
+    executor.submit(_warm, "the keyword index", lambda: (
+        load_skills_lexicon(),
+        load_corpus_stats(cfg.get('keywords', {}).get('ngram_max', 3)),
+        count_tokens("warm-up", cfg['agent']['content-gen']['model']),
+    ))
+    executor.submit(_warm, "the LLM clients", lambda: warm_clients(models))
+    # Worker threads keep running; the executor only stops accepting work
+    executor.shutdown(wait=False)
+    return profile
+
+
+def run_job(url, args, cfg, scraped_files=None, profile=None):
+    """
+    Run the full pipeline for one job posting.
+
+    Args:
+        url (str): Job posting URL.
+        args (argparse.Namespace): Parsed command line arguments.
+        cfg (dict): Configuration dictionary.
+        scraped_files (tuple): (job store key, Markdown file path) if the posting was already scraped.
+        profile (dict): load_profile result if the profile was already loaded.
+    """
+    # Scrape the URL provided in the arguments
+    ( job_key, output_md_file ) = scraped_files or scrape_url(url, args, cfg)
+    print("URL scraping completed successfully.")
+    
+    
+    profile = profile or load_profile(args.profile)
+    profile_file = profile['file']
+    profile_content = profile['content']
+    profile_json_file = profile['json_file']
+    profile_data = profile['data']
+
+    # Header, Education and Certifications are rendered locally from the profile JSON when it is available
+    factual_sections = None
+    if profile_data and cfg.get('profile-render', {}).get('enabled', True):
+        factual_sections = render_factual_sections(profile_data)
+        print(f"Factual sections will be rendered locally from {profile_json_file}")
+    omit_factual_sections = factual_sections is not None
+
+    # Entry-level applicants are held to a single page
+    layout_cfg = cfg.get('layout', {})
+    max_pages = 1 if single_page_required(cfg, profile_data, profile_content) else layout_cfg.get('max-pages', 2)
+    print(f"Page limit for the drafts: {max_pages}")
+
+    # Facts in the drafts are checked locally against the full profile, not by the LLM judge
+    verify_cfg = cfg.get('verify', {})
+    profile_index = build_profile_index(profile_data, profile_content) if verify_cfg.get('enabled', True) else None
+
+    job_details_md = output_md_file
+    # Read the job details content, stripping boilerplate before it reaches any prompt
+    with open(job_details_md, 'r', encoding='utf-8') as f:
+        job_content = f.read()
+    normalize_enabled = cfg.get('normalize', {}).get('enabled', True)
+    if normalize_enabled:
+        job_content, normalize_report = normalize_job_markdown(job_content)
+        print(f"Job description normalized: {normalize_report['original_tokens']} -> {normalize_report['normalized_tokens']} tokens "
+              f"({normalize_report['tokens_saved']} saved, {sum(normalize_report['removed_lines'].values())} lines removed).")
+
+    # Return the results of an identical earlier run (same job, profile and config) unless --force is given
+    run_fingerprint = compute_run_fingerprint(job_content, profile_content, cfg, profile_data)
+    previous_run = None if args.force else lookup_run(run_fingerprint)
+    if previous_run:
+        print(f"✅ Identical run found ({run_fingerprint}) from {previous_run['created']}; reusing {previous_run['job_dir']}")
+        if previous_run['archived']:
+            restored = restore_archived(previous_run['job_dir'])
+            print(f"♻️ Restored {len(restored)} archived files to {previous_run['job_dir']}")
+        print(f"✅ Rendered resumes: {', '.join(previous_run['rendered'] or previous_run['resumes'])}")
+        print("Use --force to run the pipeline again.")
+        return
+
+    # Each run gets its own job_title_timestamp_fingerprint directory, so reruns of a cached
+    # scrape with another model or config (or --force) never overwrite an earlier run
+    job_title = f"{os.path.splitext(os.path.basename(output_md_file))[0]}_{run_fingerprint[:8]}"
+    job_resumes_dir = os.path.join('data', 'job-data', job_title)
+    if os.path.exists(job_resumes_dir):
+        job_title = f"{job_title}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        job_resumes_dir = os.path.join('data', 'job-data', job_title)
+    os.makedirs(job_resumes_dir, exist_ok=True)
+    # Strategies, resumes and evaluations are kept in memory and written through to the job's artifact store
+    run_state = RunState(job_resumes_dir, export_legacy=cfg.get('artifact-store', {}).get('export_legacy', False))
+    if normalize_enabled:
+        save_normalized_job(job_content, job_resumes_dir)
+
+    # The same role posted on another job board can start from an earlier job's strategies and resumes
+    near_dup_cfg = cfg.get('near-dup', {})
+    profile_hash = profile_fingerprint(profile_content, profile_data)
+    job_signature = None
+    reuse_job = None
+    if near_dup_cfg.get('enabled', True):
+        job_signature = minhash_signature(job_content)
+        matches = find_near_duplicates(job_signature, profile_hash, near_dup_cfg.get('threshold', 0.8),
+                                       min_strategies=cfg['agent']['content-gen']['iter'])
+        if matches and confirm_reuse(matches[0], near_dup_cfg.get('reuse', 'ask')):
+            reuse_job = matches[0]
+
+    # Extract the job keywords once and reuse them in every prompt
+    keyword_index = get_or_build_keyword_index(job_content, job_resumes_dir, cfg)
+    keywords_md = format_keywords_for_prompt(keyword_index)
+    print(f"Keyword index ready: {len(keyword_index['skills'])} skills, {len(keyword_index['keywords'])} key terms.")
+
+    # Only the profile sections relevant to the job go into the strategy prompt
+    content_gen_model = cfg['agent']['content-gen']['model']
+    token_counter = lambda text: count_tokens(text, content_gen_model)
+    profile_slices = build_profile_slices(profile_content, keyword_index, [], cfg, token_counter=token_counter)
+    job_profile = render_profile_slice(profile_content, profile_slices, 'job')
+    strategy_system_prompt = (
+        "You are a professional career strategist and resume optimizer.\n"
+        "Your task is to analyze a job description and generate diverse resume-tailoring strategies that emphasize different aspects of the applicant's background.\n"
+        "Each strategy should take a unique angle (e.g., technical strength, leadership, project innovation, etc.).\n"
+        "These will later guide an AI in writing multiple resume versions.\n"
+        "CRITICAL: Base strategies ONLY on the provided profile information. Do not assume or add any details not explicitly mentioned.\n"
+        "Please do not add any additional information, sentences or context beyond the strategies.\n"
+        "Each strategy should be concise, focused, and actionable.\n"
+        "The strategies should be distinct and cover a wide range of angles to ensure comprehensive coverage of the applicant's qualifications. The strategies should be very descriptive.\n"
+    )
+    strategy_instructions = f"Generate {cfg['agent']['content-gen']['iter']} distinct strategies for tailoring a resume to this job. Return them as a numbered Markdown list. Each strategy should be 1-2 sentences describing the emphasis or narrative angle."
+    # The system prompt and the instructions count against the input budget too
+    strategy_inputs = budget_components(
+        {"job": job_content, "profile": job_profile, "keywords": keywords_md},
+        model_name=content_gen_model,
+        cfg=cfg,
+        label="strategies",
+        fixed_tokens=count_tokens(strategy_system_prompt + strategy_instructions, content_gen_model),
+        query=keywords_md,
+    )
+    
+    strategy_prompt = [
+    {
+        "role": "system",
+        "content": strategy_system_prompt
+    },
+    {
+        "role": "user",
+        "content": (
+            f"**Job Description:**\n\n{strategy_inputs['job']}\n\n"
+            f"**Job Keywords:**\n\n{keywords_md}\n\n"
+            f"**Profile Information:**\n\n{strategy_inputs['profile']}\n\n"
+            f"{strategy_instructions}"
+        )
+    }
+    ]
+    
+    if reuse_job:
+        response = load_artifact(reuse_job['job_dir'], 'strategies.md')
+        print(f"Reusing strategies from {reuse_job['job_dir']}")
+    else:
         response = query(model_name=cfg['agent']['content-gen']['model'], cfg=cfg, prompt=strategy_prompt, temperature=cfg['agent']['content-gen']['temperature'], max_tokens=cfg['agent']['content-gen']['max_tokens'])
-        
-        if response is None or not response.strip():
-            raise ValueError("No response received from the LLM. Please check the model and configuration.")
-        
-        # Write the strategies to a file in the data/job-data/job_title_timestamp/ directory. the job_title_timestamp can be derived from output_md_file without the .md
-        job_title = os.path.splitext(os.path.basename(output_md_file))[0]
-        job_resumes_dir = os.path.join('data', 'job-data', job_title )
-        os.makedirs(job_resumes_dir, exist_ok=True)
-        strategies_file = os.path.join(job_resumes_dir, 'strategies.md')
-        with open(strategies_file, 'w') as f:
-            f.write(response.strip())
-            
-        
-        
-        print(f"Strategies written to {strategies_file}")
-        
-        # Read Strategies from the strategies_file which are numbered 1,2,3,4,5,6, and convert them into a list
-        with open(strategies_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+    
+    if response is None or not response.strip():
+        raise ValueError("No response received from the LLM. Please check the model and configuration.")
+    
+    # Store the strategies in the run state (data/job-data/<job>/artifacts.sqlite3)
+    run_state.put('strategies.md', response.strip())
+    print(f"Strategies stored in the artifact store of {job_resumes_dir}")
+    
+    content = run_state.get('strategies.md')
 
-        # Parse numbered strategies properly
-        import re
-        strategy_pattern = r'^\d+\.\s*(.+?)(?=^\d+\.\s|\Z)'
-        strategies = re.findall(strategy_pattern, content, re.MULTILINE | re.DOTALL)
-        strategies = [s.strip().replace('\n', ' ') for s in strategies if s.strip()]
+    # Parse numbered strategies properly
+    import re
+    strategy_pattern = r'^\d+\.\s*(.+?)(?=^\d+\.\s|\Z)'
+    strategies = re.findall(strategy_pattern, content, re.MULTILINE | re.DOTALL)
+    strategies = [s.strip().replace('\n', ' ') for s in strategies if s.strip()]
 
-        if not strategies:
-            raise ValueError("No strategies found in the strategies file. Please check the content generation step.")
+    if not strategies:
+        raise ValueError("No strategies found in the strategies response. Please check the content generation step.")
 
-        print(f"Strategies loaded: {len(strategies)} strategies found.")
-        
-        
-        improve_rate = cfg['improv-rate']
-        
-        # If improve rate is not an integer, convert it to an integer
-        if not isinstance(improve_rate, int):
-            try:
-                improve_rate = int(improve_rate)
-            except ValueError:
-                raise ValueError("Invalid improvement rate. It should be an integer value.")
-        
-        # generate and eval and regenerate based on feedback on eval based on cfg's improv-rate value
-        print(f"Starting iterative resume generation with {improve_rate} improvement iterations...")
-        
-        iteration = 0
+    print(f"Strategies loaded: {len(strategies)} strategies found.")
+
+    # Select the profile slice for each strategy and record it so the evaluation sees the same slice
+    profile_slices = build_profile_slices(profile_content, keyword_index, strategies, cfg, token_counter=token_counter)
+    slices_file = save_profile_slices(profile_slices, job_resumes_dir)
+    strategy_profiles = [render_profile_slice(profile_content, profile_slices, j + 1) for j in range(len(strategies))]
+    eval_profile = render_profile_slice(profile_content, profile_slices, 'eval')
+    print(f"Profile slices written to {slices_file}")
+    
+    
+    improve_rate = cfg['improv-rate']
+    
+    # If improve rate is not an integer, convert it to an integer
+    if not isinstance(improve_rate, int):
+        try:
+            improve_rate = int(improve_rate)
+        except ValueError:
+            raise ValueError("Invalid improvement rate. It should be an integer value.")
+    
+    # generate and eval and regenerate based on feedback on eval based on cfg's improv-rate value
+    print(f"Starting iterative resume generation with {improve_rate} improvement iterations...")
+    
+    iteration = 0
+    
+    while True:
+        print(f"Creating initial resume content with strategies")
+        # create version n dir for  resume content
+        version_dir = os.path.join(job_resumes_dir, f'version_{iteration}')
+        os.makedirs(version_dir, exist_ok=True)
         
-        while True:
-            print(f"Creating initial resume content with strategies")
-            # create version n dir for  resume content
-            version_dir = os.path.join(job_resumes_dir, f'version_{iteration}')
-            os.makedirs(version_dir, exist_ok=True)
-            
-            if iteration == 0:
-                # Generate initial resume content
-                for j in range(cfg["agent"]["content-gen"]["iter"]):
-                    strategy = strategies[j]
-                    resume_content = generate_resume_content(cfg=cfg, strategy=strategy, job_details=job_content, profile=profile_content)
-                    if resume_content is None or not resume_content.strip():
-                        raise ValueError("No content generated for the resume. Please check the content generation step.")
-                    
-                    processed_content = parse_code_from_md(resume_content)
-                    if processed_content is None:
-                        raise ValueError("No code blocks found in the resume content. Please check the content generation step.")
-                    
-                    resume_file = os.path.join(version_dir, f'resume_{j+1}.md')
-                    with open(resume_file, 'w', encoding='utf-8') as f:
-                        f.write(resume_content.strip())
-                        
-            if iteration > 0:
-                # get previous resume content and generate improved content based on evaluation feedback of previous iteration
-                print(f"Generating improved resume content for version {iteration} based on previous content and evaluation feedback...")
-                if not os.path.exists(strategies_file):
-                    raise FileNotFoundError(f"Strategies file '{strategies_file}' does not exist.Cannot generate improved content.")
+        if iteration == 0:
+            # Generate initial resume content
+            for j in range(cfg["agent"]["content-gen"]["iter"]):
+                strategy = strategies[j]
+                # The near-duplicate job may have been archived since (utils/job_archive.py)
+                reused_name = f"{os.path.basename(reuse_job['version_dir'])}/resume_{j+1}.md" if reuse_job else None
+                reused_content = load_artifact(reuse_job['job_dir'], reused_name) if reuse_job else None
+                if reused_content:
+                    # Start from the near-duplicate job's final resume; the improvement iterations adapt it
+                    resume_content = f"```markdown\n{reused_content.strip()}\n```"
+                    print(f"Reusing {reuse_job['job_dir']}/{reused_name} as the initial draft of resume {j+1}")
+                else:
+                    resume_content = generate_resume_content(cfg=cfg, strategy=strategy, job_details=job_content, profile=strategy_profiles[j], keywords=keywords_md, omit_factual_sections=omit_factual_sections)
+                if resume_content is None or not resume_content.strip():
+                    raise ValueError("No content generated for the resume. Please check the content generation step.")
                 
-                # get previous evaluation feedback
-                eval_file = os.path.join(job_resumes_dir, f'version_{iteration-1}', 'evaluation.md')
-                if not os.path.exists(eval_file):
-                    raise FileNotFoundError(f"Evaluation file '{eval_file}' does not exist. Cannot generate improved content.")
-                with open(eval_file, 'r', encoding='utf-8') as f:
-                    eval_response = f.read().strip()
-                    
-                if eval_response is None or not eval_response.strip():
-                    raise ValueError("No evaluation response received from the LLM. Please check the evaluation model and configuration.")
-                print(f"Using evaluation feedback from previous iteration: {eval_response}")
+                processed_content = parse_code_from_md(resume_content)
+                if processed_content is None:
+                    raise ValueError("No code blocks found in the resume content. Please check the content generation step.")
+
+                if factual_sections:
+                    resume_content = merge_factual_sections(resume_content, factual_sections)
                 
-                print(f"Generating improved resume content for version {iteration}...")
-             
+                run_state.put(f'version_{iteration}/resume_{j+1}.md', resume_content.strip())
+                    
+        if iteration > 0:
+            # get previous resume content and generate improved content based on evaluation feedback of previous iteration
+            print(f"Generating improved resume content for version {iteration} based on previous content and evaluation feedback...")
+            # get previous evaluation feedback
+            eval_response = run_state.get(f'version_{iteration-1}/evaluation.md')
                 
-                for j in range(cfg["agent"]["content-gen"]["iter"]):
-                    strategy = strategies[j]
-                    # get previous resume content
-                    previous_resume_file = os.path.join(job_resumes_dir, f'version_{iteration-1}', f'resume_{j+1}.md')
-                    if not os.path.exists(previous_resume_file):    
-                        raise FileNotFoundError(f"Previous resume file '{previous_resume_file}' does not exist. Cannot generate improved content.")
-                    with open(previous_resume_file, 'r', encoding='utf-8') as f:
-                        previous_resume_content = f.read().strip()
-                        
+            if eval_response is None or not eval_response.strip():
+                raise ValueError("No evaluation response received from the LLM. Please check the evaluation model and configuration.")
+            print(f"Using evaluation feedback from previous iteration: {eval_response}")
+            
+            print(f"Generating improved resume content for version {iteration}...")
+         
+            
+            for j in range(cfg["agent"]["content-gen"]["iter"]):
+                strategy = strategies[j]
+                # get previous resume content
+                previous_resume_content = run_state.get(f'version_{iteration-1}/resume_{j+1}.md')
+
+                resume_content = None
+                if cfg['agent']['content-gen'].get('patch-mode', True):
+                    # Only regenerate the sections the evaluation flagged for this resume
+                    resume_feedback = extract_resume_feedback(eval_response, j + 1)
+                    sections = flagged_sections(resume_feedback, parse_resume_sections(previous_resume_content),
+                                                exclude=LOCAL_SECTIONS if factual_sections else ())
+                    if sections:
+                        print(f"Patching resume {j+1} sections: {', '.join(sections)}")
+                        patch_content = generate_resume_patch_with_eval(
+                            cfg=cfg,
+                            strategy=strategy,
+                            job_details=job_content,
+                            profile=strategy_profiles[j],
+                            previous_resume_content=previous_resume_content,
+                            eval_response=resume_feedback,
+                            sections=sections,
+                            keywords=keywords_md
+                        )
+                        resume_content, applied = apply_section_patches(previous_resume_content, patch_content or "", sections)
+                        if resume_content is None:
+                            print(f"⚠️ No usable section patches for resume {j+1}, falling back to a full rewrite.")
+
+                if resume_content is None:
                     resume_content = generate_resume_content_with_eval(
                         cfg=cfg, 
                         strategy=strategy, 
                         job_details=job_content, 
-                        profile=profile_content, 
+                        profile=strategy_profiles[j], 
                         previous_resume_content=previous_resume_content,
-                        eval_response=eval_response
+                        eval_response=eval_response,
+                        keywords=keywords_md,
+                        omit_factual_sections=omit_factual_sections
                     )
                     
                     if resume_content is None or not resume_content.strip():
@@ -331,49 +629,204 @@ def main():
                     processed_content = parse_code_from_md(resume_content)
                     if processed_content is None:
                         raise ValueError("No code blocks found in the resume content. Please check the content generation step.")
-                    
-                    resume_file = os.path.join(version_dir, f'resume_{j+1}.md')
-                    with open(resume_file, 'w', encoding='utf-8') as f:
-                        f.write(resume_content.strip())
+
+                    if factual_sections:
+                        resume_content = merge_factual_sections(resume_content, factual_sections)
+                
+                run_state.put(f'version_{iteration}/resume_{j+1}.md', resume_content.strip())
+    
+        print(f"Resume content generated for version {iteration}.")
         
-            print(f"Resume content generated for version {iteration}.")
-            
-            # combine all resume content into a single string
-            combined_resume_content = ""
-            for j in range(cfg["agent"]["content-gen"]["iter"]):
-                resume_file = os.path.join(version_dir, f'resume_{j+1}.md')
-                with open(resume_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    combined_resume_content += f"### Resume {j+1}\n\n{content}\n\n"
-                    
-            # Evaluate the resume content
-            print(f"Evaluating resume content for version {iteration}...")
-            
-            eval_response = eval_content(
-                resumes=combined_resume_content,
-                job_details=job_content,
-                profile=profile_content,
-                cfg=cfg
-            )
-            
-            if eval_response is None or not eval_response.strip():
-                raise ValueError("No evaluation response received from the LLM. Please check the evaluation model and configuration.")
-            eval_file = os.path.join(version_dir, 'evaluation.md')
-            with open(eval_file, 'w', encoding='utf-8') as f:
-                f.write(eval_response.strip())
-            print(f"Evaluation results written to {eval_file}")
-            
-            iteration += 1
-            
-            if iteration > improve_rate:
-                print(f"Reached the maximum improvement iterations: {improve_rate}. Stopping further iterations.")
-                break
-            
+        # combine all resume content into a single string
+        combined_resume_content = ""
+        layout_feedback = []
+        fact_feedback = []
+        fact_reports = {}
+        for j in range(cfg["agent"]["content-gen"]["iter"]):
+            content = run_state.get(f'version_{iteration}/resume_{j+1}.md')
+            combined_resume_content += f"### Resume {j+1}\n\n{content}\n\n"
+            coverage = score_keyword_coverage(keyword_index, content)
+            print(f"Resume {j+1} local keyword coverage: {coverage['score']}% (missing: {', '.join(coverage['missing'][:5]) or 'none'})")
+            if layout_cfg.get('enabled', True):
+                fit = fit_feedback(estimate_layout(content, cfg['output'].get('template', 'classic'), cfg['output']['format']), max_pages)
+                print(f"Resume {j+1} layout: {fit['message']}")
+                if not fit['fits']:
+                    layout_feedback.append(f"- Resume {j+1}: {fit['message']}. Tighten these sections to fit the page limit.")
+            if profile_index is not None:
+                report = verify_resume(content, profile_index, verify_cfg.get('fuzzy_threshold', 0.85),
+                                       exclude=LOCAL_SECTIONS if factual_sections else ())
+                fact_reports[f"resume_{j+1}"] = report
+                print(f"Resume {j+1} fact check: {len(report['flags'])} unsupported of {report['checked']} facts")
+                if report['flags']:
+                    fact_feedback.append(f"- Resume {j+1}: facts not supported by the profile {format_fact_report(report)}. Remove or correct them.")
+        if fact_reports:
+            save_fact_check(fact_reports, version_dir)
+                
+        # Evaluate the resume content
+        print(f"Evaluating resume content for version {iteration}...")
+        
+        eval_response = eval_content(
+            resumes=combined_resume_content,
+            job_details=job_content,
+            profile=eval_profile,
+            keywords=keywords_md,
+            cfg=cfg
+        )
+        
+        if eval_response is None or not eval_response.strip():
+            raise ValueError("No evaluation response received from the LLM. Please check the evaluation model and configuration.")
+        # Local fact checks and page overflow are passed to the next improvement with the evaluation
+        if fact_feedback:
+            eval_response = eval_response.strip() + "\n\n## Fact Check\n\n" + "\n".join(fact_feedback)
+        if layout_feedback:
+            eval_response = eval_response.strip() + "\n\n## Layout Fit\n\n" + "\n".join(layout_feedback)
+        run_state.put(f'version_{iteration}/evaluation.md', eval_response.strip())
+        print(f"Evaluation results for version {iteration} stored")
+        
+        iteration += 1
+        
+        if iteration > improve_rate:
+            print(f"Reached the maximum improvement iterations: {improve_rate}. Stopping further iterations.")
+            break
+
+    # The final drafts are always exported to Markdown files; the native renderer reads them
+    final_resume_files = [run_state.export(f'{os.path.basename(version_dir)}/resume_{j+1}.md') for j in range(cfg["agent"]["content-gen"]["iter"])]
+    run_state.close()
+    print(f"Rendering {len(final_resume_files)} resumes to {cfg['output']['format'].upper()}...")
+    rendered_files = render_all(
+        final_resume_files,
+        output_dir=version_dir,
+        output_format=cfg['output']['format'],
+        template_name=cfg['output'].get('template', 'classic'),
+        workers=cfg['output'].get('workers'),
+    )
+    print(f"✅ Rendered resumes: {', '.join(rendered_files)}")
+
+    record_run(run_fingerprint, {
+        "url": url,
+        "profile": profile_file,
+        "job_dir": job_resumes_dir,
+        "version_dir": version_dir,
+        "resumes": final_resume_files,
+        "rendered": rendered_files,
+    })
+    if job_signature is not None:
+        add_job(job_title, job_signature, {
+            "job_dir": job_resumes_dir,
+            "version_dir": version_dir,
+            "source": output_md_file,
+            "profile_hash": profile_hash,
+            "strategies": len(strategies),
+        })
 
-         
+
+def main():
+    try:
+        config = load_config()
+        args = parse_arguments()
+        cfg = config.copy()
+
+        validate_arguments(args)
+        
+        cfg['agent']['content-gen']['model'] = args.content_gen_model if args.content_gen_model else cfg['agent']['content-gen']['model']
+        cfg['agent']['eval']['model'] = args.evaluation_model if args.evaluation_model else cfg['agent']['eval']['model']
+        cfg['agent']['code-gen']['model'] = args.code_gen_model if args.code_gen_model else cfg['agent']['code-gen']['model']
+        cfg['output']['format'] = args.output_format if args.output_format else cfg['output']['format']
+        cfg['agent']['content-gen']['iter'] = args.content_iter if args.content_iter else cfg['agent']['content-gen']['iter']
+        
+
+        print(f"Configuration loaded successfully: {cfg}")
+
+        urls = load_batch_urls(args.batch) if args.batch else [args.url]
+
+        # A cached ChromeDriver path lets browsers start without network access
+        chromedriver_cfg = cfg.get('chromedriver', {})
+        configure_chromedriver(path=chromedriver_cfg.get('path'), version=chromedriver_cfg.get('version'))
+
+        # Wait on page conditions instead of fixed sleeps; random delays only in stealth mode
+        readiness_cfg = cfg.get('readiness', {})
+        configure_readiness(
+            timeout=readiness_cfg.get('timeout', 20),
+            network_idle=readiness_cfg.get('network_idle', False),
+            network_idle_ms=readiness_cfg.get('network_idle_ms', 500),
+            captcha_timeout=readiness_cfg.get('captcha_timeout', 60),
+            stealth_delays=readiness_cfg.get('stealth_delays', False),
+        )
+
+        # Shared Reader API session; short page waits first, longer ones only for incomplete content
+        reader_cfg = cfg.get('reader-api', {})
+        configure_reader_api(
+            connect_timeout=reader_cfg.get('connect_timeout', 5),
+            read_timeout=reader_cfg.get('read_timeout', 60),
+            wait_steps=tuple(reader_cfg.get('wait_steps', [0, 2000, 5000])),
+            min_content_chars=reader_cfg.get('min_content_chars', 500),
+            retries=reader_cfg.get('retries', 3),
+        )
+
+        # Skip images, fonts, media and trackers the scrapers never read
+        blocking_cfg = cfg.get('resource-blocking', {})
+        configure_resource_blocking(
+            enabled=blocking_cfg.get('enabled', True),
+            block=blocking_cfg.get('block'),
+            extra_patterns=blocking_cfg.get('extra_patterns'),
+            site_exceptions=blocking_cfg.get('site_exceptions'),
+        )
+
+        # Keep browsers warm between jobs instead of starting Chrome for every posting
+        pool_cfg = cfg.get('driver-pool', {})
+        configure_driver_pools(
+            enabled=pool_cfg.get('enabled', True),
+            size=pool_cfg.get('size', 2),
+            max_pages=pool_cfg.get('max_pages', 20),
+        )
+
+        # Browser startup, profile loading and client setup overlap instead of running one after another
+        profile_future = start_warmup(urls[0], args, cfg) if cfg.get('warm-start', {}).get('enabled', True) else None
+        profile = profile_future.result() if profile_future else load_profile(args.profile)
+
+        if len(urls) == 1:
+            run_job(urls[0], args, cfg, profile=profile)
+        else:
+            # Postings are scraped concurrently and each job starts as soon as its scrape is done
+            engine_cfg = cfg.get('scrape-engine', {})
+            engine = ScrapeEngine(
+                lambda job_url: scrape_url(job_url, args, cfg),
+                max_workers=engine_cfg.get('max_workers', 4),
+                per_domain=engine_cfg.get('per_domain', 2),
+                politeness_seconds=engine_cfg.get('politeness_seconds', 1.0),
+            )
+            failed = []
+            for i, result in enumerate(engine.scrape_many(urls), start=1):
+                url = result['url']
+                print(f"\n📦 Batch job {i}/{len(urls)}: {url} (scraped in {result['seconds']}s)")
+                if result['error']:
+                    print(f"Error scraping batch job {url}: {result['error']}")
+                    failed.append(url)
+                    continue
+                try:
+                    run_job(url, args, cfg, scraped_files=result['files'], profile=profile)
+                except Exception as e:
+                    print(f"Error in batch job {url}: {e}")
+                    failed.append(url)
+            print(f"\n📦 Batch finished: {len(urls) - len(failed)}/{len(urls)} jobs succeeded.")
+            for url in failed:
+                print(f"   ❌ {url}")
+
+        # Old finished runs are packed into data/job-data/archive so job-data does not grow without limit
+        archive_cfg = cfg.get('archive', {})
+        if archive_cfg.get('auto', False):
+            archived = archive_runs(
+                older_than_days=archive_cfg.get('older_than_days', 30),
+                policy=archive_cfg.get('policy', 'best'),
+                level=archive_cfg.get('level', 19),
+            )
+            for result in archived:
+                print(f"🗜️ Archived {result['job']} ({result['artifacts']} artifacts, best version {result['best_version']})")
 
     except Exception as e:
         print(f"Error: {e}")
+    finally:
+        close_driver_pools()
 
     
     
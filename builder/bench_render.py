@@ -0,0 +1,129 @@
+"""
+Benchmark for the native resume renderer.
+
+Renders a resume Markdown file (or a built-in sample) many times, serially
+and in the process pool, and reports documents per second.
+
+Usage:
+    python -m builder.bench_render --format pdf --count 50
+    python -m builder.bench_render --resume data/job-data/<job>/version_2/resume_1.md --format docx
+"""
+
+import os
+import time
+import shutil
+import argparse
+import tempfile
+
+from builder.renderer import render_resume, render_all, SUPPORTED_FORMATS
+from builder.templates import STYLE_TEMPLATES, DEFAULT_TEMPLATE
+
+
+SAMPLE_RESUME = """# Jane Doe
+
+jane@example.com | 555-0100 | Toronto, ON | linkedin.com/in/janedoe | github.com/janedoe
+
+## Professional Summary
+
+Backend engineer with 5 years of experience building **Python** microservices on **AWS**, focused on reliability and performance.
+
+## Skills
+
+- **Languages:** Python, Go, SQL
+- **Cloud & DevOps:** AWS, Docker, Kubernetes, Terraform, CI/CD
+- **Data:** PostgreSQL, Redis, Kafka
+
+## Work Experience
+
+### Software Engineer | Shopify
+**07/2019 - Present** | Toronto, ON
+
+- Built Python microservices on AWS serving 2M requests/day with 99.95% availability
+- Reduced p95 latency by 35% by introducing Redis caching and query tuning
+- Led migration of 12 services to Kubernetes, cutting deployment time from 40 to 8 minutes
+
+### Software Engineering Intern | RBC
+**05/2018 - 08/2018** | Toronto, ON
+
+- Developed internal React dashboards used by 200+ analysts
+
+## Projects
+
+### Recommender
+- Built a PyTorch recommendation system served with FastAPI; improved click-through by 12% in offline tests
+
+## Education
+
+### BSc Computer Science | University of Toronto
+09/2015 - 06/2019
+"""
+
+
+def run_benchmark(resume_file, output_format, count, template_name, workers):
+    """
+    Render the resume count times serially and in parallel.
+
+    Args:
+        resume_file (str): Resume Markdown file.
+        output_format (str): 'docx' or 'pdf'.
+        count (int): Number of documents per run.
+        template_name (str): Style template name.
+        workers (int): Process pool size for the parallel run.
+
+    Returns:
+        dict: Documents per second for the 'serial' and 'parallel' runs.
+    """
+    work_dir = tempfile.mkdtemp(prefix="artisan-bench-")
+    try:
+        md_files = []
+        for i in range(count):
+            md_file = os.path.join(work_dir, f"resume_{i}.md")
+            shutil.copyfile(resume_file, md_file)
+            md_files.append(md_file)
+
+        # Warm up the template caches so they are not counted
+        render_resume(md_files[0], os.path.join(work_dir, "warmup"), output_format, template_name)
+
+        start = time.perf_counter()
+        for md_file in md_files:
+            render_resume(md_file, os.path.join(work_dir, "serial"), output_format, template_name)
+        serial = count / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        render_all(md_files, os.path.join(work_dir, "parallel"), output_format, template_name, workers=workers)
+        parallel = count / (time.perf_counter() - start)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {"serial": serial, "parallel": parallel}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the native resume renderer")
+    parser.add_argument("--resume", type=str, help="Resume Markdown file (defaults to a built-in sample)")
+    parser.add_argument("--format", type=str, choices=SUPPORTED_FORMATS, default="pdf", help="Output format")
+    parser.add_argument("--count", type=int, default=50, help="Number of documents to render per run")
+    parser.add_argument("--template", type=str, choices=list(STYLE_TEMPLATES), default=DEFAULT_TEMPLATE, help="Style template")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Process pool size")
+    args = parser.parse_args()
+
+    resume_file = args.resume
+    sample_file = None
+    if not resume_file:
+        sample_file = tempfile.NamedTemporaryFile("w", suffix=".md", delete=False, encoding="utf-8")
+        sample_file.write(SAMPLE_RESUME)
+        sample_file.close()
+        resume_file = sample_file.name
+
+    try:
+        print(f"📊 Rendering {args.count} {args.format.upper()} documents with the '{args.template}' template...")
+        results = run_benchmark(resume_file, args.format, args.count, args.template, args.workers)
+        print(f"Serial:   {results['serial']:.1f} docs/sec")
+        print(f"Parallel: {results['parallel']:.1f} docs/sec ({args.workers} workers)")
+    finally:
+        if sample_file:
+            os.remove(sample_file.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Fast single-page fit estimator.
+
+Predicts the page count of a resume draft from its Markdown, using the font
+metrics, line wrapping and section spacing of the chosen style template,
+without rendering it. The result is turned into structured feedback such as
+"over by 7 lines in Projects" for the improvement step.
+"""
+
+import re
+from datetime import datetime
+
+from builder.resume_ast import parse_markdown, runs_text
+from builder.templates import get_template, DEFAULT_TEMPLATE
+
+
+# Helvetica and Helvetica-Bold advance widths (1/1000 em) for ASCII 32-126, from the standard AFM files
+_HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+DEFAULT_CHAR_WIDTH = 556
+
+# Calibri (DOCX) sets noticeably narrower than Helvetica
+FORMAT_WIDTH_SCALE = {"pdf": 1.0, "docx": 0.9}
+
+BULLET_WIDTH = 10
+
+
+def text_width(text, font_size, bold=False):
+    """
+    Measure the width of a text in points.
+
+    Args:
+        text (str): The text.
+        font_size (float): Font size in points.
+        bold (bool): Use bold metrics.
+
+    Returns:
+        float: Width in points.
+    """
+    table = _HELVETICA_BOLD if bold else _HELVETICA
+    total = 0
+    for char in text:
+        code = ord(char) - 32
+        total += table[code] if 0 <= code < len(table) else DEFAULT_CHAR_WIDTH
+    return total * font_size / 1000.0
+
+
+def count_wrapped_lines(runs, max_width, font_size, width_scale=1.0):
+    """
+    Count the lines a paragraph wraps to with greedy word wrapping.
+
+    Args:
+        runs (list): Inline runs of the paragraph.
+        max_width (float): Available line width in points.
+        font_size (float): Font size in points.
+        width_scale (float): Width correction for the output font.
+
+    Returns:
+        int: Number of lines (at least 1).
+    """
+    space = text_width(" ", font_size) * width_scale
+    lines, line_width = 1, 0.0
+    for run in runs:
+        for word in run["text"].split():
+            word_width = text_width(word, font_size, run["bold"]) * width_scale
+            needed = word_width if line_width == 0 else line_width + space + word_width
+            if needed <= max_width or line_width == 0:
+                line_width = needed
+            else:
+                lines += 1
+                line_width = word_width
+    return lines
+
+
+def estimate_layout(content, template_name=DEFAULT_TEMPLATE, output_format="pdf"):
+    """
+    Estimate the layout of a resume draft.
+
+    Args:
+        content (str): Resume content in Markdown format.
+        template_name (str): Style template name.
+        output_format (str): 'pdf' or 'docx'.
+
+    Returns:
+        dict: 'pages', 'lines_per_page' (body lines per page), 'used_lines' (body-line
+            equivalents used in total), 'page_fill' of the last page (0-1), 'sections'
+            (title -> body-line equivalents used) and 'page_breaks' (section title in
+            which each page break falls).
+    """
+    template = get_template(template_name)
+    width_scale = FORMAT_WIDTH_SCALE.get(output_format, 1.0)
+    margin = template["margin_in"] * 72
+    usable_width = template["page_width"] - 2 * margin
+    usable_height = template["page_height"] - 2 * margin
+    font_size = template["font_size"]
+    body_leading = font_size * template["line_spacing"] * 1.2
+    bullet_indent = template["bullet_indent_in"] * 72
+
+    page, y = 1, 0.0
+    section = "Header"
+    sections = {section: 0.0}
+    page_breaks = []
+
+    def place(height, line_height):
+        """Advance y by height, breaking pages at line granularity."""
+        nonlocal page, y
+        while y + height > usable_height:
+            fitting_lines = max(int((usable_height - y) // line_height), 0)
+            height -= fitting_lines * line_height
+            page += 1
+            y = 0.0
+            page_breaks.append(section)
+        y += height
+
+    for block in parse_markdown(content):
+        start_y, start_page = y, page
+        if block["type"] == "heading":
+            level = min(block["level"], 3)
+            size = template["heading_sizes"][level]
+            if level == 2:
+                section = runs_text(block["runs"]).strip()
+            lines = count_wrapped_lines(block["runs"], usable_width, size, width_scale)
+            before = template["heading_space_before"][level] if y > 0 else 0
+            place(before + lines * size * 1.25 + template["heading_space_after"][level], size * 1.25)
+        elif block["type"] == "paragraph":
+            lines = count_wrapped_lines(block["runs"], usable_width, font_size, width_scale)
+            place(lines * body_leading + template["paragraph_space_after"], body_leading)
+        elif block["type"] == "bullets":
+            for item in block["items"]:
+                width = usable_width - bullet_indent * (item["level"] + 1) - BULLET_WIDTH
+                lines = count_wrapped_lines(item["runs"], width, font_size, width_scale)
+                place(lines * body_leading + 1, body_leading)
+        elif block["type"] == "rule":
+            place(6, 6)
+        used = (page - start_page) * usable_height + (y - start_y)
+        sections[section] = sections.get(section, 0.0) + used / body_leading
+
+    return {
+        "pages": page,
+        "lines_per_page": int(usable_height // body_leading),
+        "page_fill": round(y / usable_height, 3),
+        "used_lines": round(((page - 1) * usable_height + y) / body_leading, 1),
+        "sections": {title: round(lines, 1) for title, lines in sections.items() if lines},
+        "page_breaks": page_breaks,
+    }
+
+
+def fit_feedback(layout, max_pages=1):
+    """
+    Turn a layout estimate into structured feedback.
+
+    Args:
+        layout (dict): Result of estimate_layout.
+        max_pages (int): Page limit.
+
+    Returns:
+        dict: 'fits' (bool), 'overflow_lines' (body lines over the limit, 0 if it fits),
+            'overflow_sections' (sections past the limit) and a one-line 'message'.
+    """
+    if layout["pages"] <= max_pages:
+        spare = int(layout["lines_per_page"] * (1 - layout["page_fill"]))
+        return {"fits": True, "overflow_lines": 0, "overflow_sections": [],
+                "message": f"fits on {max_pages} page{'s' if max_pages > 1 else ''} with about {spare} lines to spare"}
+
+    overflow = max(int(round(layout["used_lines"] - max_pages * layout["lines_per_page"])), 1)
+    break_section = layout["page_breaks"][max_pages - 1]
+    titles = list(layout["sections"])
+    overflow_sections = titles[titles.index(break_section):] if break_section in titles else []
+    where = f" in {', '.join(overflow_sections)}" if overflow_sections else ""
+    return {"fits": False, "overflow_lines": overflow, "overflow_sections": overflow_sections,
+            "message": f"over the {max_pages}-page limit by {overflow} lines{where}"}
+
+
+def _months(date_text):
+    """Parse 'MM/YYYY', 'YYYY-MM', 'YYYY' or 'Present' into a month count."""
+    text = (date_text or "").strip().lower()
+    if not text:
+        return None
+    if text in ("present", "current", "now", "ongoing"):
+        now = datetime.now()
+        return now.year * 12 + now.month
+    match = re.search(r"(\d{1,2})[/-](\d{4})", text) or re.search(r"(\d{4})[/-](\d{1,2})", text)
+    if match:
+        first, second = match.groups()
+        year, month = (int(second), int(first)) if len(second) == 4 else (int(first), int(second))
+        return year * 12 + month
+    match = re.search(r"\b(19|20)\d{2}\b", text)
+    return int(match.group(0)) * 12 + 1 if match else None
+
+
+def experience_years(profile_data):
+    """
+    Compute the applicant's total years of work experience from the profile JSON.
+
+    Args:
+        profile_data (dict): Profile data as written by profile-gen.py.
+
+    Returns:
+        float: Years of experience (overlapping roles are counted separately).
+    """
+    months = 0
+    for exp in profile_data.get('experience', []):
+        start, end = _months(exp.get('start_date')), _months(exp.get('end_date'))
+        if start and end and end >= start:
+            months += end - start
+    return months / 12.0
+
+
+def single_page_required(cfg, profile_data=None, profile_md=""):
+    """
+    Decide whether drafts must fit on a single page.
+
+    Args:
+        cfg (dict): Configuration dictionary (uses the optional 'layout' section).
+        profile_data (dict): Profile JSON data, if available.
+        profile_md (str): Profile Markdown, used when there is no profile JSON.
+
+    Returns:
+        bool: True for 'always', False for 'never'; with 'auto', True for applicants
+            with fewer than 'entry-level-years' years of experience.
+    """
+    settings = (cfg or {}).get('layout', {}) or {}
+    mode = settings.get('single-page', 'auto')
+    if mode in (True, 'always'):
+        return True
+    if mode in (False, 'never'):
+        return False
+    threshold = settings.get('entry-level-years', 3)
+    if profile_data:
+        return experience_years(profile_data) < threshold
+    # Without JSON, count the experience entries of the Markdown profile
+    experience = re.search(r"(?ms)^## (?:Work )?Experience\s*$(.*?)(?=^## |\Z)", profile_md)
+    return not experience or len(re.findall(r"(?m)^### ", experience.group(1))) < 2
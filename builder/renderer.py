@@ -0,0 +1,263 @@
+"""
+Native resume renderer.
+
+Renders generated resume Markdown to DOCX (python-docx) and PDF (reportlab)
+directly from the block AST in builder/resume_ast.py, using the cached style
+templates in builder/templates.py. Replaces the plan of having an LLM write
+and execute a document-building script for every resume.
+"""
+
+import os
+import io
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from builder.resume_ast import parse_markdown
+from builder.templates import get_template, DEFAULT_TEMPLATE
+
+try:
+    import docx
+    from docx.shared import Pt, Inches, RGBColor
+except ImportError:
+    docx = None
+
+try:
+    from reportlab.lib.colors import HexColor
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, HRFlowable
+except ImportError:
+    SimpleDocTemplate = None
+
+
+SUPPORTED_FORMATS = ("docx", "pdf")
+
+
+@lru_cache(maxsize=None)
+def _docx_base(template_name):
+    """
+    Build the styled empty DOCX document for a template once per process.
+
+    Returns:
+        bytes: The saved base document.
+    """
+    if docx is None:
+        raise ImportError("python-docx is required for DOCX output. Please install it with 'pip install python-docx'")
+    template = get_template(template_name)
+    document = docx.Document()
+
+    for section in document.sections:
+        section.page_width = Pt(template["page_width"])
+        section.page_height = Pt(template["page_height"])
+        for side in ("left_margin", "right_margin", "top_margin", "bottom_margin"):
+            setattr(section, side, Inches(template["margin_in"]))
+
+    normal = document.styles["Normal"]
+    normal.font.name = template["font_docx"]
+    normal.font.size = Pt(template["font_size"])
+    normal.paragraph_format.line_spacing = template["line_spacing"]
+    normal.paragraph_format.space_after = Pt(template["paragraph_space_after"])
+
+    accent = RGBColor.from_string(template["accent_color"])
+    for level, style_name in ((1, "Title"), (2, "Heading 1"), (3, "Heading 2")):
+        style = document.styles[style_name]
+        style.font.name = template["font_docx"]
+        style.font.size = Pt(template["heading_sizes"][level])
+        style.font.bold = True
+        style.font.color.rgb = accent
+        style.paragraph_format.space_before = Pt(template["heading_space_before"][level])
+        style.paragraph_format.space_after = Pt(template["heading_space_after"][level])
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _add_docx_runs(paragraph, runs):
+    for run in runs:
+        text = run["text"]
+        if run.get("link") and run["link"] not in text:
+            text = f"{text} ({run['link']})"
+        added = paragraph.add_run(text)
+        added.bold = run["bold"] or None
+        added.italic = run["italic"] or None
+
+
+def render_docx(blocks, output_file, template_name=DEFAULT_TEMPLATE):
+    """
+    Render a resume AST to a DOCX file.
+
+    Args:
+        blocks (list): Blocks from builder.resume_ast.parse_markdown.
+        output_file (str): Path of the DOCX file to write.
+        template_name (str): Style template name.
+
+    Returns:
+        str: The output file path.
+    """
+    template = get_template(template_name)
+    # _docx_base raises the install hint when python-docx is missing
+    base = _docx_base(template_name)
+    document = docx.Document(io.BytesIO(base))
+    heading_styles = {1: "Title", 2: "Heading 1"}
+
+    for block in blocks:
+        if block["type"] == "heading":
+            paragraph = document.add_paragraph(style=heading_styles.get(block["level"], "Heading 2"))
+            _add_docx_runs(paragraph, block["runs"])
+        elif block["type"] == "paragraph":
+            _add_docx_runs(document.add_paragraph(), block["runs"])
+        elif block["type"] == "bullets":
+            for item in block["items"]:
+                paragraph = document.add_paragraph(style="List Bullet")
+                paragraph.paragraph_format.left_indent = Inches(template["bullet_indent_in"] * (item["level"] + 1))
+                _add_docx_runs(paragraph, item["runs"])
+        elif block["type"] == "rule":
+            document.add_paragraph()
+
+    document.save(output_file)
+    return output_file
+
+
+@lru_cache(maxsize=None)
+def _pdf_styles(template_name):
+    """
+    Build the reportlab paragraph styles for a template once per process.
+
+    Returns:
+        dict: Style name to ParagraphStyle.
+    """
+    if SimpleDocTemplate is None:
+        raise ImportError("reportlab is required for PDF output. Please install it with 'pip install reportlab'")
+    template = get_template(template_name)
+    size = template["font_size"]
+    styles = {
+        "body": ParagraphStyle(
+            "body", fontName=template["font_pdf"], fontSize=size, leading=size * template["line_spacing"] * 1.2,
+            spaceAfter=template["paragraph_space_after"],
+        ),
+    }
+    styles["bullet"] = ParagraphStyle(
+        "bullet", parent=styles["body"], leftIndent=template["bullet_indent_in"] * inch, bulletIndent=0, spaceAfter=1,
+    )
+    for level, heading_size in template["heading_sizes"].items():
+        styles[f"h{level}"] = ParagraphStyle(
+            f"h{level}", parent=styles["body"], fontName=template["font_pdf_bold"], fontSize=heading_size,
+            leading=heading_size * 1.25, textColor=HexColor(f"#{template['accent_color']}"),
+            spaceBefore=template["heading_space_before"][level], spaceAfter=template["heading_space_after"][level],
+        )
+    return styles
+
+
+def _pdf_markup(runs):
+    markup = ""
+    for run in runs:
+        text = escape(run["text"])
+        if run.get("link"):
+            text = f'<link href="{escape(run["link"])}">{text}</link>'
+        if run["italic"]:
+            text = f"<i>{text}</i>"
+        if run["bold"]:
+            text = f"<b>{text}</b>"
+        markup += text
+    return markup
+
+
+def render_pdf(blocks, output_file, template_name=DEFAULT_TEMPLATE):
+    """
+    Render a resume AST to a PDF file.
+
+    Args:
+        blocks (list): Blocks from builder.resume_ast.parse_markdown.
+        output_file (str): Path of the PDF file to write.
+        template_name (str): Style template name.
+
+    Returns:
+        str: The output file path.
+    """
+    template = get_template(template_name)
+    styles = _pdf_styles(template_name)
+    margin = template["margin_in"] * inch
+    document = SimpleDocTemplate(
+        output_file, pagesize=(template["page_width"], template["page_height"]),
+        leftMargin=margin, rightMargin=margin, topMargin=margin, bottomMargin=margin,
+    )
+
+    story = []
+    for block in blocks:
+        if block["type"] == "heading":
+            story.append(Paragraph(_pdf_markup(block["runs"]), styles[f"h{min(block['level'], 3)}"]))
+        elif block["type"] == "paragraph":
+            story.append(Paragraph(_pdf_markup(block["runs"]), styles["body"]))
+        elif block["type"] == "bullets":
+            for item in block["items"]:
+                style = styles["bullet"]
+                if item["level"]:
+                    style = ParagraphStyle(f"bullet{item['level']}", parent=style,
+                                           leftIndent=style.leftIndent * (item["level"] + 1), bulletIndent=style.leftIndent * item["level"])
+                story.append(Paragraph(_pdf_markup(item["runs"]), style, bulletText="•"))
+        elif block["type"] == "rule":
+            story.append(Spacer(1, 2))
+            story.append(HRFlowable(width="100%", thickness=0.5))
+
+    document.build(story)
+    return output_file
+
+
+def render_resume(md_file, output_dir, output_format, template_name=DEFAULT_TEMPLATE):
+    """
+    Render one resume Markdown file.
+
+    Args:
+        md_file (str): Path of the resume Markdown file.
+        output_dir (str): Directory for the rendered file.
+        output_format (str): 'docx' or 'pdf'.
+        template_name (str): Style template name.
+
+    Returns:
+        str: Path of the rendered file.
+
+    Raises:
+        ValueError: If the output format is not supported.
+    """
+    if output_format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Invalid output format: {output_format}. Supported formats are {SUPPORTED_FORMATS}.")
+    with open(md_file, 'r', encoding='utf-8') as f:
+        blocks = parse_markdown(f.read())
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = os.path.join(output_dir, f"{os.path.splitext(os.path.basename(md_file))[0]}.{output_format}")
+    if output_format == "docx":
+        return render_docx(blocks, output_file, template_name)
+    return render_pdf(blocks, output_file, template_name)
+
+
+def render_all(md_files, output_dir, output_format, template_name=DEFAULT_TEMPLATE, workers=None):
+    """
+    Render several resumes in parallel in a process pool.
+
+    Args:
+        md_files (list): Paths of the resume Markdown files.
+        output_dir (str): Directory for the rendered files.
+        output_format (str): 'docx' or 'pdf'.
+        template_name (str): Style template name.
+        workers (int): Number of worker processes (defaults to one per file, up to the CPU count).
+
+    Returns:
+        list: Paths of the rendered files, in the order of md_files.
+    """
+    if not md_files:
+        return []
+    workers = workers or min(len(md_files), os.cpu_count() or 1)
+    if workers <= 1 or len(md_files) == 1:
+        return [render_resume(md_file, output_dir, output_format, template_name) for md_file in md_files]
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(render_resume, md_file, output_dir, output_format, template_name): md_file
+            for md_file in md_files
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return [results[md_file] for md_file in md_files]
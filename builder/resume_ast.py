@@ -0,0 +1,128 @@
+"""
+Markdown resume parser.
+
+Parses the generated resume Markdown into a small block AST (headings,
+paragraphs and bullet lists made of inline runs) that the DOCX/PDF renderers
+and the layout estimator walk directly.
+"""
+
+import re
+
+from utils.resume_sections import unwrap_markdown
+
+
+INLINE_PATTERN = re.compile(
+    r"\*\*(?P<bold>.+?)\*\*"
+    r"|__(?P<bold2>.+?)__"
+    r"|(?<![*\w])\*(?P<italic>[^*\n]+?)\*(?![*\w])"
+    r"|(?<![_\w])_(?P<italic2>[^_\n]+?)_(?![_\w])"
+    r"|`(?P<code>[^`]+)`"
+    r"|\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)\s]+)\)"
+)
+BULLET_PATTERN = re.compile(r"^(\s*)[-*+•]\s+(.*)$")
+NUMBERED_PATTERN = re.compile(r"^(\s*)\d+[.)]\s+(.*)$")
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+
+
+def parse_inline(text):
+    """
+    Parse inline Markdown into text runs.
+
+    Args:
+        text (str): A line of Markdown.
+
+    Returns:
+        list: Runs as dicts with 'text', 'bold', 'italic' and optional 'link'.
+    """
+    runs = []
+    position = 0
+    for match in INLINE_PATTERN.finditer(text):
+        if match.start() > position:
+            runs.append({"text": text[position:match.start()], "bold": False, "italic": False})
+        if match.group("bold") or match.group("bold2"):
+            for run in parse_inline(match.group("bold") or match.group("bold2")):
+                run["bold"] = True
+                runs.append(run)
+        elif match.group("italic") or match.group("italic2"):
+            runs.append({"text": match.group("italic") or match.group("italic2"), "bold": False, "italic": True})
+        elif match.group("code"):
+            runs.append({"text": match.group("code"), "bold": False, "italic": False})
+        else:
+            runs.append({"text": match.group("link_text"), "bold": False, "italic": False, "link": match.group("link_url")})
+        position = match.end()
+    if position < len(text):
+        runs.append({"text": text[position:], "bold": False, "italic": False})
+    return [run for run in runs if run["text"]]
+
+
+def parse_markdown(content):
+    """
+    Parse resume Markdown into a block AST.
+
+    Args:
+        content (str): Resume content in Markdown format (a surrounding code fence is removed).
+
+    Returns:
+        list: Blocks as dicts:
+            {'type': 'heading', 'level': int, 'runs': [...]}
+            {'type': 'paragraph', 'runs': [...]}
+            {'type': 'bullets', 'items': [{'level': int, 'runs': [...]}]}
+            {'type': 'rule'}
+    """
+    blocks = []
+    paragraph = []
+
+    def flush_paragraph():
+        if paragraph:
+            blocks.append({"type": "paragraph", "runs": parse_inline(" ".join(paragraph))})
+            paragraph.clear()
+
+    for raw_line in unwrap_markdown(content).splitlines():
+        line = raw_line.rstrip()
+        if not line.strip():
+            flush_paragraph()
+            continue
+
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            flush_paragraph()
+            blocks.append({"type": "heading", "level": len(heading.group(1)), "runs": parse_inline(heading.group(2))})
+            continue
+
+        if re.fullmatch(r"\s*([-*_])(\s*\1){2,}\s*", line):
+            flush_paragraph()
+            blocks.append({"type": "rule"})
+            continue
+
+        bullet = BULLET_PATTERN.match(line) or NUMBERED_PATTERN.match(line)
+        if bullet:
+            flush_paragraph()
+            item = {"level": len(bullet.group(1).replace("\t", "    ")) // 2, "runs": parse_inline(bullet.group(2))}
+            if blocks and blocks[-1]["type"] == "bullets":
+                blocks[-1]["items"].append(item)
+            else:
+                blocks.append({"type": "bullets", "items": [item]})
+            continue
+
+        # A trailing double space is a Markdown line break; keep it as its own paragraph line
+        if raw_line.endswith("  "):
+            paragraph.append(line.strip())
+            flush_paragraph()
+        else:
+            paragraph.append(line.strip())
+
+    flush_paragraph()
+    return blocks
+
+
+def runs_text(runs):
+    """
+    Get the plain text of inline runs.
+
+    Args:
+        runs (list): Inline runs.
+
+    Returns:
+        str: Concatenated text.
+    """
+    return "".join(run["text"] for run in runs)
@@ -0,0 +1,73 @@
+"""
+Style templates for the native resume renderer.
+
+Each template defines page geometry, fonts and spacing. The same values are
+used by the DOCX and PDF renderers and by the single-page layout estimator.
+"""
+
+from functools import lru_cache
+
+
+# Page sizes in points (1 inch = 72 points)
+PAGE_SIZES = {
+    "letter": (612.0, 792.0),
+    "a4": (595.3, 841.9),
+}
+
+STYLE_TEMPLATES = {
+    "classic": {
+        "page_size": "letter",
+        "margin_in": 0.7,
+        "font_docx": "Calibri",
+        "font_pdf": "Helvetica",
+        "font_pdf_bold": "Helvetica-Bold",
+        "font_pdf_italic": "Helvetica-Oblique",
+        "font_size": 10.5,
+        "line_spacing": 1.15,
+        "heading_sizes": {1: 18, 2: 12.5, 3: 10.5},
+        "heading_space_before": {1: 0, 2: 10, 3: 6},
+        "heading_space_after": {1: 4, 2: 4, 3: 2},
+        "paragraph_space_after": 4,
+        "bullet_indent_in": 0.2,
+        "accent_color": "1F3864",
+    },
+    "compact": {
+        "page_size": "letter",
+        "margin_in": 0.5,
+        "font_docx": "Calibri",
+        "font_pdf": "Helvetica",
+        "font_pdf_bold": "Helvetica-Bold",
+        "font_pdf_italic": "Helvetica-Oblique",
+        "font_size": 9.5,
+        "line_spacing": 1.1,
+        "heading_sizes": {1: 16, 2: 11, 3: 9.5},
+        "heading_space_before": {1: 0, 2: 6, 3: 4},
+        "heading_space_after": {1: 2, 2: 2, 3: 1},
+        "paragraph_space_after": 2,
+        "bullet_indent_in": 0.18,
+        "accent_color": "000000",
+    },
+}
+
+DEFAULT_TEMPLATE = "classic"
+
+
+@lru_cache(maxsize=None)
+def get_template(name=DEFAULT_TEMPLATE):
+    """
+    Get a style template by name.
+
+    Args:
+        name (str): Template name from STYLE_TEMPLATES.
+
+    Returns:
+        dict: The template, with 'page_width' and 'page_height' in points added.
+
+    Raises:
+        ValueError: If the template does not exist.
+    """
+    if name not in STYLE_TEMPLATES:
+        raise ValueError(f"Unknown resume template: {name}. Available templates: {list(STYLE_TEMPLATES)}")
+    template = dict(STYLE_TEMPLATES[name])
+    template["page_width"], template["page_height"] = PAGE_SIZES[template["page_size"]]
+    return template
@@ -1,24 +1,32 @@
 from llm.llm import query
+from llm.token_budget import budget_components, count_tokens
 
-def generate_resume_content(strategy, cfg, job_details, profile): 
+# Appended to the user prompt when the factual sections are rendered locally (see utils/profile_render.py)
+FACTUAL_SECTIONS_NOTE = (
+    "Do not include the name/contact header, the Education section or the Certifications section; "
+    "they are rendered automatically from the applicant's profile and added afterwards. "
+    "Start directly with the Professional Summary."
+)
+
+def generate_resume_content(strategy, cfg, job_details, profile, keywords="", omit_factual_sections=False): 
     """
     Generate resume content in Markdown format based on the provided strategy, job description, and applicant profile.
     Args:
         strategy (str): The resume-tailoring strategy to apply.
         model (str): The model to use for content generation.
         cfg (object): Configuration object containing job details and applicant profile.
+        keywords (str): Pre-extracted job keywords in Markdown format (see utils/keywords.py).
+        omit_factual_sections (bool): Leave out the header, Education and Certifications, which are rendered locally.
     Returns:
         str: Generated resume content in Markdown format.
     """
     
-    prompt =[
-    {
-        "role": "system",
-        "content": (
+    model_name = cfg['agent']['content-gen']['model']
+    system_prompt = (
         "You are an expert resume writer and career strategist with over a decade of experience in crafting tailored, high-impact resumes for diverse industries and roles, including technical, managerial, and creative positions.\n"
         "Your expertise includes deep knowledge of Applicant Tracking Systems (ATS), job-specific keyword optimization, and aligning candidate profiles with employer expectations to maximize interview opportunities.\n"
         "Your task is to generate resume content in Markdown format that aligns with a specific resume-tailoring strategy, a provided job description, and the applicant's profile.\n"
-        "Incorporate important keywords and phrases from the job description to enhance ATS compatibility and relevance, ensuring they are naturally integrated into the content.\n"
+        "Incorporate the provided job keywords (pre-extracted from the job description) to enhance ATS compatibility and relevance, ensuring they are naturally integrated into the content. Do not re-derive keywords from the job description.\n"
         "The resume content should highlight the applicant's qualifications, experience, and skills, emphasizing the given strategy while remaining concise, professional, and ATS-compatible.\n"
         "Include sections such as Professional Summary, Skills, Work Experience, Education, and Projects (if applicable), ensuring all content is tailored to the job description and strategy.\n"
         "Use bullet points for clarity and ensure consistent Markdown formatting with clear section headers.\n"
@@ -26,21 +34,38 @@ def generate_resume_content(strategy, cfg, job_details, profile):
         "Avoid overly generic phrases (e.g., 'team player' without context) and focus on specific, quantifiable achievements and skills that align with the strategy and job requirements.\n"
         "Do not include placeholder text (e.g., 'Your Name') or personal details not provided in the profile.\n"
         "Return only the resume content in Markdown format, with no additional explanations or context."
-        )
+    )
+
+    fitted = budget_components(
+        {"job": job_details, "profile": profile, "keywords": keywords, "strategy": strategy},
+        model_name=model_name,
+        cfg=cfg,
+        label="content-gen",
+        fixed_tokens=count_tokens(system_prompt, model_name),
+        query=keywords,
+    )
+    job_details, profile = fitted["job"], fitted["profile"]
+
+    prompt =[
+    {
+        "role": "system",
+        "content": system_prompt
     },
     {
         "role": "user",
         "content": (
         f"**Job Description:**\n\n{job_details}\n\n"
+        f"**Job Keywords:**\n\n{keywords}\n\n"
         f"**Applicant Profile:**\n\n{profile}\n\n"
         f"**Resume-Tailoring Strategy:**\n\n{strategy}\n\n"
-        f"Generate resume content in Markdown format tailored to the provided job description and applicant profile, emphasizing the given strategy. Incorporate important keywords from the job description to enhance ATS compatibility and relevance. Ensure the content is ATS-compatible, professional, and structured with clear sections."
+        f"Generate resume content in Markdown format tailored to the provided job description and applicant profile, emphasizing the given strategy. Incorporate the provided job keywords where the profile supports them to enhance ATS compatibility and relevance. Ensure the content is ATS-compatible, professional, and structured with clear sections."
+        + (f" {FACTUAL_SECTIONS_NOTE}" if omit_factual_sections else "")
         )
     }
     ]
     
     response = response = query(
-    model_name=cfg['agent']['content-gen']['model'],
+    model_name=model_name,
     prompt=prompt,
     temperature=cfg['agent']['content-gen']['temperature'],
     max_tokens=cfg['agent']['content-gen']['max_tokens'],
@@ -49,7 +74,7 @@ def generate_resume_content(strategy, cfg, job_details, profile):
     
     return response
 
-def generate_resume_content_with_eval(eval_response, cfg, job_details, profile, previous_resume_content, strategy):
+def generate_resume_content_with_eval(eval_response, cfg, job_details, profile, previous_resume_content, strategy, keywords="", omit_factual_sections=False):
     """
     Generate improved resume content in Markdown format based on previous resume content, evaluation feedback, and the original strategy.
     
@@ -60,14 +85,14 @@ def generate_resume_content_with_eval(eval_response, cfg, job_details, profile,
         profile (str): Applicant profile in Markdown or JSON format.
         previous_resume_content (str): Previous resume content in Markdown format.
         strategy (str): The resume-tailoring strategy used to generate the previous resume.
+        keywords (str): Pre-extracted job keywords in Markdown format (see utils/keywords.py).
+        omit_factual_sections (bool): Leave out the header, Education and Certifications, which are rendered locally.
     
     Returns:
         str: Improved resume content in Markdown format.
     """
-    prompt = [
-        {
-            "role": "system",
-            "content": (
+    model_name = cfg['agent']['content-gen']['model']
+    system_prompt = (
                 "You are an expert resume writer and career strategist with over 15 years of experience in crafting tailored, high-impact resumes for candidates across diverse industries, including technology, management, finance, healthcare, and creative fields. Your expertise includes deep knowledge of Applicant Tracking Systems (ATS), strategic keyword optimization, and aligning candidate profiles with employer expectations to maximize interview opportunities. You specialize in creating concise, professional resumes that effectively showcase candidates' qualifications, even for those with limited or no major professional experience, by emphasizing relevant skills, projects, and education.\n\n"
                 "**Objective**:\n"
                 "Your task is to generate improved resume content in Markdown format by refining a previous resume version, taking into account the provided evaluation feedback, the original resume-tailoring strategy, the job description, and the applicant's profile. The previous resume was crafted with a specific strategy that emphasized a particular narrative angle (e.g., technical expertise, leadership capabilities, or innovative project contributions). Your goal is to maintain this strategic focus while addressing the weaknesses identified in the evaluation feedback (e.g., ATS compatibility, structure, or keyword alignment) and enhancing the resume's overall effectiveness. For applicants with limited or no major professional experience, ensure the resume fits a single-page PDF document by prioritizing concise, impactful content and leveraging relevant projects and education. Projects should be described in detail to highlight their relevance and impact.\n\n"
@@ -76,7 +101,7 @@ def generate_resume_content_with_eval(eval_response, cfg, job_details, profile,
                 "- **Maintain the Original Strategy**: The previous resume was generated using the provided strategy. Ensure the improved resume continues to emphasize this strategy's narrative angle (e.g., technical skills, leadership, or project innovation), refining it to better align with the job description and feedback without losing its core focus.\n"
                 "- **Fit a Single-Page PDF for Less Experienced Applicants**: If the applicant has limited or no major professional experience (e.g., fewer than 3 years of relevant work history or primarily entry-level roles), ensure the resume content is concise enough to fit on a single page when rendered as a PDF. Prioritize essential sections (Professional Summary, Skills, Education, Projects) and limit Work Experience to key roles or internships. Avoid unnecessary filler content and focus on impactful, relevant details. For more experienced applicants, the resume may extend beyond one page if necessary to fully showcase qualifications.\n"
                 "- **Detailed Project Descriptions**: For any projects included in the resume (drawn from the applicant profile), provide detailed, descriptive content that highlights the project's purpose, technologies or tools used, specific contributions, measurable outcomes (e.g., 'Improved efficiency by 15%'), and relevance to the job description. Each project description should be 2-3 sentences long, using action-oriented language and job-specific keywords to demonstrate alignment with the role. For less experienced applicants, projects should be a primary focus to compensate for limited work experience.\n"
-                "- **Integrate Job Description Keywords**: Extract critical keywords and phrases from the job description (e.g., specific skills like 'Python', tools like 'AWS', certifications, or responsibilities like 'scalable web applications') and naturally integrate them into the resume content to enhance ATS compatibility and demonstrate alignment with the employer's needs. Avoid keyword stuffing; ensure keywords are contextually relevant and seamlessly woven into sentences or bullet points.\n"
+                "- **Integrate Job Description Keywords**: Use the provided job keywords, which were pre-extracted from the job description (e.g., specific skills like 'Python', tools like 'AWS', certifications, or responsibilities like 'scalable web applications'), and naturally integrate them into the resume content to enhance ATS compatibility and demonstrate alignment with the employer's needs. Avoid keyword stuffing; ensure keywords are contextually relevant and seamlessly woven into sentences or bullet points.\n"
                 "- **Leverage Applicant Profile**: Draw specific, relevant details (e.g., work experience, projects, skills, education, certifications) directly from the applicant's profile to craft a tailored resume. Do not invent or add information beyond what is provided in the profile. If the profile indicates limited experience, emphasize transferable skills, academic achievements, or projects to align with the job requirements.\n"
                 "- **Ensure ATS Compatibility**: Structure the resume to be easily parsed by ATS software. Use standard, industry-recognized section headers (e.g., 'Professional Summary', 'Skills', 'Work Experience', 'Education', 'Projects'), avoid complex formatting such as tables, columns, graphics, or non-standard fonts, and ensure keywords are clearly presented in lowercase or as they appear in the job description. For example, a Skills section with bullet points like '- Python' or '- Agile methodologies' is more ATS-friendly than a table.\n"
                 "- **Maintain Professional and Concise Content**: Craft a professional, concise resume with quantifiable achievements (e.g., 'Developed a web application serving 10,000+ users') and avoid vague or generic phrases (e.g., 'team player' without context). For less experienced applicants, focus on skills, education, and projects to create impactful content within a single page. Each bullet point should be 1-2 lines long and use action-oriented verbs (e.g., 'Developed', 'Optimized', 'Led').\n"
@@ -84,33 +109,127 @@ def generate_resume_content_with_eval(eval_response, cfg, job_details, profile,
                 "- **Include Relevant Sections**: Include standard sections such as Professional Summary, Skills, Work Experience, Education, and, if applicable, Projects or Certifications. For less experienced applicants, prioritize Skills, Education, and Projects to showcase potential. Tailor the content of each section to reflect the job description, profile, and strategy, ensuring relevance and impact.\n"
                 "- **Avoid Placeholder Text**: Do not include placeholder text (e.g., 'Your Name', 'Your Address') or personal details not provided in the profile. Focus solely on the information provided in the profile to maintain accuracy and professionalism.\n"
                 "- **Output Requirements**: Return only the resume content in Markdown format, with no additional explanations, introductions, or context outside the resume itself. Ensure the output is ready to be saved as a `.md` file and rendered as a professional, single-page PDF for less experienced applicants or an appropriately detailed PDF for more experienced candidates.\n"
-            )
+    )
+
+    fitted = budget_components(
+        {"job": job_details, "profile": profile, "eval": eval_response, "previous_resume": previous_resume_content,
+         "keywords": keywords, "strategy": strategy},
+        model_name=model_name,
+        cfg=cfg,
+        label="content-gen:improve",
+        fixed_tokens=count_tokens(system_prompt, model_name),
+        query=keywords,
+    )
+    job_details, profile, eval_response = fitted["job"], fitted["profile"], fitted["eval"]
+
+    prompt = [
+        {
+            "role": "system",
+            "content": system_prompt
         },
         {
             "role": "user",
             "content": (
                 f"**Job Description:**\n\n{job_details}\n\n"
+                f"**Job Keywords:**\n\n{keywords}\n\n"
                 f"**Applicant Profile:**\n\n{profile}\n\n"
                 f"**Previous Resume Content:**\n\n{previous_resume_content}\n\n"
                 f"**Evaluation Feedback:**\n\n{eval_response}\n\n"
                 f"**Original Resume-Tailoring Strategy:**\n\n{strategy}\n\n"
                 "Generate improved resume content in Markdown format by refining the previous resume based on the evaluation feedback. "
                 f"Maintain the focus of the original strategy ({strategy}) while addressing the feedback's identified weaknesses and enhancing strengths. "
-                "Incorporate critical keywords from the job description to ensure ATS compatibility and alignment with the employer's requirements. "
+                "Incorporate the provided job keywords to ensure ATS compatibility and alignment with the employer's requirements. "
                 "Use specific details from the applicant's profile to craft a professional, concise, and structured resume with clear sections (e.g., Professional Summary, Skills, Work Experience, Education, Projects). "
                 "If the applicant has limited or no major professional experience (e.g., fewer than 3 years of relevant work history or primarily entry-level roles), ensure the resume fits a single-page PDF by prioritizing concise, impactful content and emphasizing skills, education, and detailed project descriptions. "
                 "For projects, provide 2-3 sentence descriptions that highlight the project's purpose, technologies used, specific contributions, measurable outcomes, and relevance to the job. "
                 "Ensure the resume is ATS-compatible, uses consistent Markdown formatting, and highlights quantifiable achievements relevant to the job and strategy."
+                + (f" {FACTUAL_SECTIONS_NOTE}" if omit_factual_sections else "")
             )
         }
     ]
     
     response = query(
-        model_name=cfg['agent']['content-gen']['model'],
+        model_name=model_name,
         prompt=prompt,
         temperature=cfg['agent']['content-gen']['temperature'],
         max_tokens=cfg['agent']['content-gen']['max_tokens'],
         cfg=cfg
     )
     
-    return response
\ No newline at end of file
+    return response
+
+def generate_resume_patch_with_eval(eval_response, cfg, job_details, profile, previous_resume_content, strategy, sections, keywords=""):
+    """
+    Generate replacements for only the resume sections flagged by the evaluation.
+
+    Args:
+        eval_response (str): Evaluation feedback for this resume.
+        cfg (dict): Configuration object containing model details and generation parameters.
+        job_details (str): Job description in Markdown format.
+        profile (str): Applicant profile in Markdown or JSON format.
+        previous_resume_content (str): Previous resume content in Markdown format.
+        strategy (str): The resume-tailoring strategy used to generate the previous resume.
+        sections (list): Titles of the sections to rewrite.
+        keywords (str): Pre-extracted job keywords in Markdown format (see utils/keywords.py).
+
+    Returns:
+        str: Markdown containing only the rewritten sections, each starting with its '## ' header.
+    """
+    model_name = cfg['agent']['content-gen']['model']
+    section_list = "\n".join(f"- ## {title}" for title in sections)
+    system_prompt = (
+        "You are an expert resume writer and career strategist who improves resumes with targeted edits.\n"
+        "You receive a previous resume, evaluation feedback for it, the job description, the applicant's profile and the original resume-tailoring strategy.\n"
+        "Rewrite ONLY the sections you are asked to rewrite; every other section is kept exactly as it is.\n"
+        "**Key Instructions**:\n"
+        "- Address the weaknesses named in the feedback for these sections and keep their strengths.\n"
+        "- Maintain the original strategy's narrative angle.\n"
+        "- Use the provided job keywords where the profile supports them; avoid keyword stuffing.\n"
+        "- Use only facts from the applicant's profile; do not invent employers, titles, dates, numbers or skills.\n"
+        "- Keep content concise, ATS-friendly and action-oriented, with '-' bullet points and consistent Markdown.\n"
+        "**Output Requirements**:\n"
+        "- Return each rewritten section as complete Markdown starting with its exact '## ' header line as given.\n"
+        "- Do not return any section that was not requested, and add no explanations or code fences.\n"
+    )
+
+    fitted = budget_components(
+        {"job": job_details, "profile": profile, "eval": eval_response, "previous_resume": previous_resume_content,
+         "keywords": keywords, "strategy": strategy},
+        model_name=model_name,
+        cfg=cfg,
+        label="content-gen:patch",
+        fixed_tokens=count_tokens(system_prompt, model_name),
+        query=keywords,
+    )
+    job_details, profile, eval_response = fitted["job"], fitted["profile"], fitted["eval"]
+
+    prompt = [
+        {
+            "role": "system",
+            "content": system_prompt
+        },
+        {
+            "role": "user",
+            "content": (
+                f"**Job Description:**\n\n{job_details}\n\n"
+                f"**Job Keywords:**\n\n{keywords}\n\n"
+                f"**Applicant Profile:**\n\n{profile}\n\n"
+                f"**Previous Resume Content:**\n\n{previous_resume_content}\n\n"
+                f"**Evaluation Feedback:**\n\n{eval_response}\n\n"
+                f"**Original Resume-Tailoring Strategy:**\n\n{strategy}\n\n"
+                f"**Sections to Rewrite:**\n\n{section_list}\n\n"
+                "Rewrite only the sections listed above, addressing the evaluation feedback while maintaining the original strategy. "
+                "Return each rewritten section with its exact '## ' header and nothing else."
+            )
+        }
+    ]
+
+    response = query(
+        model_name=model_name,
+        prompt=prompt,
+        temperature=cfg['agent']['content-gen']['temperature'],
+        max_tokens=cfg['agent']['content-gen']['max_tokens'],
+        cfg=cfg
+    )
+
+    return response
@@ -1,6 +1,7 @@
 from llm.llm import query
+from llm.token_budget import budget_components, count_tokens
 
-def eval_content(cfg, job_details, resumes, profile):
+def eval_content(cfg, job_details, resumes, profile, keywords=""):
     """
     Evaluate multiple resume versions against a specific job posting.
     Args:
@@ -8,20 +9,19 @@ def eval_content(cfg, job_details, resumes, profile):
         job_details (str): Job description in Markdown format.
         resumes (str): Concatenated resume versions in Markdown format, separated by headers.
         profile (str): Applicant profile in Markdown or JSON format.
+        keywords (str): Pre-extracted job keywords in Markdown format (see utils/keywords.py).
     Returns:
         str: Evaluation results in Markdown format, including scores, suggestions, and a summary by resume.
     """
-    prompt = [
-        {
-            "role": "system",
-            "content": (
+    model_name = cfg['agent']['eval']['model']
+    system_prompt = (
                 "You are an expert career consultant skilled in resume optimization, ATS analysis, and aligning candidate profiles with job requirements across industries like technology and finance. Your task is to evaluate multiple resume versions against a job posting based on three criteria: ATS Compatibility, Structure, and Match with Job Keywords, providing scores, explanations, and actionable feedback without modifying resume content.\n\n"
                 "**Evaluation Criteria**:\n"
                 "1. **ATS Compatibility (0-100)**:\n"
                 "   - Assess ATS parsability, checking:\n"
                 "     - Standard headers (e.g., 'Skills', 'Work Experience').\n"
                 "     - Simple formatting, avoiding tables or graphics.\n"
-                "     - Job description keywords (e.g., 'Python', 'Agile').\n"
+                "     - The provided job keywords (e.g., 'Python', 'Agile').\n"
                 "   - Example: A resume with 'Skills: python, aws' and no tables scores higher than one with images.\n"
                 "2. **Structure (0-100)**:\n"
                 "   - Evaluate organization, checking:\n"
@@ -30,8 +30,8 @@ def eval_content(cfg, job_details, resumes, profile):
                 "     - Consistent formatting (e.g., 'MM/YYYY' dates).\n"
                 "   - Example: A resume with consistent dates and clear sections scores higher than one with long paragraphs.\n"
                 "3. **Match with Job Keywords (0-100)**:\n"
-                "   - Measure alignment with job requirements, verified by the profile, checking:\n"
-                "     - Job-specific keywords (e.g., 'machine learning').\n"
+                "   - Measure alignment with job requirements, checking:\n"
+                "     - The provided job keywords (e.g., 'machine learning'); do not re-extract keywords from the job description.\n"
                 "     - Quantifiable achievements (e.g., 'Improved accuracy by 10%').\n"
                 "     - Role-specific skills or experiences.\n"
                 "   - Example: A resume with 'TensorFlow' and relevant projects scores higher than one with unrelated skills.\n\n"
@@ -40,27 +40,44 @@ def eval_content(cfg, job_details, resumes, profile):
                 "  - Scores (0-100) for ATS Compatibility, Structure, and Match with Job Keywords.\n"
                 "  - A 2-sentence explanation per criterion, justifying the score with specific strengths/weaknesses.\n"
                 "  - 3 actionable suggestions per criterion (e.g., 'Add “Agile” to Skills').\n"
+                "  - At the end of its evaluation, one line per resume section that needs edits, exactly in the form 'Section: <section title as written in the resume>' (e.g., 'Section: Skills'). Omit sections that need no changes; these lines decide which sections are rewritten.\n"
                 "- After evaluations, provide:\n"
                 "  - A numbered list of evaluations in Markdown (e.g., '### 1. Resume 1').\n"
                 "  - A ranked list sorted by average score (highest to lowest), with average and individual scores.\n"
                 "  - A 'Feedback Summary by Resume' section listing each resume, its average score, and a 2-sentence summary (~50 words) of key feedback across all criteria.\n"
                 "**Instructions**:\n"
-                "- Verify resume content against the profile; flag discrepancies in explanations.\n"
+                "- Facts are verified against the profile separately; do not re-check them. Use the profile only to suggest relevant experience or skills a resume leaves out.\n"
                 "- Ensure feedback is specific and tied to the job description/profile.\n"
                 "- Use clean Markdown with headers (`#`, `##`, `###`), bullets, and numbered lists.\n"
                 "- Note missing sections (e.g., Projects) in Structure and missing keywords in Match with Job Keywords.\n"
                 "- Keep output concise to fit within 2000 tokens, prioritizing clarity.\n"
-            )
+    )
+
+    fitted = budget_components(
+        {"job": job_details, "profile": profile, "resumes": resumes, "keywords": keywords},
+        model_name=model_name,
+        cfg=cfg,
+        label="eval",
+        fixed_tokens=count_tokens(system_prompt, model_name),
+        query=keywords,
+    )
+    job_details, profile = fitted["job"], fitted["profile"]
+
+    prompt = [
+        {
+            "role": "system",
+            "content": system_prompt
         },
         {
             "role": "user",
             "content": (
                 f"**Job Description:**\n\n{job_details}\n\n"
+                f"**Job Keywords:**\n\n{keywords}\n\n"
                 f"**Resume Versions:**\n\n{resumes}\n\n"
                 f"**Applicant Profile:**\n\n{profile}\n\n"
                 "Evaluate the resume versions using ATS Compatibility, Structure, and Match with Job Keywords. "
-                "For each resume, provide a score (0-100), a 2-sentence explanation, and 3 actionable suggestions per criterion. "
-                "Verify content with the profile. "
+                "For each resume, provide a score (0-100), a 2-sentence explanation, and 3 actionable suggestions per criterion, "
+                "and end its evaluation with a 'Section: <section title>' line for every section that needs edits. "
                 "Return Markdown output with a numbered evaluation list, a ranked list by average score, and a 'Feedback Summary by Resume' section with each resume’s average score and a 2-sentence feedback summary."
             )
         }
@@ -68,7 +85,7 @@ def eval_content(cfg, job_details, resumes, profile):
     
     response = query(
         prompt=prompt,
-        model_name=cfg['agent']['eval']['model'],
+        model_name=model_name,
         cfg=cfg,
         max_tokens=cfg['agent']['eval']['max_tokens'],
         temperature=cfg['agent']['eval']['temperature']
@@ -1,8 +1,5 @@
 import os
-from google import genai
-from google.genai import types
-from openai import OpenAI
-from anthropic import Anthropic
+import threading
 from datetime import datetime
 from typing import Union, Dict
 from dotenv import load_dotenv
@@ -70,6 +67,63 @@ def get_available_llms() -> list:
     """
     return AVAILABLE_LLMS.copy()  # Return a copy to prevent modification of the original list
 
+
+# One client per provider, reused across queries so connections stay open
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _provider(model_name: str) -> str:
+    if model_name.startswith("gemini"):
+        return "gemini"
+    if model_name.startswith("claude"):
+        return "anthropic"
+    if model_name.startswith("gpt"):
+        return "openai"
+    raise ValueError(f"Unknown provider for model: {model_name}")
+
+
+def _create_client(provider: str):
+    # SDKs are imported here so their import cost can be paid in the background (see warm_clients)
+    if provider == "gemini":
+        from google import genai
+        return genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+    if provider == "anthropic":
+        from anthropic import Anthropic
+        return Anthropic(api_key=os.environ.get("ANTHROPIC_API_KEY"))
+    from openai import OpenAI
+    return OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+
+
+def get_client(model_name: str):
+    """
+    Get the API client for a model's provider, creating it on first use.
+    
+    Args:
+        model_name (str): The name of the LLM.
+        
+    Returns:
+        The provider's client (google.genai.Client, Anthropic or OpenAI).
+    """
+    provider = _provider(model_name)
+    with _clients_lock:
+        if provider not in _clients:
+            _clients[provider] = _create_client(provider)
+        return _clients[provider]
+
+
+def warm_clients(model_names) -> None:
+    """
+    Create the clients for several models ahead of their first query.
+    
+    Args:
+        model_names (list): LLM names, e.g. the content, evaluation and code generation models.
+    """
+    for model_name in dict.fromkeys(model_names):
+        if is_valid_llm(model_name):
+            get_client(model_name)
+
+
 def query(model_name, prompt, temperature, max_tokens, cfg=None):
     """
     Query the specified LLM with the given prompt.
@@ -85,11 +139,10 @@ def query(model_name, prompt, temperature, max_tokens, cfg=None):
     if not is_valid_llm(model_name):
         raise ValueError(f"Invalid model name: {model_name}. Available models: {get_available_llms()}")
 
+    client = get_client(model_name)
+
     if model_name.startswith("gemini"):
-        client = genai.Client(
-            # api key from environment variable
-            api_key=os.getenv("GEMINI_API_KEY"),
-        )
+        from google.genai import types
         
         contents = "\n".join(
         f"{entry['role'].capitalize()}: {entry['content']}" for entry in prompt
@@ -107,10 +160,6 @@ def query(model_name, prompt, temperature, max_tokens, cfg=None):
         return response.text
         
     elif model_name.startswith("claude"):
-        client = Anthropic(
-            api_key=os.environ.get("ANTHROPIC_API_KEY"),  
-        )
-        
         messages = [
             {"role": entry["role"], "content": entry["content"]}
             for entry in prompt
@@ -127,10 +176,6 @@ def query(model_name, prompt, temperature, max_tokens, cfg=None):
         return completion.content
         
     elif model_name.startswith("gpt"):
-        client = OpenAI(
-            api_key=os.environ.get("OPENAI_API_KEY"),
-        )
-        
         messages = [
             {"role": entry["role"], "content": entry["content"]}
             for entry in prompt
@@ -0,0 +1,307 @@
+"""
+Token-aware prompt budgeting.
+
+Counts prompt tokens locally before a call is sent, assigns each prompt
+component (job description, profile, evaluation feedback, ...) a budget from
+config.yaml and trims over-budget components by priority: job boilerplate
+first, then low-relevance profile items, then evaluation detail. The final
+token breakdown is logged for every call.
+"""
+
+import os
+import re
+from functools import lru_cache
+
+from utils.profile_slicer import ProfileSlicer
+
+
+# Tokenizer files for tiktoken are cached locally so counting works offline
+TOKENIZER_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', '.cache', 'tiktoken')
+
+# Average characters per token used when no local tokenizer is available
+CHARS_PER_TOKEN = {
+    "gpt": 4.0,
+    "claude": 3.5,
+    "gemini": 4.0,
+}
+
+# Trimming order when a prompt is over budget
+TRIM_PRIORITY = ("job", "profile", "eval")
+
+DEFAULT_COMPONENT_BUDGETS = {
+    "job": 2500,
+    "profile": 2000,
+    "eval": 1500,
+}
+DEFAULT_MAX_INPUT_TOKENS = 12000
+
+# Job sections dropped first when trimming, least useful first (see utils/job_normalizer.py)
+JOB_TRIM_SECTIONS = ("Other Details", "About the Company", "Nice to Have")
+
+# Evaluation sections kept when trimming evaluation detail
+EVAL_KEEP_PATTERN = re.compile(r"(feedback summary|ranked|ranking|summary)", re.IGNORECASE)
+
+# Local fact check and page-fit feedback appended by artisan-builder.py, never trimmed
+EVAL_LOCAL_PATTERN = re.compile(r"^#{1,3} (fact check|layout fit)\s*$", re.IGNORECASE)
+
+
+def model_family(model_name):
+    """
+    Get the tokenizer family of a model.
+
+    Args:
+        model_name (str): The name of the LLM.
+
+    Returns:
+        str: 'gpt', 'claude' or 'gemini'.
+    """
+    for family in CHARS_PER_TOKEN:
+        if model_name and model_name.startswith(family):
+            return family
+    return "gpt"
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model_name):
+    """
+    Load and cache the tiktoken encoding for an OpenAI model.
+
+    Returns:
+        Encoding or None: None if tiktoken is not installed or the tokenizer
+            is not cached and cannot be downloaded.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    os.environ.setdefault("TIKTOKEN_CACHE_DIR", os.path.abspath(TOKENIZER_CACHE_DIR))
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        name = "o200k_base" if model_name.startswith(("gpt-4o", "gpt-4.1")) else "cl100k_base"
+        try:
+            return tiktoken.get_encoding(name)
+        except Exception:
+            return None
+    except Exception:
+        return None
+
+
+def count_tokens(text, model_name):
+    """
+    Count the tokens of a text for a model, locally.
+
+    OpenAI models use tiktoken when available; other model families (and
+    OpenAI without a cached tokenizer) use a per-family character ratio.
+
+    Args:
+        text (str): The text to measure.
+        model_name (str): The name of the LLM.
+
+    Returns:
+        int: Token count.
+    """
+    if not text:
+        return 0
+    family = model_family(model_name)
+    if family == "gpt":
+        encoding = _get_encoding(model_name)
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+    return int(len(text) / CHARS_PER_TOKEN[family]) + 1
+
+
+def count_prompt_tokens(prompt, model_name):
+    """
+    Count the tokens of a chat prompt (list of role/content messages).
+
+    Args:
+        prompt (list): Prompt messages.
+        model_name (str): The name of the LLM.
+
+    Returns:
+        int: Token count including a small per-message overhead.
+    """
+    return sum(count_tokens(entry["content"], model_name) + 4 for entry in prompt)
+
+
+def _truncate(text, max_tokens, model_name):
+    """Cut a text at a line boundary so it fits max_tokens."""
+    if count_tokens(text, model_name) <= max_tokens:
+        return text
+    lines = text.splitlines()
+    low, high = 0, len(lines)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens("\n".join(lines[:mid]), model_name) + 4 <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return "\n".join(lines[:low]).rstrip() + "\n[...]"
+
+
+def _split_sections(text):
+    """Split Markdown into (heading, body) pairs on '## ' headings."""
+    parts = re.split(r"(?m)^(?=## )", text)
+    return [(part.splitlines()[0][3:].strip() if part.startswith("## ") else "", part) for part in parts]
+
+
+def trim_job(text, max_tokens, model_name, query=""):
+    """
+    Trim a job description: drop low-value sections first, then truncate.
+
+    Args:
+        text (str): Job description in Markdown format.
+        max_tokens (int): Target token count.
+        model_name (str): The name of the LLM.
+        query (str): Unused, accepted for a uniform trimmer signature.
+
+    Returns:
+        str: Trimmed job description.
+    """
+    for section in JOB_TRIM_SECTIONS:
+        if count_tokens(text, model_name) <= max_tokens:
+            return text
+        text = "".join(part for heading, part in _split_sections(text) if heading != section)
+    return _truncate(text, max_tokens, model_name)
+
+
+def trim_profile(text, max_tokens, model_name, query=""):
+    """
+    Trim a profile by dropping its least relevant items for the query.
+
+    Args:
+        text (str): Profile (or profile slice) in Markdown format.
+        max_tokens (int): Target token count.
+        model_name (str): The name of the LLM.
+        query (str): Relevance query, usually the job keywords.
+
+    Returns:
+        str: Trimmed profile.
+    """
+    if count_tokens(text, model_name) <= max_tokens:
+        return text
+    slicer = ProfileSlicer(text, token_budget=max_tokens, token_counter=lambda t: count_tokens(t, model_name))
+    if slicer.enabled:
+        text = slicer.render(slicer.select(query))
+    return _truncate(text, max_tokens, model_name)
+
+
+def trim_eval(text, max_tokens, model_name, query=""):
+    """
+    Trim evaluation feedback: keep the summary sections, drop per-criterion detail.
+
+    The local "Fact Check" and "Layout Fit" sections are always kept in full;
+    the summary is cut to the budget left after them.
+
+    Args:
+        text (str): Evaluation feedback in Markdown format.
+        max_tokens (int): Target token count.
+        model_name (str): The name of the LLM.
+        query (str): Unused, accepted for a uniform trimmer signature.
+
+    Returns:
+        str: Trimmed evaluation feedback.
+    """
+    if count_tokens(text, model_name) <= max_tokens:
+        return text
+    parts = re.split(r"(?m)^(?=#{1,3} )", text)
+    headings = [part.splitlines()[0] if part else "" for part in parts]
+    local = "\n\n".join(part.strip() for part, heading in zip(parts, headings) if EVAL_LOCAL_PATTERN.match(heading))
+    rest = [part for part, heading in zip(parts, headings) if not EVAL_LOCAL_PATTERN.match(heading)]
+    summary = "".join(part for part in rest if EVAL_KEEP_PATTERN.search(part.splitlines()[0] if part else ""))
+    if not local:
+        return _truncate(summary or text, max_tokens, model_name)
+    remaining = max(max_tokens - count_tokens(local, model_name) - 2, 0)
+    summary = _truncate(summary or "".join(rest), remaining, model_name).strip() if remaining else ""
+    return f"{summary}\n\n{local}" if summary else local
+
+
+TRIMMERS = {
+    "job": trim_job,
+    "profile": trim_profile,
+    "eval": trim_eval,
+}
+
+
+def get_budget_settings(cfg):
+    """
+    Read the budget settings from the configuration.
+
+    Args:
+        cfg (dict): Configuration dictionary (uses the optional 'budget' section).
+
+    Returns:
+        tuple: (max input tokens, dict of per-component budgets)
+    """
+    settings = (cfg or {}).get('budget', {}) or {}
+    budgets = dict(DEFAULT_COMPONENT_BUDGETS)
+    budgets.update(settings.get('components', {}) or {})
+    return settings.get('max_input_tokens', DEFAULT_MAX_INPUT_TOKENS), budgets
+
+
+def budget_components(components, model_name, cfg, label, fixed_tokens=0, query=""):
+    """
+    Fit prompt components into their budgets and log the token breakdown.
+
+    Each trimmable component ('job', 'profile', 'eval') is first trimmed to its
+    own budget. If the total (including fixed components such as the system
+    prompt) is still above max_input_tokens, components are trimmed further in
+    TRIM_PRIORITY order, never below half of their budget.
+
+    Args:
+        components (dict): Component name to text. Names without a trimmer are fixed.
+        model_name (str): The name of the LLM the prompt is sent to.
+        cfg (dict): Configuration dictionary.
+        label (str): Call label used in the log line.
+        fixed_tokens (int): Tokens of prompt text outside the components.
+        query (str): Relevance query for profile trimming, usually the job keywords.
+
+    Returns:
+        dict: Component name to (possibly trimmed) text.
+    """
+    max_input_tokens, budgets = get_budget_settings(cfg)
+    fitted = dict(components)
+    counts = {name: count_tokens(text, model_name) for name, text in fitted.items()}
+
+    for name in TRIM_PRIORITY:
+        if name in fitted and counts[name] > budgets.get(name, counts[name]):
+            fitted[name] = TRIMMERS[name](fitted[name], budgets[name], model_name, query)
+            counts[name] = count_tokens(fitted[name], model_name)
+
+    for name in TRIM_PRIORITY:
+        overflow = fixed_tokens + sum(counts.values()) - max_input_tokens
+        if overflow <= 0:
+            break
+        if name not in fitted:
+            continue
+        target = max(counts[name] - overflow, budgets.get(name, 0) // 2)
+        if target < counts[name]:
+            fitted[name] = TRIMMERS[name](fitted[name], target, model_name, query)
+            counts[name] = count_tokens(fitted[name], model_name)
+
+    log_token_breakdown(label, model_name, counts, fixed_tokens, max_input_tokens, original={
+        name: count_tokens(text, model_name) for name, text in components.items() if name in TRIMMERS
+    })
+    return fitted
+
+
+def log_token_breakdown(label, model_name, counts, fixed_tokens, max_input_tokens, original=None):
+    """
+    Print the token breakdown of a prompt.
+
+    Args:
+        label (str): Call label.
+        model_name (str): The name of the LLM.
+        counts (dict): Final token count per component.
+        fixed_tokens (int): Tokens outside the components.
+        max_input_tokens (int): Configured input token limit.
+        original (dict): Token counts before trimming, for trimmed components.
+    """
+    total = fixed_tokens + sum(counts.values())
+    parts = []
+    for name, tokens in counts.items():
+        before = (original or {}).get(name)
+        parts.append(f"{name}={tokens}" + (f" (from {before})" if before and before != tokens else ""))
+    status = "⚠️ over budget" if total > max_input_tokens else "✅"
+    print(f"📏 [{label}] {model_name}: {', '.join(parts)}, fixed={fixed_tokens}, total={total}/{max_input_tokens} {status}")
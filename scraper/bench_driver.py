@@ -0,0 +1,69 @@
+"""
+Benchmark for browser startup.
+
+Measures ChromeDriver resolution without the cache (PATH lookup or a
+webdriver_manager download) and from the cached state file, then the time
+to start and quit a headless browser with the cached driver.
+
+Usage:
+    python -m scraper.bench_driver --runs 5
+    python -m scraper.bench_driver --resolve-only
+"""
+
+import time
+import argparse
+
+from scraper.driver_resolver import resolve_chromedriver
+
+
+def _timed(function, runs):
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return min(durations), sum(durations) / len(durations)
+
+
+def run_benchmark(runs, resolve_only=False):
+    """
+    Time driver resolution and browser startup.
+
+    Args:
+        runs (int): Repetitions per measurement.
+        resolve_only (bool): Skip starting browsers.
+
+    Returns:
+        dict: (best, mean) seconds for 'uncached', 'cached' and, unless resolve_only, 'startup'.
+    """
+    results = {
+        "uncached": _timed(lambda: resolve_chromedriver(refresh=True), 1),
+        "cached": _timed(resolve_chromedriver, runs),
+    }
+    if not resolve_only:
+        from scraper.selenium_driver import SeleniumDriver
+
+        def start_and_quit():
+            driver = SeleniumDriver(headless=True)
+            driver.start_driver()
+            driver.close_driver()
+
+        results["startup"] = _timed(start_and_quit, runs)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ChromeDriver resolution and browser startup")
+    parser.add_argument("--runs", type=int, default=5, help="Repetitions per measurement")
+    parser.add_argument("--resolve-only", action="store_true", help="Only time driver resolution, without starting Chrome")
+    args = parser.parse_args()
+
+    print(f"📊 Timing ChromeDriver resolution and startup ({args.runs} runs)...")
+    results = run_benchmark(args.runs, args.resolve_only)
+    labels = {"uncached": "Resolution (uncached)", "cached": "Resolution (cached)", "startup": "Headless start + quit"}
+    for key, (best, mean) in results.items():
+        print(f"{labels[key]:<24} best {best * 1000:8.1f} ms   mean {mean * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
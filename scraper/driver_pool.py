@@ -0,0 +1,275 @@
+"""
+Warm browser pool for the Selenium scrapers.
+
+Starting Chrome costs seconds, and the scrapers used to pay it for every job.
+A DriverPool keeps up to N started SeleniumDriver instances. Each job borrows
+one, gets a fresh tab with cookies and storage cleared, and returns it. Drivers
+that fail a health check or have served M pages are recycled.
+"""
+
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from scraper.selenium_driver import SeleniumDriver
+
+
+# SeleniumDriver options of each site's scraper, so a pool can be warmed before the scraper runs
+SITE_DRIVER_OPTIONS = {
+    "linkedin": {"headless": False, "stealth_mode": False, "block_resources": True},
+    "glassdoor": {"headless": False, "stealth_mode": False, "block_resources": True},
+    # Stealth mode to bypass some detection
+    "indeed": {"headless": False, "stealth_mode": True, "block_resources": True},
+}
+
+class DriverPool:
+    """
+    A pool of warm SeleniumDriver instances sharing the same options.
+    """
+
+    def __init__(self, size: int = 2, max_pages: int = 20, **driver_kwargs):
+        """
+        Initialize an empty pool; drivers are started on first use.
+
+        Args:
+            size: Maximum number of browser instances
+            max_pages: Pages a browser serves before it is restarted
+            driver_kwargs: SeleniumDriver options (headless, stealth_mode, ...)
+        """
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.driver_kwargs = driver_kwargs
+        self._idle = queue.LifoQueue()
+        self._pages = {}
+        self._created = 0
+        self._warming = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _new_driver(self) -> SeleniumDriver:
+        driver = SeleniumDriver(**self.driver_kwargs)
+        driver.start_driver()
+        with self._lock:
+            self._pages[id(driver)] = 0
+        return driver
+
+    def _is_healthy(self, driver: SeleniumDriver) -> bool:
+        """Check that the browser still responds."""
+        try:
+            return driver.driver is not None and driver.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _discard(self, driver: SeleniumDriver) -> None:
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        driver.close_driver()
+        with self._lock:
+            self._created -= 1
+
+    def _reset(self, driver: SeleniumDriver) -> None:
+        """Give the next job a fresh tab without the previous job's cookies and storage."""
+        browser = driver.driver
+        # Storage is cleared per origin; the page just served is the one that wrote to it
+        page = urlparse(browser.current_url)
+        try:
+            browser.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            if page.scheme in ("http", "https"):
+                browser.execute_cdp_cmd("Storage.clearDataForOrigin",
+                                        {"origin": f"{page.scheme}://{page.netloc}", "storageTypes": "all"})
+        except Exception:
+            browser.delete_all_cookies()
+        old_handles = browser.window_handles
+        browser.switch_to.new_window("tab")
+        new_handle = browser.current_window_handle
+        for handle in old_handles:
+            browser.switch_to.window(handle)
+            browser.close()
+        browser.switch_to.window(new_handle)
+
+    def warm(self, count: int = None) -> None:
+        """
+        Start browsers ahead of use.
+
+        Args:
+            count: Number of browsers to have started (defaults to the pool size)
+        """
+        count = min(count or self.size, self.size)
+        while True:
+            with self._lock:
+                if self._created >= count:
+                    return
+                self._created += 1
+                self._warming += 1
+            try:
+                driver = self._new_driver()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                    self._warming -= 1
+                raise
+            if self._closed:
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+            with self._lock:
+                self._warming -= 1
+
+    def acquire(self, timeout: float = None) -> SeleniumDriver:
+        """
+        Borrow a healthy driver, starting one if the pool is not full.
+
+        Args:
+            timeout: Seconds to wait for a driver when all are busy (None waits forever)
+
+        Returns:
+            SeleniumDriver: A started driver
+        """
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    warming = self._warming > 0
+                    can_create = not warming and self._created < self.size
+                    if can_create:
+                        self._created += 1
+                if warming:
+                    # A browser being started by warm() is ready sooner than a new one
+                    try:
+                        driver = self._idle.get(timeout=0.25)
+                    except queue.Empty:
+                        continue
+                elif can_create:
+                    try:
+                        return self._new_driver()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                else:
+                    driver = self._idle.get(timeout=timeout)
+            if self._is_healthy(driver):
+                return driver
+            print("⚠️ Pooled browser is unresponsive, restarting it")
+            self._discard(driver)
+
+    def release(self, driver: SeleniumDriver) -> None:
+        """
+        Return a driver to the pool, recycling it after max_pages pages.
+
+        Args:
+            driver: Driver obtained from acquire
+        """
+        with self._lock:
+            pages = self._pages[id(driver)] = self._pages.get(id(driver), 0) + 1
+        if self._closed or pages >= self.max_pages or not self._is_healthy(driver):
+            self._discard(driver)
+            return
+        try:
+            self._reset(driver)
+        except Exception as e:
+            print(f"⚠️ Could not reset pooled browser, restarting it: {e}")
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def borrow(self, timeout: float = None):
+        """Context manager around acquire/release."""
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self) -> None:
+        """Quit every idle browser; busy ones are quit when released."""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_pools = {}
+_pool_settings = {"enabled": False, "size": 2, "max_pages": 20}
+_pools_lock = threading.Lock()
+
+
+def configure_driver_pools(enabled: bool = True, size: int = 2, max_pages: int = 20) -> None:
+    """
+    Enable or disable pooled drivers for borrow_driver.
+
+    Args:
+        enabled: Borrow drivers from shared pools instead of starting one per job
+        size: Browsers per pool
+        max_pages: Pages a browser serves before it is restarted
+    """
+    _pool_settings.update(enabled=enabled, size=size, max_pages=max_pages)
+
+
+def get_driver_pool(**driver_kwargs) -> DriverPool:
+    """
+    Get the shared pool for a set of SeleniumDriver options.
+
+    Returns:
+        DriverPool: The pool, created on first use
+    """
+    key = tuple(sorted(driver_kwargs.items()))
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = DriverPool(_pool_settings["size"], _pool_settings["max_pages"], **driver_kwargs)
+        return _pools[key]
+
+
+@contextmanager
+def borrow_driver(**driver_kwargs):
+    """
+    Borrow a started SeleniumDriver for one job.
+
+    With pooling enabled the driver comes from the shared warm pool for these
+    options; otherwise a new driver is started and closed afterwards.
+
+    Args:
+        driver_kwargs: SeleniumDriver options (headless, stealth_mode, ...)
+    """
+    if not _pool_settings["enabled"]:
+        with SeleniumDriver(**driver_kwargs) as driver:
+            yield driver
+        return
+    with get_driver_pool(**driver_kwargs).borrow() as driver:
+        yield driver
+
+
+def warm_site_driver(site: str) -> bool:
+    """
+    Start a browser for a site's scraper ahead of its first scrape.
+
+    Only pooled drivers can be handed over, so nothing happens with pooling disabled.
+
+    Args:
+        site: Site name from canonicalize_url ('linkedin', 'indeed', 'glassdoor' or 'web')
+
+    Returns:
+        bool: True if a browser was started (or was already warm)
+    """
+    if not _pool_settings["enabled"] or site not in SITE_DRIVER_OPTIONS:
+        return False
+    get_driver_pool(**SITE_DRIVER_OPTIONS[site]).warm(1)
+    return True
+
+
+def close_driver_pools() -> None:
+    """Quit the browsers of every shared pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_driver_pools)
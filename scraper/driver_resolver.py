@@ -0,0 +1,153 @@
+"""
+Cached ChromeDriver resolution.
+
+Resolving the driver with webdriver_manager makes a network request on every
+browser start. The resolved binary is recorded with its version in
+data/.cache/chromedriver.json instead, and later starts use that path
+directly. Startup then needs no network and works on offline hosts. When
+Chrome has updated past the cached driver and the session cannot be created,
+SeleniumDriver.start_driver resolves the driver again once.
+"""
+
+import os
+import re
+import json
+import shutil
+import subprocess
+from datetime import datetime
+
+
+STATE_FILE = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', '.cache', 'chromedriver.json'))
+
+_settings = {"path": None, "version": None}
+
+
+def configure_chromedriver(path=None, version=None):
+    """
+    Set an explicit ChromeDriver path or version pin.
+
+    Args:
+        path (str): ChromeDriver binary to use as is.
+        version (str): Version pin, e.g. '126' or '126.0.6478.126'; a cached driver
+            of another version is resolved again.
+    """
+    _settings.update(path=path, version=str(version) if version else None)
+
+
+def _is_executable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def driver_version(path):
+    """
+    Read the version of a ChromeDriver binary without any network access.
+
+    Args:
+        path (str): ChromeDriver binary.
+
+    Returns:
+        str or None: Version such as '126.0.6478.126', or None if it cannot be read.
+    """
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"(\d+(?:\.\d+)+)", output)
+    return match.group(1) if match else None
+
+
+def _matches_pin(version, pin):
+    return not pin or (version or "").startswith(pin)
+
+
+def load_state(state_file=STATE_FILE):
+    """
+    Load the cached resolution.
+
+    Returns:
+        dict: {'path', 'version', 'source', 'resolved_at'}, or {} if nothing is cached.
+    """
+    if not os.path.exists(state_file):
+        return {}
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+
+def save_state(path, version, source, state_file=STATE_FILE):
+    """Record a resolved ChromeDriver."""
+    os.makedirs(os.path.dirname(state_file), exist_ok=True)
+    state = {"path": path, "version": version, "source": source, "resolved_at": datetime.now().isoformat(timespec='seconds')}
+    with open(state_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    return state
+
+
+def _find_binary(path):
+    """webdriver_manager sometimes returns a neighbouring file (e.g. THIRD_PARTY_NOTICES); find the binary next to it."""
+    if _is_executable(path) and "chromedriver" in os.path.basename(path).lower():
+        return path
+    directory = os.path.dirname(path)
+    for name in ("chromedriver", "chromedriver.exe"):
+        candidate = os.path.join(directory, name)
+        if _is_executable(candidate):
+            return candidate
+    return None
+
+
+def _download():
+    """Resolve the driver with webdriver_manager (network)."""
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+    except ImportError:
+        return None
+    try:
+        manager = ChromeDriverManager(driver_version=_settings["version"]) if _settings["version"] else ChromeDriverManager()
+        return _find_binary(manager.install())
+    except Exception as e:
+        print(f"⚠️ ChromeDriver download failed: {e}")
+        return None
+
+
+def resolve_chromedriver(refresh=False, state_file=STATE_FILE):
+    """
+    Resolve the ChromeDriver binary, using the cache whenever possible.
+
+    Order: the configured path or CHROMEDRIVER_PATH, the cached resolution,
+    a chromedriver on PATH, then a webdriver_manager download (the only step
+    that uses the network). New resolutions are cached.
+
+    Args:
+        refresh (bool): Ignore the cached resolution.
+        state_file (str): Path of the state file.
+
+    Returns:
+        str or None: Path of the ChromeDriver binary, or None to let Selenium resolve it.
+    """
+    pin = _settings["version"]
+    explicit = _settings["path"] or os.getenv("CHROMEDRIVER_PATH")
+    if _is_executable(explicit):
+        return explicit
+
+    if not refresh:
+        state = load_state(state_file)
+        if _is_executable(state.get("path")) and _matches_pin(state.get("version"), pin):
+            return state["path"]
+
+    on_path = shutil.which("chromedriver")
+    if on_path:
+        version = driver_version(on_path)
+        if _matches_pin(version, pin):
+            save_state(on_path, version, "path", state_file)
+            return on_path
+
+    downloaded = _download()
+    if downloaded:
+        save_state(downloaded, driver_version(downloaded), "webdriver_manager", state_file)
+        print(f"✅ ChromeDriver resolved and cached: {downloaded}")
+        return downloaded
+
+    print("⚠️ No ChromeDriver found; falling back to Selenium's own driver resolution")
+    return None
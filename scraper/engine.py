@@ -0,0 +1,91 @@
+"""
+Concurrent multi-URL scraping.
+
+ScrapeEngine runs a scrape function (normally scrape_url from
+artisan-builder.py) over many URLs on a thread pool and yields each result as
+soon as its job finishes. Concurrency is limited per domain, and the
+politeness delay spaces out request starts per host rather than globally,
+so postings on different sites do not wait on each other. The HTTP paths
+share a pooled requests session; Selenium escalations borrow browsers from
+the bounded DriverPool (scraper/driver_pool.py).
+"""
+
+import time
+import threading
+from itertools import zip_longest
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+def interleave_by_host(urls):
+    """Order URLs round-robin by host, so workers are not all queued behind one domain's limit."""
+    by_host = {}
+    for url in urls:
+        by_host.setdefault(urlparse(url).netloc.lower(), []).append(url)
+    return [url for group in zip_longest(*by_host.values()) for url in group if url is not None]
+
+
+class ScrapeEngine:
+    """
+    Scrape many URLs concurrently with per-domain limits.
+    """
+
+    def __init__(self, scrape, max_workers: int = 4, per_domain: int = 2, politeness_seconds: float = 1.0):
+        """
+        Initialize the engine.
+
+        Args:
+            scrape: Function taking a URL and returning (job store key, Markdown file path)
+            max_workers: URLs scraped at the same time overall
+            per_domain: URLs scraped at the same time per domain
+            politeness_seconds: Minimum time between request starts on the same host
+        """
+        self.scrape = scrape
+        self.max_workers = max(1, max_workers)
+        self.per_domain = max(1, per_domain)
+        self.politeness_seconds = politeness_seconds
+        self._domain_slots = {}
+        self._next_start = {}
+        self._lock = threading.Lock()
+
+    def _domain_slot(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            if host not in self._domain_slots:
+                self._domain_slots[host] = threading.Semaphore(self.per_domain)
+            return self._domain_slots[host]
+
+    def _wait_politely(self, host: str) -> None:
+        """Reserve the next start time on the host and sleep until it."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.politeness_seconds
+        if start > now:
+            time.sleep(start - now)
+
+    def _run(self, url: str) -> dict:
+        host = urlparse(url).netloc.lower()
+        with self._domain_slot(host):
+            self._wait_politely(host)
+            start = time.perf_counter()
+            try:
+                files = self.scrape(url)
+                error = None if files else "scraper returned no files"
+            except Exception as e:
+                files, error = None, str(e)
+            return {"url": url, "files": files, "error": error, "seconds": round(time.perf_counter() - start, 2)}
+
+    def scrape_many(self, urls):
+        """
+        Scrape URLs concurrently, yielding results in completion order.
+
+        Args:
+            urls (list): Job posting URLs.
+
+        Yields:
+            dict: {'url', 'files' (tuple or None), 'error' (str or None), 'seconds'}
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scrape") as executor:
+            futures = [executor.submit(self._run, url) for url in interleave_by_host(urls)]
+            for future in as_completed(futures):
+                yield future.result()
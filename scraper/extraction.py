@@ -0,0 +1,90 @@
+"""
+Declarative job field extraction for the Selenium scrapers.
+
+Each site has a spec mapping a field to its CSS selectors (tried in order) and
+whether it is required. The whole spec runs as one injected asynchronous
+script: the browser polls until every required field has text or the timeout
+passes, then returns all fields at once. Optional fields such as salary never
+hold up extraction, and the page costs one WebDriver round-trip instead of one
+wait per field.
+"""
+
+import time
+
+from scraper.readiness import readiness_settings
+
+
+SITE_SPECS = {
+    "linkedin": {
+        "title": {"selectors": ["h1.top-card-layout__title", "h1.topcard__title"], "required": True},
+        "company": {"selectors": ["span.topcard__flavor", "a.topcard__org-name-link"]},
+        "location": {"selectors": ["span.topcard__flavor--bullet"]},
+        "description": {"selectors": ["div.show-more-less-html__markup"], "required": True},
+    },
+    "indeed": {
+        "title": {"selectors": ["h1.jobsearch-JobInfoHeader-title", "h1[data-testid='jobsearch-JobInfoHeader-title']"], "required": True},
+        "company": {"selectors": ["div[data-company-name='true'] a", "div[data-company-name='true']"]},
+        "location": {"selectors": ["div[data-testid='inlineHeader-companyLocation'] div[data-testid='job-location']",
+                                   "div[data-testid='job-location']"]},
+        "description": {"selectors": ["#jobDescriptionText"], "required": True},
+    },
+    "glassdoor": {
+        "title": {"selectors": ["h1.heading_Heading__BqX5J.heading_Level1__soLZs", "h1[id^='jd-job-title']"], "required": True},
+        "company": {"selectors": ["div.EmployerProfile_employerNameHeading__bXBYr"]},
+        "location": {"selectors": ["div[data-test='location']"]},
+        "salary": {"selectors": ["div.SalaryEstimate_salaryRange__brHFy", "div[data-test='detailSalary']"]},
+        "description": {"selectors": ["div.JobDetails_jobDescription__uW_fK"], "required": True},
+    },
+}
+
+# "Show more" buttons that expand the description before extraction
+EXPAND_SELECTORS = {
+    "linkedin": "button.show-more-less-html__button--more",
+    "glassdoor": "button.ShowMoreCTA_showMore__EtZpZ",
+}
+
+# arguments: spec, timeout in ms, callback. Resolves with {field: text or null}.
+_EXTRACT_JS = """
+const spec = arguments[0];
+const deadline = Date.now() + arguments[1];
+const done = arguments[arguments.length - 1];
+function read(field) {
+    for (const selector of spec[field].selectors) {
+        const el = document.querySelector(selector);
+        const text = el && (spec[field].attribute ? el.getAttribute(spec[field].attribute) : el.innerText);
+        if (text && text.trim()) { return text.trim(); }
+    }
+    return null;
+}
+function poll() {
+    const fields = {};
+    for (const field of Object.keys(spec)) { fields[field] = read(field); }
+    const ready = Object.keys(spec).every(field => !spec[field].required || fields[field] !== null);
+    if (ready || Date.now() >= deadline) { done(fields); } else { setTimeout(poll, 100); }
+}
+poll();
+"""
+
+
+def extract_fields(browser, spec, timeout=None, default="N/A"):
+    """
+    Extract every field of a spec in a single script call.
+
+    Args:
+        browser: Selenium WebDriver.
+        spec (dict): Field name to {'selectors': [...], 'required': bool, 'attribute': optional}.
+        timeout (float): Seconds to wait for the required fields (defaults to the readiness timeout).
+        default (str): Value for fields that were not found.
+
+    Returns:
+        tuple: (fields, missing) where fields maps every field to its text or the
+            default, and missing lists the required fields that were not found.
+    """
+    timeout = readiness_settings()["timeout"] if timeout is None else timeout
+    browser.set_script_timeout(timeout + 5)
+    start = time.perf_counter()
+    found = browser.execute_async_script(_EXTRACT_JS, spec, int(timeout * 1000)) or {}
+    fields = {field: found.get(field) or default for field in spec}
+    missing = [field for field, rule in spec.items() if rule.get("required") and not found.get(field)]
+    print(f"🔍 Extracted {sum(1 for field in spec if found.get(field))}/{len(spec)} fields in {time.perf_counter() - start:.2f}s")
+    return fields, missing
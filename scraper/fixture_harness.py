@@ -0,0 +1,302 @@
+"""
+Recorded-fixture harness for the scrapers.
+
+Serves the HTML snapshots in data/scraper-fixtures/<site>/ from a local HTTP
+server and runs the scrapers' extraction against them, without touching the
+live job boards:
+
+- HTTP path: the page is fetched with the shared session and parsed like
+  scraper/http_scraper.py does (JSON-LD, then the site's selectors).
+- Browser path: a headless SeleniumDriver loads the page, clicks the site's
+  "Show more" button and runs the single-call extraction from
+  scraper/extraction.py, counting WebDriver round-trips.
+
+Each snapshot has a <name>.json next to it with the expected field values
+(and 'description_contains' snippets). A required field that no longer
+matches, a wrong value, or a primary selector that only matches through a
+fallback is reported; mismatches make the harness exit with status 1.
+
+Usage:
+    python -m scraper.fixture_harness
+    python -m scraper.fixture_harness --site glassdoor --no-browser
+    python -m scraper.fixture_harness --record "https://www.linkedin.com/jobs/view/123" --site linkedin --name ml-engineer
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from bs4 import BeautifulSoup
+
+from scraper.extraction import SITE_SPECS, EXPAND_SELECTORS, extract_fields
+from scraper.http_scraper import get_session, extract_details
+
+
+FIXTURE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'scraper-fixtures'))
+
+# Index of the first selector that matches each field, or -1
+_SELECTOR_REPORT_JS = """
+const spec = arguments[0];
+const report = {};
+for (const field of Object.keys(spec)) {
+    report[field] = spec[field].selectors.findIndex(selector => {
+        const el = document.querySelector(selector);
+        return el && (el.innerText || el.getAttribute(spec[field].attribute || '') || '').trim();
+    });
+}
+return report;
+"""
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Serve a directory over HTTP on a free local port, in a background thread."""
+
+    def __init__(self, directory=FIXTURE_DIR):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), partial(_QuietHandler, directory=directory))
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/{path}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def list_fixtures(site=None, fixture_dir=FIXTURE_DIR):
+    """
+    List recorded snapshots.
+
+    Returns:
+        list: (site, name) pairs with both <name>.html and <name>.json present.
+    """
+    fixtures = []
+    for site_name in sorted(os.listdir(fixture_dir)) if os.path.isdir(fixture_dir) else []:
+        if site and site_name != site:
+            continue
+        site_dir = os.path.join(fixture_dir, site_name)
+        for file_name in sorted(os.listdir(site_dir)):
+            name, ext = os.path.splitext(file_name)
+            if ext == ".html" and os.path.exists(os.path.join(site_dir, f"{name}.json")):
+                fixtures.append((site_name, name))
+    return fixtures
+
+
+def compare_fields(fields, expected):
+    """
+    Compare extracted fields with a fixture's expectations.
+
+    Returns:
+        list: Problem descriptions (empty if everything matches).
+    """
+    problems = []
+    for field, value in expected.items():
+        if field == "description_contains":
+            description = fields.get("description") or ""
+            problems += [f"description is missing '{snippet}'" for snippet in value if snippet not in description]
+        elif (fields.get(field) or "N/A") != value:
+            problems.append(f"{field}: expected '{value}', got '{fields.get(field) or 'N/A'}'")
+    return problems
+
+
+def static_selector_report(html, spec):
+    """Index of the first selector that matches each field in the raw HTML, or -1."""
+    soup = BeautifulSoup(html, "html.parser")
+    report = {}
+    for field, rule in spec.items():
+        report[field] = -1
+        for index, selector in enumerate(rule["selectors"]):
+            element = soup.select_one(selector)
+            if element is not None and element.get_text(strip=True):
+                report[field] = index
+                break
+    return report
+
+
+def selector_problems(report, spec):
+    """
+    Turn a selector report into problems (required field unmatched) and warnings (fallback in use).
+    """
+    problems, warnings = [], []
+    for field, index in report.items():
+        rule = spec[field]
+        if index < 0 and rule.get("required"):
+            problems.append(f"{field}: no selector matches ({', '.join(rule['selectors'])})")
+        elif index < 0:
+            warnings.append(f"{field}: optional field, no selector matches")
+        elif index > 0:
+            warnings.append(f"{field}: primary selector '{rule['selectors'][0]}' no longer matches, "
+                            f"fallback '{rule['selectors'][index]}' used")
+    return problems, warnings
+
+
+def run_static(server, site, name, expected):
+    """Run the HTTP-path extraction against one fixture."""
+    start = time.perf_counter()
+    response = get_session().get(server.url(f"{site}/{name}.html"), timeout=10)
+    details, method = extract_details(response.text, site, min_description_chars=1)
+    elapsed = time.perf_counter() - start
+    problems = compare_fields(details, expected) if details else [f"no job posting extracted ({method})"]
+    warnings = []
+    if site in SITE_SPECS and method == "selectors":
+        selector_issues, warnings = selector_problems(static_selector_report(response.text, SITE_SPECS[site]), SITE_SPECS[site])
+        problems += selector_issues
+    return {"seconds": elapsed, "method": method, "problems": problems, "warnings": warnings}
+
+
+def _count_round_trips(browser):
+    """Wrap the WebDriver command executor so every command sent to the driver is counted."""
+    executor = browser.command_executor
+    original = executor.execute
+    counter = {"commands": 0}
+
+    def counted(command, params):
+        counter["commands"] += 1
+        return original(command, params)
+
+    executor.execute = counted
+    return counter, lambda: setattr(executor, "execute", original)
+
+
+def run_browser(driver, server, site, name, expected):
+    """Run the Selenium extraction against one fixture with a started driver."""
+    spec = SITE_SPECS[site]
+    counter, restore = _count_round_trips(driver.driver)
+    try:
+        start = time.perf_counter()
+        driver.get_page(server.url(f"{site}/{name}.html"))
+        if site in EXPAND_SELECTORS:
+            driver.click_if_present(EXPAND_SELECTORS[site])
+        load_commands = counter["commands"]
+        extract_start = time.perf_counter()
+        fields, missing = extract_fields(driver.driver, spec, timeout=5)
+        extract_seconds = time.perf_counter() - extract_start
+        total_seconds = time.perf_counter() - start
+        extract_commands = counter["commands"] - load_commands
+    finally:
+        restore()
+    report = driver.driver.execute_script(_SELECTOR_REPORT_JS, spec)
+    problems, warnings = selector_problems(report, spec)
+    problems += [problem for problem in compare_fields(fields, expected) if problem not in problems]
+    return {
+        "seconds": total_seconds,
+        "extract_seconds": extract_seconds,
+        "round_trips": counter["commands"],
+        "extract_round_trips": extract_commands,
+        "problems": problems,
+        "warnings": warnings,
+    }
+
+
+def run_harness(site=None, use_browser=True, fixture_dir=FIXTURE_DIR):
+    """
+    Run every fixture and print a report.
+
+    Returns:
+        bool: True if no fixture had problems.
+    """
+    fixtures = list_fixtures(site, fixture_dir)
+    if not fixtures:
+        print(f"❌ No fixtures found in {fixture_dir}")
+        return False
+
+    driver = None
+    if use_browser and any(fixture_site in SITE_SPECS for fixture_site, _ in fixtures):
+        from scraper.selenium_driver import SeleniumDriver
+        driver = SeleniumDriver(headless=True, block_resources=True)
+        driver.start_driver()
+
+    failures = 0
+    try:
+        with FixtureServer(fixture_dir) as server:
+            for fixture_site, name in fixtures:
+                with open(os.path.join(fixture_dir, fixture_site, f"{name}.json"), "r", encoding="utf-8") as f:
+                    expected = json.load(f)
+                results = {"http": run_static(server, fixture_site, name, expected)}
+                if driver and fixture_site in SITE_SPECS:
+                    results["browser"] = run_browser(driver, server, fixture_site, name, expected)
+
+                problems = [f"[{path}] {problem}" for path, result in results.items() for problem in result["problems"]]
+                warnings = sorted({warning for result in results.values() for warning in result["warnings"]})
+                timing = f"http {results['http']['seconds'] * 1000:.0f} ms ({results['http']['method']})"
+                if "browser" in results:
+                    browser = results["browser"]
+                    timing += (f" | browser {browser['seconds'] * 1000:.0f} ms, {browser['round_trips']} round-trips "
+                               f"(extraction {browser['extract_seconds'] * 1000:.0f} ms, {browser['extract_round_trips']} round-trips)")
+                print(f"{'❌' if problems else '✅'} {fixture_site}/{name}: {timing}")
+                for problem in problems:
+                    print(f"   ❌ {problem}")
+                for warning in warnings:
+                    print(f"   ⚠️ {warning}")
+                failures += bool(problems)
+    finally:
+        if driver:
+            driver.close_driver()
+
+    print(f"\n{len(fixtures) - failures}/{len(fixtures)} fixtures passed")
+    return failures == 0
+
+
+def record_fixture(url, site, name, fixture_dir=FIXTURE_DIR):
+    """
+    Save a live page as a fixture, with the current extraction as its expectations.
+
+    Review the generated <name>.json before committing it.
+    """
+    from scraper.selenium_driver import SeleniumDriver
+
+    with SeleniumDriver(headless=False) as driver:
+        driver.get_page(url)
+        if site in EXPAND_SELECTORS:
+            driver.click_if_present(EXPAND_SELECTORS[site])
+        fields, missing = extract_fields(driver.driver, SITE_SPECS[site]) if site in SITE_SPECS else ({}, [])
+        html = driver.get_page_source()
+
+    site_dir = os.path.join(fixture_dir, site)
+    os.makedirs(site_dir, exist_ok=True)
+    with open(os.path.join(site_dir, f"{name}.html"), "w", encoding="utf-8") as f:
+        f.write(html)
+    expected = {field: value for field, value in fields.items() if field != "description" and value != "N/A"}
+    description = fields.get("description", "")
+    if description and description != "N/A":
+        expected["description_contains"] = [description.strip().splitlines()[0][:80]]
+    with open(os.path.join(site_dir, f"{name}.json"), "w", encoding="utf-8") as f:
+        json.dump(expected, f, ensure_ascii=False, indent=2)
+    print(f"✅ Recorded {site}/{name} ({len(html) / 1024:.0f} KB)")
+    if missing:
+        print(f"⚠️ Required fields not found while recording: {', '.join(missing)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the scrapers against recorded HTML fixtures")
+    parser.add_argument("--site", choices=sorted(set(SITE_SPECS) | {"web"}), help="Only run fixtures of this site")
+    parser.add_argument("--no-browser", action="store_true", help="Only run the HTTP path (no Chrome needed)")
+    parser.add_argument("--record", metavar="URL", help="Record a live page as a new fixture (requires --site and --name)")
+    parser.add_argument("--name", help="Fixture name for --record")
+    args = parser.parse_args()
+
+    if args.record:
+        if not (args.site and args.name):
+            parser.error("--record requires --site and --name")
+        record_fixture(args.record, args.site, args.name)
+        return
+
+    sys.exit(0 if run_harness(args.site, use_browser=not args.no_browser) else 1)
+
+
+if __name__ == "__main__":
+    main()
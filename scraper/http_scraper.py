@@ -0,0 +1,283 @@
+"""
+HTTP-first job scraping without a browser.
+
+Many job pages (company career sites, LinkedIn guest job pages) embed a
+schema.org JobPosting as application/ld+json or render the description
+server-side. Those are fetched with a pooled requests session and parsed
+with BeautifulSoup, which takes well under a second. scrape_url in
+artisan-builder.py only escalates to Selenium or the Reader API when this
+path does not find a complete posting.
+"""
+
+import re
+import json
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+from scraper.extraction import SITE_SPECS
+from scraper.job_files import save_job_details, job_file_name
+
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the shared requests session, keeping connections alive between scrapes."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _session.headers.update(HEADERS)
+        return _session
+
+
+def warm_session(url, timeout=10):
+    """
+    Open a keep-alive connection to a URL's host ahead of the first scrape.
+
+    Returns:
+        bool: False if the host could not be reached.
+    """
+    parsed = urlparse(url)
+    try:
+        get_session().head(f"{parsed.scheme or 'https'}://{parsed.netloc}/", timeout=timeout, allow_redirects=False)
+        return True
+    except requests.RequestException:
+        return False
+
+
+def _parse_html(html):
+    try:
+        return BeautifulSoup(html, "lxml")
+    except Exception:
+        return BeautifulSoup(html, "html.parser")
+
+
+def _html_to_text(value):
+    """Convert an HTML fragment (JSON-LD descriptions usually are HTML) to plain text."""
+    if "<" not in value:
+        return value.strip()
+    soup = BeautifulSoup(value, "html.parser")
+    for item in soup.find_all("li"):
+        item.replace_with(f"- {item.get_text(' ', strip=True)}")
+    text = soup.get_text("\n")
+    return re.sub(r"\n\s*\n+", "\n\n", text).strip()
+
+
+def _iter_json_ld(soup):
+    """Yield every JSON-LD object on the page, flattening lists and @graph."""
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or script.get_text() or "")
+        except ValueError:
+            continue
+        stack = [data]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                stack.extend(item)
+            elif isinstance(item, dict):
+                yield item
+                if isinstance(item.get("@graph"), list):
+                    stack.extend(item["@graph"])
+
+
+def _is_job_posting(item):
+    types = item.get("@type", [])
+    return "JobPosting" in (types if isinstance(types, list) else [types])
+
+
+def _location(posting):
+    """Format jobLocation (one or several Places) and remote postings."""
+    locations = posting.get("jobLocation") or []
+    if isinstance(locations, dict):
+        locations = [locations]
+    names = []
+    for place in locations:
+        address = place.get("address", {}) if isinstance(place, dict) else {}
+        if isinstance(address, str):
+            names.append(address)
+            continue
+        country = address.get("addressCountry")
+        if isinstance(country, dict):
+            country = country.get("name")
+        parts = [address.get("addressLocality"), address.get("addressRegion"), country]
+        name = ", ".join(part for part in parts if part)
+        if name and name not in names:
+            names.append(name)
+    if posting.get("jobLocationType") == "TELECOMMUTE":
+        names.append("Remote")
+    return "; ".join(names) or "N/A"
+
+
+def _salary(posting):
+    """Format baseSalary as e.g. 'USD 120000-150000 per YEAR', or None."""
+    salary = posting.get("baseSalary")
+    if not isinstance(salary, dict):
+        return None
+    value = salary.get("value", {})
+    if not isinstance(value, dict):
+        value = {"value": value}
+    low, high = value.get("minValue"), value.get("maxValue")
+    amount = f"{low}-{high}" if low and high else value.get("value") or low or high
+    if not amount:
+        return None
+    currency = salary.get("currency", "")
+    unit = value.get("unitText")
+    return " ".join(str(part) for part in (currency, amount, f"per {unit}" if unit else "") if part)
+
+
+def extract_job_posting(soup):
+    """
+    Extract job details from schema.org JobPosting JSON-LD.
+
+    Args:
+        soup (BeautifulSoup): Parsed page.
+
+    Returns:
+        dict or None: 'title', 'company', 'location', 'description' and, when
+            given, 'salary'; None if the page has no JobPosting.
+    """
+    for item in _iter_json_ld(soup):
+        if not _is_job_posting(item):
+            continue
+        organization = item.get("hiringOrganization") or {}
+        details = {
+            "title": (item.get("title") or "").strip() or "N/A",
+            "company": (organization.get("name") if isinstance(organization, dict) else organization) or "N/A",
+            "location": _location(item),
+            "description": _html_to_text(item.get("description") or ""),
+        }
+        salary = _salary(item)
+        if salary:
+            details["salary"] = salary
+        return details
+    return None
+
+
+def extract_with_selectors(soup, spec):
+    """
+    Extract job details from server-rendered HTML with a site spec from scraper/extraction.py.
+
+    Returns:
+        dict or None: Every field of the spec ('N/A' if not found), or None if a
+            required field is missing.
+    """
+    details = {}
+    for field, rule in spec.items():
+        value = None
+        for selector in rule["selectors"]:
+            element = soup.select_one(selector)
+            if element is None:
+                continue
+            text = element.get(rule["attribute"]) if rule.get("attribute") else element.get_text("\n")
+            if text and text.strip():
+                value = re.sub(r"\n\s*\n+", "\n\n", text).strip()
+                break
+        if value is None and rule.get("required"):
+            return None
+        details[field] = value or "N/A"
+    return details
+
+
+def extract_details(html, site="web", min_description_chars=200):
+    """
+    Extract job details from a page's HTML: JSON-LD first, then the site's selectors.
+
+    Returns:
+        tuple: (details, method) where method is 'JSON-LD' or 'selectors'; details is
+            None if neither yields a description of at least min_description_chars.
+    """
+    soup = _parse_html(html)
+    details, method = extract_job_posting(soup), "JSON-LD"
+    if not details or len(details["description"]) < min_description_chars:
+        details, method = (extract_with_selectors(soup, SITE_SPECS[site]) if site in SITE_SPECS else None), "selectors"
+    if not details or len(details["description"]) < min_description_chars:
+        return None, method
+    return details, method
+
+
+def page_validators(response):
+    """Return the ETag and Last-Modified headers of a response, for conditional revalidation."""
+    return {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+
+
+def revalidate(url, etag=None, last_modified=None, timeout=10):
+    """
+    Check with a conditional request whether a page is unchanged since it was scraped.
+
+    Args:
+        url (str): Page URL.
+        etag (str): ETag from the earlier response.
+        last_modified (str): Last-Modified from the earlier response.
+        timeout (float): Request timeout in seconds.
+
+    Returns:
+        bool: True if the server answered 304 Not Modified.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    if not headers:
+        return False
+    try:
+        with get_session().get(url, headers=headers, timeout=timeout, stream=True) as response:
+            return response.status_code == 304
+    except requests.RequestException:
+        return False
+
+
+def scrape_http(url, site="web", timeout=10, min_description_chars=200):
+    """
+    Scrape a job posting with a plain HTTP request.
+
+    Args:
+        url (str): Canonical job posting URL.
+        site (str): Site name from canonicalize_url, used for the selector fallback and file prefix.
+        timeout (float): Request timeout in seconds.
+        min_description_chars (int): Shorter descriptions count as a failed scrape
+            (e.g. a login wall or a client-rendered shell).
+
+    Returns:
+        tuple: (files, validators). files is (job store key, Markdown file path), or
+            None so the caller can escalate to a browser; validators holds the
+            page's ETag and Last-Modified even when extraction failed.
+    """
+    print(f"⚡ Fetching job page over HTTP: {url}")
+    try:
+        response = get_session().get(url, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"⚠️ HTTP fetch failed: {e}")
+        return None, {}
+    if response.status_code != 200:
+        print(f"⚠️ HTTP fetch returned status {response.status_code}")
+        return None, {}
+    validators = page_validators(response)
+    if "html" not in response.headers.get("Content-Type", "html"):
+        print(f"⚠️ HTTP fetch returned {response.headers['Content-Type']}, not HTML")
+        return None, validators
+
+    details, method = extract_details(response.text, site, min_description_chars)
+    if not details:
+        print("⚠️ No complete job posting in the HTML")
+        return None, validators
+
+    print(f"✅ Extracted job details over HTTP ({method}) in {response.elapsed.total_seconds():.2f}s")
+    job_details = {"url": url, **details}
+    return save_job_details(job_details, job_file_name(site, details["title"])), validators
@@ -1,10 +1,9 @@
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException
-from scraper.selenium_driver import SeleniumDriver
-import time
-from datetime import datetime
-import os
-import json
+from scraper.driver_pool import borrow_driver, SITE_DRIVER_OPTIONS
+from scraper.job_files import save_job_details, job_file_name
+from scraper.url_canonical import canonicalize_url
+from scraper.readiness import readiness_settings
+from scraper.extraction import extract_fields, SITE_SPECS
 
 def scrape_indeed_job(url):
     """
@@ -12,104 +11,51 @@ def scrape_indeed_job(url):
     Args:
         url (str): The URL of the Indeed job listing page.
     Returns:
-        tuple: A tuple containing the paths of the saved JSON and Markdown files.
+        tuple: (job store key, Markdown file path).
     
     """
 
     print("🚀 Starting indeed job details scraper...")
 
     try:
-        with SeleniumDriver(headless=False, stealth_mode=True) as driver:  # Try stealth mode to bypass some detection
+        with borrow_driver(**SITE_DRIVER_OPTIONS["indeed"]) as driver:
             print(f"📄 Loading Indeed job page: {url}")
             
             if not driver.get_page(url):
                 print("❌ Failed to load Indeed job page")
                 return None
                 
-            # Check for CAPTCHA and wait for manual solving
+            # The title element shows we are past any CAPTCHA; continue as soon as it appears
             print("⏳ Waiting for page to load and checking for CAPTCHA...")
-            print("💡 If you see a CAPTCHA, please solve it manually in the browser window.")
-            print("💡 You'll have 60 seconds to solve any CAPTCHA before the script continues.")
-            
-            # Give user time to solve CAPTCHA if it appears
-            time.sleep(30)
-            
-            # Try to detect if we're still on a CAPTCHA page
-            try:
-                # Look for title element as indication we've passed CAPTCHA
-                driver.wait_for_element((By.CSS_SELECTOR, "h1.jobsearch-JobInfoHeader-title"), timeout=5)
+            if driver.wait_for_element((By.CSS_SELECTOR, "h1.jobsearch-JobInfoHeader-title"), timeout=5):
                 print("✅ Page loaded successfully!")
-            except TimeoutException:
-                print("⚠️ Still waiting for job page to load fully...")
-                print("💡 You have 30 more seconds to solve any CAPTCHA if present.")
-                time.sleep(30)  # Additional time if needed
+            else:
+                captcha_timeout = readiness_settings()["captcha_timeout"]
+                print("💡 If you see a CAPTCHA, please solve it manually in the browser window.")
+                print(f"💡 You'll have {captcha_timeout} seconds to solve any CAPTCHA before the script continues.")
+                driver.wait_for_element((By.CSS_SELECTOR, "h1.jobsearch-JobInfoHeader-title"), timeout=captcha_timeout)
                 
-            # Extract job title
-            print("🔍 Extracting job title..." )
-            #<h1 class="jobsearch-JobInfoHeader-title css-1lipiqt e1tiznh50" lang="en" dir="ltr" data-testid="jobsearch-JobInfoHeader-title"><span>Principal AI/ML Scientist</span></h1>
-            title_element = driver.wait_for_element((By.CSS_SELECTOR, "h1.jobsearch-JobInfoHeader-title"), timeout=20)
-            if not title_element:
+            # All fields in a single script call; only title and description gate the wait
+            fields, missing = extract_fields(driver.driver, SITE_SPECS['indeed'])
+            if "title" in missing:
                 print("❌ Failed to find job title element")
                 print("📸 Taking screenshot for debugging...")
                 driver.take_screenshot("indeed_scraper_no_title.png")
                 print("⚠️ This could be due to a CAPTCHA or the page structure has changed.")
                 print("💡 Check the screenshot to see if a CAPTCHA is present.")
                 return None
-            title = title_element.text.strip()
-            print(f"✅ Successfully extracted job title: {title}")
-            
-           
-            company_element = driver.wait_for_element((By.CSS_SELECTOR, "div[data-company-name='true'] a"), timeout=20)
-            company = company_element.text.strip() if company_element else "N/A"
-
-            # <div data-testid="inlineHeader-companyLocation" class="css-1vysp2z eu4oa1w0"><div data-testid="job-location" class="css-dgqgie eu4oa1w0">22 Adelaide Street West, Suite 2500, Toronto, ON M5H 4E3</div></div>
-            location_element = driver.wait_for_element((By.CSS_SELECTOR, "div[data-testid='inlineHeader-companyLocation'] div[data-testid='job-location']"), timeout=20)
-            location = location_element.text.strip() if location_element else "N/A"
-
-            # <div id="jobDescriptionText" class="jobsearch-JobComponent-description css-1rybqxq eu4oa1w0">
-            description_element = driver.wait_for_element((By.ID, "jobDescriptionText"), timeout=20)
-            description = description_element.text.strip() if description_element else "N/A"
+            if missing:
+                print(f"❌ Could not find required fields: {', '.join(missing)}")
+                return None
+            print(f"✅ Successfully extracted job title: {fields['title']}")
 
             print("✅ Successfully extracted job details")
 
-            job_details = {
-                "title": title,
-                "company": company,
-                "location": location,
-                "description": description,
-                "url": url,
-            }
-
-            # Write job details as a json file to D:\2025\DS-AI-ML-GEN\ai-artisan\data\scraped-data\raw-json we are currently in D:\2025\DS-AI-ML-GEN\ai-artisan/scraper
-            
-            file_name = f'indeed_{url.split("&jk=")[1].split("&")[0]}_{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}'
+            job_details = {**fields, "url": url}
 
-            import json
-            import os
-            output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'scraped-data', 'raw-json')
-            os.makedirs(output_dir, exist_ok=True)
-            output_file = os.path.join(output_dir, f'{file_name}.json')
-            output_file = os.path.abspath(output_file)
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(job_details, f, ensure_ascii=False, indent=4)
-
-            # Write job details in md format to D:\2025\DS-AI-ML-GEN\ai-artisan\data\scraped-data\raw-md
-            output_md_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'scraped-data', 'raw-md')
-            os.makedirs(output_md_dir, exist_ok=True)
-            output_md_file = os.path.join(output_md_dir, f'{file_name}.md')
-            output_md_file = os.path.abspath(output_md_file)
-            with open(output_md_file, 'w', encoding='utf-8') as f:
-                f.write(f"# Job Title: {job_details['title']}\n")
-                f.write(f"**Company:** {job_details['company']}\n")
-                f.write(f"**Location:** {job_details['location']}\n")
-                f.write("\n## Job Description:\n")
-                f.write(job_details['description'])
-            print(f"✅ Job details saved to {output_file} and {output_md_file}")
-            print("📂 Job details successfully saved to JSON and Markdown files."
-                  )
-            
-            # For now, just returning the job title as a proof of concept
-            return (output_file, output_md_file)
+            files = save_job_details(job_details, job_file_name('indeed', canonicalize_url(url)['job_id']))
+            print("📂 Job details successfully saved to the job store and exported to Markdown.")
+            return files
     except Exception as e:
         print(f"❌ Error during scraping: {str(e)}")
         return None
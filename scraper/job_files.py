@@ -0,0 +1,84 @@
+"""
+Shared writer for scraped job details.
+
+Every scraper saves its job details to the SQLite job store
+(scraper/job_store.py) and exports the Markdown rendering the pipeline reads
+to data/scraped-data/raw-md.
+"""
+
+import os
+import re
+import threading
+from datetime import datetime
+
+from scraper.job_store import store_job, job_markdown
+
+
+SCRAPED_DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'scraped-data'))
+RAW_MD_DIR = os.path.join(SCRAPED_DATA_DIR, 'raw-md')
+
+# Concurrent scrapes may produce the same timestamped name
+_save_lock = threading.Lock()
+
+
+def job_file_name(prefix, name):
+    """
+    Build a timestamped file name (without extension) for scraped job files.
+
+    Args:
+        prefix (str): Scraper prefix, e.g. 'linkedin'.
+        name (str): Job title or ID.
+
+    Returns:
+        str: '<prefix>_<sanitized name>_<timestamp>'
+    """
+    sanitized = re.sub(r"[^\w\-]+", "_", name.strip()).strip("_")[:50] or "job"
+    return f"{prefix}_{sanitized}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+
+def job_details_markdown(job_details):
+    """
+    Render job board details in the Markdown format used by the job board scrapers.
+
+    Args:
+        job_details (dict): 'title', 'company', 'location', 'description' and optional 'salary'.
+
+    Returns:
+        str: Job details in Markdown format.
+    """
+    md_content = f"# Job Title: {job_details['title']}\n"
+    md_content += f"**Company:** {job_details['company']}\n"
+    md_content += f"**Location:** {job_details['location']}\n"
+    if 'salary' in job_details:
+        md_content += f"**Salary:** {job_details['salary']}\n"
+    md_content += "\n## Job Description:\n"
+    md_content += job_details['description']
+    return md_content
+
+
+def save_job_details(job_details, file_name, md_content=None):
+    """
+    Save scraped job details to the job store and export them as Markdown.
+
+    Args:
+        job_details (dict): Scraped job details, including 'url'.
+        file_name (str): Markdown file name without extension (see job_file_name).
+        md_content (str): Markdown to export; defaults to job_details_markdown(job_details).
+
+    Returns:
+        tuple: (job store key, Markdown file path). A numeric suffix is added to
+            the file name when it is already taken.
+    """
+    record = store_job(job_details, md_content)
+    os.makedirs(RAW_MD_DIR, exist_ok=True)
+    with _save_lock:
+        unique_name, suffix = file_name, 1
+        while os.path.exists(os.path.join(RAW_MD_DIR, f'{unique_name}.md')):
+            suffix += 1
+            unique_name = f"{file_name}_{suffix}"
+        output_md_file = os.path.join(RAW_MD_DIR, f'{unique_name}.md')
+        with open(output_md_file, 'w', encoding='utf-8') as f:
+            f.write(job_markdown(record))
+
+    print(f"✅ Job details saved to the job store as {record['job_key']} and exported to {output_md_file}")
+    return (record['job_key'], output_md_file)
@@ -0,0 +1,383 @@
+"""
+SQLite store for scraped jobs.
+
+Every scraped posting is one row keyed by its canonical job key from
+scraper/url_canonical.py ('linkedin:<id>', 'web:<hash>', ...), with source,
+title, company, location, description, fetch time and a content hash. An
+FTS5 index over title, company, location and description makes prior scrapes
+searchable without listing directories. The Markdown the pipeline reads is an
+export of a row (export_markdown), written when a job is saved and again on
+demand if the file is gone.
+
+Usage:
+    python -m scraper.job_store search "kafka spark" --limit 10
+    python -m scraper.job_store list --source linkedin
+    python -m scraper.job_store export linkedin:4012345678
+    python -m scraper.job_store import-legacy
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+from scraper.url_canonical import canonicalize_url
+
+
+JOB_STORE_FILE = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'scraped-data', 'jobs.sqlite3'))
+
+# Columns besides the key, in insert order
+JOB_COLUMNS = ("url", "source", "title", "company", "location", "salary", "description",
+               "markdown", "metadata", "fetched_at", "content_hash")
+
+# Fields of the scrapers' job details that have their own column
+_DETAIL_FIELDS = ("url", "title", "company", "location", "salary", "description", "content", "source")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    job_key TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL DEFAULT 'N/A',
+    location TEXT NOT NULL DEFAULT 'N/A',
+    salary TEXT,
+    description TEXT NOT NULL,
+    markdown TEXT,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    fetched_at TEXT NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_source_fetched ON jobs (source, fetched_at);
+CREATE INDEX IF NOT EXISTS jobs_fetched ON jobs (fetched_at);
+CREATE INDEX IF NOT EXISTS jobs_content_hash ON jobs (content_hash);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5 (
+    title, company, location, description,
+    content='jobs', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts (rowid, title, company, location, description)
+    VALUES (new.id, new.title, new.company, new.location, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)
+    VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE OF title, company, location, description ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location, description)
+    VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+    INSERT INTO jobs_fts (rowid, title, company, location, description)
+    VALUES (new.id, new.title, new.company, new.location, new.description);
+END;
+"""
+
+# Databases whose schema was created in this process
+_initialized = set()
+_init_lock = threading.Lock()
+
+
+def connect(db_file=JOB_STORE_FILE):
+    """
+    Open the job store, creating the schema on first use.
+
+    Returns:
+        sqlite3.Connection: Connection with sqlite3.Row rows; use it as a context
+            manager to commit, and close it when done.
+    """
+    os.makedirs(os.path.dirname(db_file), exist_ok=True)
+    conn = sqlite3.connect(db_file, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with _init_lock:
+        if db_file not in _initialized:
+            # WAL lets concurrent scrapes (scraper/engine.py) write while others read
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            _initialized.add(db_file)
+    return conn
+
+
+def content_hash(title, company, location, description):
+    """Hash the fields that identify a posting's content, to tell a re-scrape apart from a change."""
+    text = "\x1f".join(value or "" for value in (title, company, location, description))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def job_record(job_details, md_content=None):
+    """
+    Map a scraper's job details to a job store row.
+
+    Job board scrapers give 'title', 'company', 'location', 'description' and
+    optionally 'salary'; the Reader API gives 'title', 'source' and 'content'.
+    Other fields are kept as JSON in 'metadata'.
+
+    Args:
+        job_details (dict): Scraped job details, including 'url'.
+        md_content (str): Custom Markdown rendering to export instead of the standard one.
+
+    Returns:
+        dict: 'job_key' and every column of JOB_COLUMNS.
+    """
+    canonical = canonicalize_url(job_details["url"])
+    source = job_details.get("source") or canonical["site"]
+    if source == "web":
+        source = urlparse(canonical["url"]).netloc.lower() or "web"
+    description = job_details.get("description") or job_details.get("content") or ""
+    title = job_details.get("title") or "N/A"
+    company = job_details.get("company") or "N/A"
+    location = job_details.get("location") or "N/A"
+    metadata = {key: value for key, value in job_details.items() if key not in _DETAIL_FIELDS}
+    return {
+        "job_key": canonical["key"],
+        "url": canonical["url"],
+        "source": source,
+        "title": title,
+        "company": company,
+        "location": location,
+        "salary": job_details.get("salary"),
+        "description": description,
+        "markdown": md_content,
+        "metadata": json.dumps(metadata, ensure_ascii=False),
+        "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "content_hash": content_hash(title, company, location, description),
+    }
+
+
+def store_job(job_details, md_content=None, db_file=JOB_STORE_FILE):
+    """
+    Insert or update a scraped job.
+
+    A re-scrape with the same content only moves fetched_at, so the full-text
+    index is not rewritten.
+
+    Args:
+        job_details (dict): Scraped job details, including 'url'.
+        md_content (str): Custom Markdown rendering, if the scraper has one.
+        db_file (str): Path of the store.
+
+    Returns:
+        dict: The stored row (see job_record).
+    """
+    record = job_record(job_details, md_content)
+    conn = connect(db_file)
+    try:
+        with conn:
+            unchanged = conn.execute(
+                "UPDATE jobs SET fetched_at = ?, url = ? WHERE job_key = ? AND content_hash = ?",
+                (record["fetched_at"], record["url"], record["job_key"], record["content_hash"]),
+            ).rowcount
+            if not unchanged:
+                updates = ", ".join(f"{column} = excluded.{column}" for column in JOB_COLUMNS)
+                conn.execute(
+                    f"INSERT INTO jobs (job_key, {', '.join(JOB_COLUMNS)}) VALUES ({', '.join('?' * (len(JOB_COLUMNS) + 1))}) "
+                    f"ON CONFLICT (job_key) DO UPDATE SET {updates}",
+                    [record["job_key"]] + [record[column] for column in JOB_COLUMNS],
+                )
+    finally:
+        conn.close()
+    return record
+
+
+def get_job(job_key, db_file=JOB_STORE_FILE):
+    """
+    Look up a stored job by its canonical key.
+
+    Returns:
+        dict or None: The row with 'metadata' decoded, or None if the job is not stored.
+    """
+    conn = connect(db_file)
+    try:
+        row = conn.execute("SELECT * FROM jobs WHERE job_key = ?", (job_key,)).fetchone()
+    finally:
+        conn.close()
+    return _row_to_job(row) if row else None
+
+
+def _row_to_job(row):
+    job = dict(row)
+    job.pop("id", None)
+    if "metadata" in job:
+        job["metadata"] = json.loads(job["metadata"] or "{}")
+    return job
+
+
+def find_jobs(source=None, since=None, limit=50, db_file=JOB_STORE_FILE):
+    """
+    List stored jobs, newest first.
+
+    Args:
+        source (str): Only jobs from this source ('linkedin', 'indeed', 'glassdoor' or a domain).
+        since (str): Only jobs fetched at or after this ISO timestamp.
+        limit (int): Maximum number of jobs.
+        db_file (str): Path of the store.
+
+    Returns:
+        list: Rows without description and Markdown.
+    """
+    clauses, params = [], []
+    if source:
+        clauses.append("source = ?")
+        params.append(source)
+    if since:
+        clauses.append("fetched_at >= ?")
+        params.append(since)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    conn = connect(db_file)
+    try:
+        rows = conn.execute(
+            f"SELECT job_key, url, source, title, company, location, fetched_at FROM jobs {where} "
+            f"ORDER BY fetched_at DESC LIMIT ?", params + [limit],
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+
+def _fts_query(text):
+    """Quote each word, so user text such as 'c++' or 'front-end' is not parsed as FTS5 syntax."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in text.split())
+
+
+def search_jobs(text, source=None, limit=20, raw=False, db_file=JOB_STORE_FILE):
+    """
+    Full-text search over stored jobs, best matches first.
+
+    Title matches weigh more than company, location and description matches.
+
+    Args:
+        text (str): Words that must all appear (stemmed), or an FTS5 query if raw is True.
+        source (str): Only jobs from this source.
+        limit (int): Maximum number of results.
+        raw (bool): Pass text to FTS5 unchanged (phrases, OR, NEAR, prefix*).
+        db_file (str): Path of the store.
+
+    Returns:
+        list: Rows with 'job_key', 'title', 'company', 'location', 'source',
+            'fetched_at' and a description 'snippet' with matches in [brackets].
+    """
+    query = text if raw else _fts_query(text)
+    if not query.strip():
+        return []
+    source_clause = "AND j.source = ?" if source else ""
+    params = [query] + ([source] if source else []) + [limit]
+    conn = connect(db_file)
+    try:
+        rows = conn.execute(
+            f"SELECT j.job_key, j.title, j.company, j.location, j.source, j.fetched_at, "
+            f"snippet(jobs_fts, 3, '[', ']', '…', 12) AS snippet "
+            f"FROM jobs_fts JOIN jobs j ON j.id = jobs_fts.rowid "
+            f"WHERE jobs_fts MATCH ? {source_clause} "
+            f"ORDER BY bm25(jobs_fts, 5.0, 2.0, 1.0, 1.0) LIMIT ?", params,
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
+
+
+def job_markdown(job):
+    """Render a stored job in the legacy Markdown format of its scraper."""
+    if job.get("markdown"):
+        return job["markdown"]
+    from scraper.job_files import job_details_markdown
+    details = {field: job[field] for field in ("title", "company", "location", "description")}
+    if job.get("salary"):
+        details["salary"] = job["salary"]
+    return job_details_markdown(details)
+
+
+def export_markdown(job_key, file_name=None, out_dir=None, db_file=JOB_STORE_FILE):
+    """
+    Export a stored job as a legacy Markdown file.
+
+    Args:
+        job_key (str): Canonical job key.
+        file_name (str): File name without extension (defaults to job_file_name(source, title)).
+        out_dir (str): Target directory (defaults to data/scraped-data/raw-md).
+        db_file (str): Path of the store.
+
+    Returns:
+        str or None: Absolute path of the Markdown file, or None if the job is not stored.
+    """
+    from scraper.job_files import RAW_MD_DIR, job_file_name
+    job = get_job(job_key, db_file)
+    if not job:
+        return None
+    out_dir = out_dir or RAW_MD_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    md_file = os.path.join(out_dir, f"{file_name or job_file_name(job['source'].split('.')[0], job['title'])}.md")
+    with open(md_file, "w", encoding="utf-8") as f:
+        f.write(job_markdown(job))
+    return md_file
+
+
+def import_legacy(raw_json_dir=None, db_file=JOB_STORE_FILE):
+    """
+    Import scrapes saved as data/scraped-data/raw-json/*.json before the job store existed.
+
+    Files without a 'url' are skipped; when several files share a posting, the
+    newest one wins.
+
+    Returns:
+        int: Number of jobs imported.
+    """
+    if raw_json_dir is None:
+        from scraper.job_files import SCRAPED_DATA_DIR
+        raw_json_dir = os.path.join(SCRAPED_DATA_DIR, "raw-json")
+    if not os.path.isdir(raw_json_dir):
+        return 0
+    paths = sorted((os.path.join(raw_json_dir, name) for name in os.listdir(raw_json_dir) if name.endswith(".json")),
+                   key=os.path.getmtime)
+    imported = 0
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                job_details = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            continue
+        if isinstance(job_details, dict) and job_details.get("url"):
+            store_job(job_details, db_file=db_file)
+            imported += 1
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the scraped job store")
+    parser.add_argument("--db", default=JOB_STORE_FILE, help="Path of the job store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    search = commands.add_parser("search", help="Full-text search")
+    search.add_argument("text")
+    search.add_argument("--source")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--raw", action="store_true", help="Use FTS5 query syntax")
+    listing = commands.add_parser("list", help="List jobs, newest first")
+    listing.add_argument("--source")
+    listing.add_argument("--since", help="ISO timestamp")
+    listing.add_argument("--limit", type=int, default=50)
+    export = commands.add_parser("export", help="Export a job as legacy Markdown")
+    export.add_argument("job_key")
+    export.add_argument("--out-dir")
+    commands.add_parser("import-legacy", help="Import data/scraped-data/raw-json files")
+    args = parser.parse_args()
+
+    if args.command == "search":
+        for job in search_jobs(args.text, args.source, args.limit, args.raw, db_file=args.db):
+            print(f"{job['job_key']}  {job['title']} | {job['company']} | {job['location']} ({job['fetched_at']})")
+            print(f"    {job['snippet']}")
+    elif args.command == "list":
+        for job in find_jobs(args.source, args.since, args.limit, db_file=args.db):
+            print(f"{job['job_key']}  {job['title']} | {job['company']} | {job['location']} ({job['fetched_at']})")
+    elif args.command == "export":
+        md_file = export_markdown(args.job_key, out_dir=args.out_dir, db_file=args.db)
+        print(f"✅ Exported to {md_file}" if md_file else f"❌ No stored job {args.job_key}")
+    else:
+        print(f"✅ Imported {import_legacy(db_file=args.db)} jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,146 +1,198 @@
-import time
-import json
+import re
 import os
+import threading
 import requests
 import dotenv
 from datetime import datetime
+from urllib.parse import quote_plus, urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from scraper.job_files import save_job_details, job_file_name
 
 # Load environment variables from .env file
 dotenv.load_dotenv()
 
+READER_API_URL = "https://r.jina.ai/"
+
+# Text that shows the page had not finished rendering or was a bot wall
+INCOMPLETE_MARKERS = re.compile(
+    r"(loading\.\.\.|enable javascript|javascript is (disabled|required)|just a moment|checking your browser|please wait)",
+    re.IGNORECASE,
+)
+
 
-def scrape_with_readerapi(target_url, ):
+class ReaderAPIClient:
     """
-    Scrape website content using JinaAI's ReaderAPI.
-    
-    Args:
-        target_url (str): The URL of the webpage to scrape.
-    
-    Returns:
-        tuple: A tuple containing the paths of the saved JSON and Markdown files.
+    Client for JinaAI's Reader API with a pooled session and adaptive waits.
     """
-    print("🚀 Starting ReaderAPI scraper...")
-    
-    # Set up the Reader API endpoint with the target URL
-    # The URL needs to be properly encoded to work with the ReaderAPI
-    import urllib.parse
-    encoded_url = urllib.parse.quote_plus(target_url)
-    reader_url = f'https://r.jina.ai/{encoded_url}'
-
-    api_key = os.getenv('READER_API_KEY')
-    
-    # Set up the headers with your API key
-    headers = {
-        "Authorization": f"Bearer {api_key}"
-    }
-    
-    # Set parameters to ensure complete content extraction
-    params = {
-        "wait": "5000",  # Wait for 5 seconds for the page to load fully
-        "full": "true",  # Get the full content
-        "type": "text",  # Get text content
-        "autoExtract": "true"  # Auto-extract meaningful content
-    }
-    
-    try:
-        print(f"📄 Sending request to ReaderAPI for URL: {target_url}")
-        print("⏳ Waiting for page to fully load (this may take a few seconds)...")
-        response = requests.get(reader_url, headers=headers, params=params)
-        
-        # Check if the request was successful
-        if response.status_code == 200:
+
+    def __init__(self, api_key=None, connect_timeout=5, read_timeout=60, wait_steps=(0, 2000, 5000),
+                 min_content_chars=500, retries=3):
+        """
+        Initialize the client.
+
+        Args:
+            api_key (str): Reader API key (defaults to READER_API_KEY).
+            connect_timeout (float): Seconds to establish a connection.
+            read_timeout (float): Seconds to wait for the response.
+            wait_steps (tuple): Page wait times in ms, tried in order while the content looks incomplete.
+            min_content_chars (int): Shorter content counts as incomplete.
+            retries (int): Retries on connection errors and 429/5xx responses, with backoff.
+        """
+        self.api_key = api_key or os.getenv('READER_API_KEY')
+        self.timeout = (connect_timeout, read_timeout)
+        self.wait_steps = list(wait_steps) or [0]
+        self.min_content_chars = min_content_chars
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=("GET",), respect_retry_after_header=True)
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept": "application/json"})
+        if self.api_key:
+            self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
+
+    def warm(self):
+        """
+        Open a keep-alive connection to the Reader API ahead of the first read.
+
+        Returns:
+            bool: False if the API could not be reached.
+        """
+        try:
+            self.session.head(READER_API_URL, timeout=self.timeout)
+            return True
+        except requests.RequestException:
+            return False
+
+    def looks_incomplete(self, content):
+        """Check whether read content is too short or still a loading / bot-check page."""
+        return len(content.strip()) < self.min_content_chars or bool(INCOMPLETE_MARKERS.search(content[:2000]))
+
+    def read(self, target_url, wait=0):
+        """
+        Read a page through the Reader API.
+
+        Args:
+            target_url (str): The URL of the webpage to read.
+            wait (int): Milliseconds the Reader API waits for the page to render.
+
+        Returns:
+            dict: {'title', 'content', 'metadata'}.
+
+        Raises:
+            requests.RequestException: On connection errors, timeouts and error responses.
+        """
+        params = {
+            "full": "true",  # Get the full content
+            "type": "text",  # Get text content
+            "autoExtract": "true"  # Auto-extract meaningful content
+        }
+        if wait:
+            params["wait"] = str(wait)
+        response = self.session.get(f"{READER_API_URL}{quote_plus(target_url)}", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        if "json" in response.headers.get("Content-Type", ""):
+            payload = response.json()
+            data = payload.get("data", payload) if isinstance(payload, dict) else {}
+            metadata = {key: value for key, value in data.items() if key not in ("title", "content")}
+            return {"title": data.get("title") or "", "content": data.get("content") or "", "metadata": metadata}
+        return self._parse_text(response.text)
+
+    @staticmethod
+    def _parse_text(raw_content):
+        """Parse the plain-text format ('Title: ...' header, then Markdown) the API returns without JSON."""
+        title_match = re.search(r"^Title:\s*(.+)$", raw_content, re.MULTILINE) or re.search(r"^#{1,2}\s+(.+)$", raw_content, re.MULTILINE)
+        title = title_match.group(1).strip() if title_match else ""
+        content_match = re.search(r"^Markdown Content:\s*\n", raw_content, re.MULTILINE)
+        content = raw_content[content_match.end():] if content_match else raw_content
+        return {"title": title, "content": content, "metadata": {}}
+
+    def scrape(self, target_url):
+        """
+        Read a page with an adaptive wait and save it as a scraped job.
+
+        The first request uses the lowest wait; a longer wait is only tried when
+        the content looks incomplete.
+
+        Returns:
+            tuple or None: (job store key, Markdown file path), or None on failure.
+        """
+        print("🚀 Starting ReaderAPI scraper...")
+        result = None
+        for wait in self.wait_steps:
+            print(f"📄 Sending request to ReaderAPI for URL: {target_url} (wait {wait} ms)")
             try:
-                # First try to parse as JSON
-                data = response.json()
-                print("✅ Successfully received JSON data from ReaderAPI")
-                
-                # Extract content from JSON response
-                title = data.get("title", "No Title")
-                content = data.get("content", "No content extracted")
-                metadata = data.get("metadata", {})
-                
-            except json.JSONDecodeError:
-                # If not JSON, it's likely returning Markdown content directly
-                print("📝 Received Markdown content from ReaderAPI")
-                raw_content = response.text
-                
-                # Parse the raw markdown to extract structured data
-                title = ""
-                content = raw_content
-                metadata = {}
-                
-                # Extract title if available (usually starts with "Title: ")
-                title_match = raw_content.split("Title:", 1)
-                if len(title_match) > 1:
-                    title = title_match[1].split("\n", 1)[0].strip()
-                else:
-                    # Try alternative format (# or ## heading)
-                    lines = raw_content.split("\n")
-                    for line in lines:
-                        if line.startswith("# ") or line.startswith("## "):
-                            title = line.lstrip("# ").strip()
-                            break
-                    
-                    if not title and len(lines) > 0:
-                        title = lines[0].strip()  # Use first line as title
-            
-            # Get source domain from URL
-            from urllib.parse import urlparse
-            domain = urlparse(target_url).netloc
-            
-            # Clean up title for filename
-            if not title:
-                title = "Untitled_" + domain.replace(".", "_")
-                
-            # Create timestamp for filenames
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            sanitized_title = "".join([c if c.isalnum() or c in [' ', '_', '-'] else '_' for c in title])
-            sanitized_title = sanitized_title.replace(" ", "_")[:50]  # Limit length
-            
-            # Create structured data for JSON
-            extracted_data = {
-                "url": target_url,
-                "title": title,
-                "source": domain,
-                "content": content,
-                "metadata": metadata,
-                "extraction_date": timestamp
-            }
-            
-            print(f"📄 Content extracted: Title: {title}, Source: {domain}")
-            
-            # Save as JSON
-            output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'scraped-data', 'raw-json')
-            os.makedirs(output_dir, exist_ok=True)
-            output_file = os.path.join(output_dir, f'readerapi_{sanitized_title}_{timestamp}.json')
-            output_file = os.path.abspath(output_file)
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(extracted_data, f, ensure_ascii=False, indent=4)
-            
-            # Save as Markdown
-            output_md_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'scraped-data', 'raw-md')
-            os.makedirs(output_md_dir, exist_ok=True)
-            output_md_file = os.path.join(output_md_dir, f'readerapi_{sanitized_title}_{timestamp}.md')
-            output_md_file = os.path.abspath(output_md_file)
-            
-            with open(output_md_file, 'w', encoding='utf-8') as f:
-                f.write(f"# {title}\n\n")
-                f.write(f"**Source:** {domain}\n")
-                f.write(f"**URL:** {target_url}\n\n")
-                f.write("## Content\n\n")
-                f.write(content)
-            
-            print(f"✅ Content saved to {output_file} and {output_md_file}")
-            return (output_file, output_md_file)
-                
-        else:
-            print(f"❌ Error: API request failed with status code {response.status_code}")
-            print(f"Response: {response.text}")
+                result = self.read(target_url, wait)
+            except requests.RequestException as e:
+                print(f"❌ Error: ReaderAPI request failed: {e}")
+                return None
+            if not self.looks_incomplete(result["content"]):
+                break
+            print("⏳ Content looks incomplete, retrying with a longer wait...")
+
+        if not result["content"].strip():
+            print("❌ Error: ReaderAPI returned no content")
             return None
-            
-    except Exception as e:
-        print(f"❌ Error during scraping: {str(e)}")
-        return None
 
+        domain = urlparse(target_url).netloc
+        title = result["title"] or "Untitled_" + domain.replace(".", "_")
+        extracted_data = {
+            "url": target_url,
+            "title": title,
+            "source": domain,
+            "content": result["content"],
+            "metadata": result["metadata"],
+            "extraction_date": datetime.now().strftime("%Y%m%d_%H%M%S")
+        }
+        print(f"📄 Content extracted: Title: {title}, Source: {domain}")
 
+        md_content = f"# {title}\n\n"
+        md_content += f"**Source:** {domain}\n"
+        md_content += f"**URL:** {target_url}\n\n"
+        md_content += "## Content\n\n"
+        md_content += result["content"]
+
+        return save_job_details(extracted_data, job_file_name('readerapi', title), md_content)
+
+
+_client = None
+_client_settings = {}
+_client_lock = threading.Lock()
+
+
+def configure_reader_api(**settings):
+    """
+    Set the ReaderAPIClient options used by scrape_with_readerapi.
+
+    Args:
+        settings: ReaderAPIClient keyword arguments (connect_timeout, read_timeout, wait_steps, ...)
+    """
+    global _client
+    with _client_lock:
+        _client_settings.clear()
+        _client_settings.update(settings)
+        _client = None
+
+
+def get_reader_client():
+    """Return the shared ReaderAPIClient, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ReaderAPIClient(**_client_settings)
+        return _client
+
+
+def scrape_with_readerapi(target_url):
+    """
+    Scrape website content using JinaAI's ReaderAPI.
+
+    Args:
+        target_url (str): The URL of the webpage to scrape.
+
+    Returns:
+        tuple: (job store key, Markdown file path).
+    """
+    return get_reader_client().scrape(target_url)
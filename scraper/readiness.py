@@ -0,0 +1,228 @@
+"""
+Event-driven page readiness for the Selenium scrapers.
+
+The scrapers used to sleep for fixed or random intervals after every
+navigation and click. These waits return as soon as a concrete condition
+holds instead: the DOM content is loaded, a selector is present, the network
+is idle (from the CDP Network events in Chrome's performance log), or an
+element's text has stopped changing across consecutive MutationObserver
+checks. Human-like random pauses are an opt-in stealth policy.
+"""
+
+import json
+import time
+import random
+
+
+_settings = {
+    "timeout": 20,
+    "network_idle": False,
+    "network_idle_ms": 500,
+    "captcha_timeout": 60,
+    "stealth_delays": False,
+}
+
+# Counts mutations below the element and reports them with its text length
+_MUTATION_SNAPSHOT_JS = """
+const el = document.querySelector(arguments[0]);
+if (!el) { return null; }
+if (!el.__readinessObserver) {
+    el.__readinessMutations = 0;
+    el.__readinessObserver = new MutationObserver(records => { el.__readinessMutations += records.length; });
+    el.__readinessObserver.observe(el, {childList: true, subtree: true, characterData: true, attributes: true});
+}
+return [el.__readinessMutations, (el.innerText || '').trim().length];
+"""
+
+
+def configure_readiness(timeout=20, network_idle=False, network_idle_ms=500, captcha_timeout=60, stealth_delays=False):
+    """
+    Set the readiness policy shared by every SeleniumDriver.
+
+    Args:
+        timeout (float): Default seconds to wait for a condition.
+        network_idle (bool): Also wait for network idle after each navigation.
+        network_idle_ms (int): Quiet period that counts as network idle.
+        captcha_timeout (float): Seconds to wait for a manual CAPTCHA solve.
+        stealth_delays (bool): Add human-like random pauses after navigation and clicks.
+    """
+    _settings.update(
+        timeout=timeout,
+        network_idle=network_idle,
+        network_idle_ms=network_idle_ms,
+        captcha_timeout=captcha_timeout,
+        stealth_delays=stealth_delays,
+    )
+
+
+def readiness_settings():
+    """Return the current readiness policy."""
+    return dict(_settings)
+
+
+def _poll(condition, timeout, interval=0.1):
+    """Call condition until it returns a truthy value or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            result = condition()
+        except Exception:
+            result = None
+        if result:
+            return result
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(interval)
+
+
+def wait_for_dom_ready(browser, timeout=None):
+    """
+    Wait until the DOM content is loaded.
+
+    Args:
+        browser: Selenium WebDriver.
+        timeout (float): Seconds to wait (defaults to the configured timeout).
+
+    Returns:
+        bool: True if the document reached 'interactive' or 'complete'.
+    """
+    timeout = _settings["timeout"] if timeout is None else timeout
+    state = _poll(lambda: browser.execute_script("return document.readyState") in ("interactive", "complete"), timeout)
+    return bool(state)
+
+
+def wait_for_selector(browser, css_selector, timeout=None):
+    """
+    Wait until an element matching a CSS selector is present.
+
+    Uses querySelector rather than find_element so the driver's implicit wait
+    does not stretch each poll.
+
+    Returns:
+        bool: True if the element appeared within the timeout.
+    """
+    timeout = _settings["timeout"] if timeout is None else timeout
+    return bool(_poll(lambda: browser.execute_script("return document.querySelector(arguments[0]) !== null", css_selector), timeout))
+
+
+def wait_for_any_selector(browser, css_selectors, timeout=None):
+    """
+    Wait until one of several CSS selectors matches.
+
+    Returns:
+        str or None: The first selector that matched, or None on timeout.
+    """
+    timeout = _settings["timeout"] if timeout is None else timeout
+    script = "return arguments[0].find(selector => document.querySelector(selector) !== null) || null"
+    return _poll(lambda: browser.execute_script(script, list(css_selectors)), timeout)
+
+
+def _performance_events(browser):
+    """Drain CDP events from Chrome's performance log; None if the log is not enabled."""
+    try:
+        entries = browser.get_log("performance")
+    except Exception:
+        return None
+    events = []
+    for entry in entries:
+        try:
+            events.append(json.loads(entry["message"])["message"])
+        except (KeyError, ValueError):
+            continue
+    return events
+
+
+def wait_for_network_idle(browser, idle_ms=None, timeout=None, max_inflight=0):
+    """
+    Wait until no requests have been in flight for idle_ms.
+
+    In-flight requests are tracked from the CDP Network events in Chrome's
+    performance log (enabled by SeleniumDriver when network idle is
+    configured). Without that log, the count of Resource Timing entries is
+    used instead.
+
+    Args:
+        browser: Selenium WebDriver.
+        idle_ms (int): Quiet period in milliseconds.
+        timeout (float): Seconds to wait.
+        max_inflight (int): Requests allowed to stay open (long polling, sockets).
+
+    Returns:
+        bool: True if the network went idle within the timeout.
+    """
+    idle = (_settings["network_idle_ms"] if idle_ms is None else idle_ms) / 1000
+    timeout = _settings["timeout"] if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    inflight = set()
+    last_activity = time.monotonic()
+    use_log = _performance_events(browser) is not None
+    resource_count = None
+
+    while time.monotonic() < deadline:
+        if use_log:
+            events = _performance_events(browser) or []
+            for event in events:
+                method = event.get("method", "")
+                request_id = event.get("params", {}).get("requestId")
+                if method == "Network.requestWillBeSent":
+                    inflight.add(request_id)
+                elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                    inflight.discard(request_id)
+            if events:
+                last_activity = time.monotonic()
+            busy = len(inflight) > max_inflight
+        else:
+            count = browser.execute_script("return performance.getEntriesByType('resource').length")
+            if count != resource_count:
+                resource_count = count
+                last_activity = time.monotonic()
+            busy = False
+
+        if not busy and time.monotonic() - last_activity >= idle:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def wait_for_stable_text(browser, css_selector, checks=2, interval=0.25, timeout=None):
+    """
+    Wait until an element's text has stopped changing.
+
+    A MutationObserver counts changes below the element; the text is stable
+    once the mutation count and text length are unchanged across `checks`
+    consecutive checks.
+
+    Args:
+        browser: Selenium WebDriver.
+        css_selector (str): Element to watch, e.g. an expanding job description.
+        checks (int): Consecutive unchanged checks required.
+        interval (float): Seconds between checks.
+        timeout (float): Seconds to wait.
+
+    Returns:
+        bool: True if the text was non-empty and stable within the timeout.
+    """
+    timeout = _settings["timeout"] if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    previous = None
+    unchanged = 0
+    while time.monotonic() < deadline:
+        try:
+            snapshot = browser.execute_script(_MUTATION_SNAPSHOT_JS, css_selector)
+        except Exception:
+            snapshot = None
+        if snapshot and snapshot[1] > 0 and snapshot == previous:
+            unchanged += 1
+            if unchanged >= checks:
+                return True
+        else:
+            unchanged = 0
+        previous = snapshot
+        time.sleep(interval)
+    return False
+
+
+def stealth_pause(low, high):
+    """Sleep for a random human-like interval when stealth delays are enabled."""
+    if _settings["stealth_delays"]:
+        time.sleep(random.uniform(low, high))
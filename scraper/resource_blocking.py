@@ -0,0 +1,117 @@
+"""
+Resource blocking for the fast Selenium profile.
+
+Job pages pull megabytes of images, fonts, media, analytics and ad scripts
+that the scrapers never use. Before each navigation, drivers with
+block_resources=True pass a blocklist to CDP Network.setBlockedURLs. First-party
+JavaScript and stylesheets are never blocked, so script-driven sites such as
+LinkedIn keep working, and per-site exceptions re-allow categories a site
+needs (e.g. images for Indeed's CAPTCHA).
+"""
+
+# Patterns match the whole URL; extensions end in '*' so query strings match too
+BLOCK_CATEGORIES = {
+    "images": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*", "*.bmp*",
+               "*media.licdn.com/dms/image*"],
+    "fonts": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*.ogg*", "*.wav*"],
+    "trackers": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*googlesyndication.com*",
+        "*doubleclick.net*", "*adservice.google.*", "*connect.facebook.net*", "*facebook.com/tr*",
+        "*hotjar.com*", "*segment.io*", "*segment.com/analytics*", "*scorecardresearch.com*",
+        "*quantserve.com*", "*bing.com/bat*", "*ads.linkedin.com*", "*px.ads.linkedin.com*",
+        "*snap.licdn.com*", "*adnxs.com*", "*criteo.*", "*taboola.com*", "*outbrain.com*",
+        "*newrelic.com*", "*nr-data.net*", "*optimizely.com*", "*clarity.ms*",
+    ],
+}
+
+_settings = {
+    "enabled": True,
+    "block": ["images", "fonts", "media", "trackers"],
+    "extra_patterns": [],
+    "site_exceptions": {"indeed": ["images"]},
+}
+
+# Navigation timing plus the transfer size of every resource the page loaded
+_PAGE_STATS_JS = """
+const nav = performance.getEntriesByType('navigation')[0] || {};
+const resources = performance.getEntriesByType('resource');
+const bytes = resources.reduce((sum, entry) => sum + (entry.transferSize || 0), nav.transferSize || 0);
+return {requests: resources.length + 1, bytes: bytes, dom_content_loaded_ms: Math.round(nav.domContentLoadedEventEnd || 0)};
+"""
+
+
+def configure_resource_blocking(enabled=True, block=None, extra_patterns=None, site_exceptions=None):
+    """
+    Set the blocklist used by drivers created with block_resources=True.
+
+    Args:
+        enabled (bool): Block resources at all.
+        block (list): Categories from BLOCK_CATEGORIES to block.
+        extra_patterns (list): Additional URL patterns ('*' wildcards) to block.
+        site_exceptions (dict): Site name to categories or patterns that stay allowed on that site.
+    """
+    _settings.update(
+        enabled=enabled,
+        block=list(block if block is not None else _settings["block"]),
+        extra_patterns=list(extra_patterns or []),
+        site_exceptions=dict(site_exceptions if site_exceptions is not None else _settings["site_exceptions"]),
+    )
+
+
+def blocked_patterns(site=None):
+    """
+    Build the URL patterns to block for a site.
+
+    Args:
+        site (str): Site name from canonicalize_url ('linkedin', 'indeed', 'glassdoor' or 'web').
+
+    Returns:
+        list: Patterns for Network.setBlockedURLs (empty when blocking is disabled).
+    """
+    if not _settings["enabled"]:
+        return []
+    allowed = set(_settings["site_exceptions"].get(site) or [])
+    patterns = []
+    for category in _settings["block"]:
+        if category in allowed:
+            continue
+        patterns.extend(BLOCK_CATEGORIES.get(category, []))
+    patterns.extend(_settings["extra_patterns"])
+    return [pattern for pattern in patterns if pattern not in allowed]
+
+
+def apply_blocking(browser, patterns):
+    """
+    Block URL patterns in the current tab through CDP.
+
+    Args:
+        browser: Selenium Chrome WebDriver.
+        patterns (list): URL patterns; an empty list lifts any previous blocking.
+
+    Returns:
+        bool: False if the browser does not support CDP.
+    """
+    try:
+        browser.execute_cdp_cmd("Network.enable", {})
+        browser.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        return True
+    except Exception as e:
+        print(f"⚠️ Could not set up resource blocking: {e}")
+        return False
+
+
+def page_stats(browser):
+    """
+    Read request count, transferred bytes and DOMContentLoaded time of the current page.
+
+    Cross-origin resources without Timing-Allow-Origin report no size, so the
+    byte count is a lower bound.
+
+    Returns:
+        dict: {'requests', 'bytes', 'dom_content_loaded_ms'}, or {} if unavailable.
+    """
+    try:
+        return browser.execute_script(_PAGE_STATS_JS) or {}
+    except Exception:
+        return {}
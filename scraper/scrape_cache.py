@@ -0,0 +1,118 @@
+"""
+Scrape result cache.
+
+Scrapes are indexed by the canonical job key from scraper/url_canonical.py.
+A repeat request for the same posting within the TTL returns the exported
+Markdown (re-exported from the job store if the file was removed) instead of
+launching Chrome or calling the Reader API again.
+"""
+
+import os
+import json
+import time
+import threading
+
+from scraper.job_store import export_markdown
+
+
+SCRAPE_CACHE_FILE = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', '.cache', 'scrape-cache.json'))
+
+# Concurrent scrapes (scraper/engine.py) update the index from several threads
+_cache_lock = threading.Lock()
+
+
+def load_scrape_cache(cache_file=SCRAPE_CACHE_FILE):
+    """
+    Load the scrape cache index.
+
+    Returns:
+        dict: Canonical job key to cache entry.
+    """
+    if not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+
+def _markdown_file(entry):
+    """Return an entry's Markdown file, exporting it again from the job store if it was removed."""
+    if os.path.exists(entry['md_file']):
+        return entry['md_file']
+    if not entry.get('job_key'):
+        return None
+    return export_markdown(entry['job_key'], os.path.splitext(os.path.basename(entry['md_file']))[0])
+
+
+def get_cached_scrape(key, ttl_hours=24, cache_file=SCRAPE_CACHE_FILE):
+    """
+    Look up a fresh scrape of a posting.
+
+    Args:
+        key (str): Canonical job key.
+        ttl_hours (float): Maximum age of a cached scrape in hours.
+        cache_file (str): Path of the cache index.
+
+    Returns:
+        tuple or None: (job store key, Markdown file path), or None if there is no
+            fresh entry or its Markdown can no longer be found or exported.
+    """
+    entry = load_scrape_cache(cache_file).get(key)
+    if not entry or time.time() - entry['scraped_at'] > ttl_hours * 3600:
+        return None
+    md_file = _markdown_file(entry)
+    return (entry.get('job_key'), md_file) if md_file else None
+
+
+def get_stale_scrape(key, cache_file=SCRAPE_CACHE_FILE):
+    """
+    Look up a cached scrape that can be revalidated with a conditional request.
+
+    Returns:
+        dict or None: The cache entry if its Markdown exists (or was re-exported) and
+            it has an ETag or Last-Modified validator, otherwise None.
+    """
+    entry = load_scrape_cache(cache_file).get(key)
+    if not entry or not (entry.get('etag') or entry.get('last_modified')):
+        return None
+    md_file = _markdown_file(entry)
+    return {**entry, 'md_file': md_file} if md_file else None
+
+
+def refresh_scrape(key, cache_file=SCRAPE_CACHE_FILE):
+    """Restart the TTL of a cached scrape that was revalidated as unchanged."""
+    with _cache_lock:
+        cache = load_scrape_cache(cache_file)
+        if key in cache:
+            cache[key]['scraped_at'] = time.time()
+            _write_cache(cache, cache_file)
+
+
+def _write_cache(cache, cache_file):
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    temp_file = f"{cache_file}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(temp_file, cache_file)
+
+
+def store_scrape(key, url, files, validators=None, cache_file=SCRAPE_CACHE_FILE):
+    """
+    Record a scrape in the cache.
+
+    Args:
+        key (str): Canonical job key.
+        url (str): URL that was scraped, as the user gave it (the key is its canonical form).
+        files (tuple): (job store key, Markdown file path) returned by the scraper.
+        validators (dict): The page's 'etag' and 'last_modified', if known.
+        cache_file (str): Path of the cache index.
+    """
+    with _cache_lock:
+        cache = load_scrape_cache(cache_file)
+        # Drop entries that can no longer be served so the index does not grow forever
+        cache = {k: v for k, v in cache.items() if v.get('job_key') or os.path.exists(v['md_file'])}
+        cache[key] = {"url": url, "job_key": files[0], "md_file": files[1], "scraped_at": time.time(),
+                      **{name: value for name, value in (validators or {}).items() if value}}
+        _write_cache(cache, cache_file)
@@ -13,9 +13,14 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import os
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, SessionNotCreatedException
+from scraper.driver_resolver import resolve_chromedriver
+from scraper.url_canonical import canonicalize_url
+from scraper.resource_blocking import blocked_patterns, apply_blocking, page_stats
+from scraper.readiness import (
+    readiness_settings, stealth_pause, wait_for_dom_ready, wait_for_selector,
+    wait_for_network_idle, wait_for_stable_text,
+)
 from fake_useragent import UserAgent
 import undetected_chromedriver as uc
 
@@ -32,7 +37,8 @@ class SeleniumDriver:
                  window_size: str = "1920,1080",
                  timeout: int = 10,
                  page_load_timeout: int = 30,
-                 custom_user_agent: Optional[str] = None):
+                 custom_user_agent: Optional[str] = None,
+                 block_resources: bool = False):
         """
         Initialize the Selenium driver with anti-detection features.
         
@@ -43,6 +49,7 @@ class SeleniumDriver:
             timeout: Default wait timeout for elements
             page_load_timeout: Page load timeout
             custom_user_agent: Custom user agent string
+            block_resources: Block images, fonts, media and trackers (see scraper/resource_blocking.py)
         """
         self.headless = headless
         self.stealth_mode = False  # Force to False for now
@@ -50,6 +57,8 @@ class SeleniumDriver:
         self.timeout = timeout
         self.page_load_timeout = page_load_timeout
         self.custom_user_agent = custom_user_agent
+        self.block_resources = block_resources
+        self.last_page_stats = {}
         self.driver = None
         self.wait = None
         
@@ -74,6 +83,12 @@ class SeleniumDriver:
         options.add_argument("--disable-extensions")
         options.add_argument("--disable-plugins")
         
+        # Return from get() at DOMContentLoaded; readiness waits cover the rest
+        options.page_load_strategy = "eager"
+        if readiness_settings()["network_idle"]:
+            # CDP Network events for wait_for_network_idle
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        
         # IMPORTANT: LinkedIn requires JavaScript and images
         # options.add_argument("--disable-images")
         # options.add_argument("--disable-javascript")  # Disabled - needed for LinkedIn
@@ -87,6 +102,12 @@ class SeleniumDriver:
         
         return options
     
+    def _create_driver(self, chrome_driver_path: Optional[str], options: Options) -> webdriver.Chrome:
+        """Create a Chrome WebDriver with the given ChromeDriver binary, or Selenium's own resolution."""
+        if chrome_driver_path:
+            return webdriver.Chrome(service=Service(chrome_driver_path), options=options)
+        return webdriver.Chrome(options=options)
+
     def start_driver(self) -> webdriver.Chrome:
         """Start and configure the Chrome WebDriver."""
         try:
@@ -94,36 +115,16 @@ class SeleniumDriver:
             # as there seems to be issues with undetected_chromedriver
             options = self._get_chrome_options()
             
-            # Explicitly install ChromeDriver using webdriver_manager
+            # Resolved once and cached, so starting a browser needs no network
+            chrome_driver_path = resolve_chromedriver()
             try:
-                chrome_driver_path = ChromeDriverManager().install()
-                # Fix path if it's pointing to THIRD_PARTY_NOTICES instead of chromedriver.exe
-                if "THIRD_PARTY_NOTICES" in chrome_driver_path:
-                    chrome_driver_dir = os.path.dirname(chrome_driver_path)
-                    chrome_driver_path = os.path.join(chrome_driver_dir, "chromedriver.exe")
-                
-                print(f"Using ChromeDriver from: {chrome_driver_path}")
-                
-                # Check if the file exists
-                import os
-                if not os.path.exists(chrome_driver_path):
-                    print(f"⚠️ ChromeDriver not found at {chrome_driver_path}")
-                    # Try to find chromedriver.exe in the directory
-                    chrome_driver_dir = os.path.dirname(chrome_driver_path)
-                    for file in os.listdir(chrome_driver_dir):
-                        if "chromedriver" in file.lower() and file.endswith(".exe"):
-                            chrome_driver_path = os.path.join(chrome_driver_dir, file)
-                            print(f"✅ Found ChromeDriver at: {chrome_driver_path}")
-                            break
-            except Exception as e:
-                print(f"⚠️ Error finding ChromeDriver: {str(e)}")
-                print("Attempting to use direct WebDriver installation...")
-                # Direct Chrome instantiation without service
-                self.driver = webdriver.Chrome(options=options)
-                return self.driver
-                
-            service = Service(chrome_driver_path)
-            self.driver = webdriver.Chrome(service=service, options=options)
+                self.driver = self._create_driver(chrome_driver_path, options)
+            except SessionNotCreatedException:
+                # The cached driver no longer matches Chrome (e.g. after a Chrome update): resolve it again
+                refreshed_path = resolve_chromedriver(refresh=True)
+                if refreshed_path == chrome_driver_path:
+                    raise
+                self.driver = self._create_driver(refreshed_path, options)
             
             # Configure timeouts
             self.driver.set_page_load_timeout(self.page_load_timeout)
@@ -140,13 +141,18 @@ class SeleniumDriver:
         except Exception as e:
             raise Exception(f"Failed to start WebDriver: {str(e)}")
     
-    def get_page(self, url: str, wait_time: Optional[float] = None) -> bool:
+    def get_page(self, url: str, wait_time: Optional[float] = None, ready_selector: Optional[str] = None) -> bool:
         """
-        Navigate to a URL with random delay and error handling.
+        Navigate to a URL and wait until the page is ready.
+        
+        Waits for DOM content loaded, then for ready_selector and network idle
+        when requested. Random human-like delays are only added when stealth
+        delays are enabled (see scraper/readiness.py).
         
         Args:
             url: The URL to navigate to
-            wait_time: Optional custom wait time after loading
+            wait_time: Optional fixed wait time after loading, instead of readiness checks
+            ready_selector: Optional CSS selector to wait for
             
         Returns:
             bool: True if successful, False otherwise
@@ -155,11 +161,28 @@ class SeleniumDriver:
             if not self.driver:
                 self.start_driver()
             
+            # Set per navigation: pooled drivers visit different sites, and each new tab starts unblocked
+            patterns = blocked_patterns(canonicalize_url(url)['site']) if self.block_resources else []
+            if patterns:
+                apply_blocking(self.driver, patterns)
+            
+            start = time.perf_counter()
             self.driver.get(url)
             
-            # Random delay to mimic human behavior
-            delay = wait_time if wait_time else random.uniform(2, 5)
-            time.sleep(delay)
+            if wait_time:
+                time.sleep(wait_time)
+            else:
+                self.wait_until_ready(ready_selector)
+            
+            stats = page_stats(self.driver)
+            stats.update(load_seconds=round(time.perf_counter() - start, 2), blocked_patterns=len(patterns))
+            self.last_page_stats = stats
+            blocked = f" ({len(patterns)} URL patterns blocked)" if patterns else ""
+            print(f"📊 Page ready in {stats['load_seconds']:.2f}s, "
+                  f"{stats.get('bytes', 0) / 1024:.0f} KB over {stats.get('requests', 0)} requests{blocked}")
+            
+            if not wait_time:
+                stealth_pause(2, 5)
             
             return True
             
@@ -167,6 +190,37 @@ class SeleniumDriver:
             print(f"Error loading page {url}: {str(e)}")
             return False
     
+    def wait_until_ready(self, ready_selector: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for DOM content loaded, an optional selector and, if configured, network idle.
+        
+        Args:
+            ready_selector: Optional CSS selector that marks the content as loaded
+            timeout: Optional custom timeout for each condition
+            
+        Returns:
+            bool: True if every condition was met
+        """
+        ready = wait_for_dom_ready(self.driver, timeout)
+        if ready_selector:
+            ready = wait_for_selector(self.driver, ready_selector, timeout) and ready
+        if readiness_settings()["network_idle"]:
+            ready = wait_for_network_idle(self.driver, timeout=timeout) and ready
+        return ready
+    
+    def wait_for_stable_text(self, css_selector: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until an element's text stops changing, e.g. after expanding a description.
+        
+        Args:
+            css_selector: CSS selector of the element
+            timeout: Optional custom timeout
+            
+        Returns:
+            bool: True if the text was stable within the timeout
+        """
+        return wait_for_stable_text(self.driver, css_selector, timeout=timeout)
+    
     def wait_for_element(self, locator: tuple, timeout: Optional[int] = None) -> Any:
         """
         Wait for an element to be present and return it.
@@ -219,7 +273,7 @@ class SeleniumDriver:
             if element:
                 # Scroll element into view
                 self.driver.execute_script("arguments[0].scrollIntoView();", element)
-                time.sleep(0.5)
+                stealth_pause(0.3, 0.8)
                 
                 # Try regular click first
                 try:
@@ -234,6 +288,25 @@ class SeleniumDriver:
             print(f"Error clicking element: {str(e)}")
             return False
     
+    def click_if_present(self, css_selector: str) -> bool:
+        """
+        Click an element if it is already on the page, without waiting for it.
+        
+        Args:
+            css_selector: CSS selector of the element
+            
+        Returns:
+            bool: True if an element was clicked
+        """
+        try:
+            return bool(self.driver.execute_script(
+                "const el = document.querySelector(arguments[0]); if (el) { el.click(); } return el !== null;",
+                css_selector,
+            ))
+        except Exception as e:
+            print(f"Error clicking element: {str(e)}")
+            return False
+    
     def safe_send_keys(self, locator: tuple, text: str, clear_first: bool = True, timeout: Optional[int] = None) -> bool:
         """
         Safely send keys to an element with human-like typing.
@@ -253,7 +326,10 @@ class SeleniumDriver:
                 if clear_first:
                     element.clear()
                 
-                # Human-like typing with random delays
+                # Human-like typing with random delays when stealth delays are enabled
+                if not readiness_settings()["stealth_delays"]:
+                    element.send_keys(text)
+                    return True
                 for char in text:
                     element.send_keys(char)
                     time.sleep(random.uniform(0.05, 0.15))
@@ -343,10 +419,11 @@ def create_stealth_driver(headless: bool = False) -> SeleniumDriver:
     )
 
 def create_fast_driver(headless: bool = True) -> SeleniumDriver:
-    """Create a fast driver optimized for performance."""
+    """Create a fast driver optimized for performance, blocking unneeded resources."""
     return SeleniumDriver(
         headless=headless,
         stealth_mode=False,
         timeout=10,
-        page_load_timeout=20
+        page_load_timeout=20,
+        block_resources=True
     )
\ No newline at end of file
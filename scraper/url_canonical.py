@@ -0,0 +1,71 @@
+"""
+Job URL canonicalization.
+
+Job boards use many URL shapes for the same posting (search result links,
+tracking parameters, regional hosts). Each URL is reduced to a canonical job
+ID (LinkedIn job ID, Indeed 'jk', Glassdoor listing ID) and a canonical URL,
+so the same posting is recognized however it was linked.
+"""
+
+import re
+import hashlib
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+
+# Query parameters that only track where a link was clicked
+TRACKING_PARAMS = frozenset((
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "refid", "trk", "trackingid", "src",
+    "lipi", "originalsubdomain", "tk", "jrtk", "campaignid", "adid",
+))
+
+LINKEDIN_JOB_ID = re.compile(r"/jobs/view/(?:[^/?#]*?-)?(\d{6,})")
+GLASSDOOR_LISTING_ID = re.compile(r"[?&](?:jl|jobListingId)=(\d+)", re.IGNORECASE)
+
+
+def _strip_tracking(query):
+    return [(key, value) for key, value in parse_qsl(query, keep_blank_values=False)
+            if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")]
+
+
+def canonicalize_url(url):
+    """
+    Canonicalize a job posting URL.
+
+    Args:
+        url (str): Job posting URL as given by the user.
+
+    Returns:
+        dict: 'site' ('linkedin', 'indeed', 'glassdoor' or 'web'), 'job_id', 'key'
+            ('<site>:<job_id>', the cache key) and the canonical 'url'.
+    """
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    query = dict(parse_qsl(parsed.query))
+
+    if "linkedin." in host:
+        match = LINKEDIN_JOB_ID.search(parsed.path) or re.search(r"(\d{6,})", query.get("currentJobId", ""))
+        if match:
+            job_id = match.group(1)
+            return {"site": "linkedin", "job_id": job_id, "key": f"linkedin:{job_id}",
+                    "url": f"https://www.linkedin.com/jobs/view/{job_id}/"}
+
+    if "indeed." in host and query.get("jk"):
+        job_id = query["jk"].lower()
+        return {"site": "indeed", "job_id": job_id, "key": f"indeed:{job_id}",
+                "url": f"https://{host}/viewjob?jk={job_id}"}
+
+    if "glassdoor." in host and "/job-listing/" in parsed.path:
+        match = GLASSDOOR_LISTING_ID.search(f"?{parsed.query}")
+        if match:
+            job_id = match.group(1)
+            canonical = f"https://{host}{parsed.path}?jl={job_id}"
+        else:
+            # Without a listing ID the path slug identifies the posting
+            job_id = parsed.path.rsplit("/", 1)[-1].split(".htm")[0].lower()
+            canonical = f"https://{host}{parsed.path}"
+        return {"site": "glassdoor", "job_id": job_id, "key": f"glassdoor:{job_id}", "url": canonical}
+
+    path = parsed.path.rstrip("/") or "/"
+    canonical = urlunparse((parsed.scheme.lower() or "https", host, path, "", urlencode(sorted(_strip_tracking(parsed.query))), ""))
+    job_id = hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+    return {"site": "web", "job_id": job_id, "key": f"web:{job_id}", "url": canonical}
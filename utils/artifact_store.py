@@ -0,0 +1,285 @@
+"""
+Per-job artifact store.
+
+The pipeline keeps the strategies, every version's resumes and evaluations in
+a RunState held in memory and reads them back from there. Each artifact is
+written through, on a background thread, to data/job-data/<job>/artifacts.sqlite3
+(one transaction per artifact). The legacy layout (strategies.md,
+version_N/resume_M.md, version_N/evaluation.md) is an optional export; the
+final version's resumes are always exported because the renderer reads them.
+
+Usage:
+    python -m utils.artifact_store list data/job-data/<job>
+    python -m utils.artifact_store diff data/job-data/<job> version_0/resume_1.md version_1/resume_1.md
+    python -m utils.artifact_store export data/job-data/<job>
+"""
+
+import os
+import queue
+import atexit
+import sqlite3
+import difflib
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+
+
+ARTIFACT_STORE_FILE_NAME = 'artifacts.sqlite3'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    name TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def _connect(job_dir):
+    conn = sqlite3.connect(os.path.join(job_dir, ARTIFACT_STORE_FILE_NAME), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(_SCHEMA)
+    return conn
+
+
+def _write_file(path, content):
+    """Write a file atomically (temp file, then rename)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_file = f"{path}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temp_file, path)
+
+
+class RunState:
+    """
+    In-memory artifacts of one pipeline run, written through to the job's artifact store.
+    """
+
+    def __init__(self, job_dir, export_legacy=False):
+        """
+        Initialize the run state and start its writer thread.
+
+        Args:
+            job_dir (str): The data/job-data/<job> directory.
+            export_legacy (bool): Also write every artifact to the legacy file layout.
+        """
+        self.job_dir = job_dir
+        self.export_legacy = export_legacy
+        self._artifacts = {}
+        self._queue = queue.Queue()
+        self._error = None
+        self._closed = False
+        os.makedirs(job_dir, exist_ok=True)
+        self._writer = threading.Thread(target=self._write_loop, name="artifact-writer", daemon=True)
+        self._writer.start()
+        # Artifacts still queued when the program exits (e.g. after an error) are written first
+        atexit.register(self.close)
+
+    def _write_loop(self):
+        conn = None
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                name, content, export = item
+                if conn is None:
+                    conn = _connect(self.job_dir)
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO artifacts (name, content, sha256, updated_at) VALUES (?, ?, ?, ?)",
+                        (name, content, hashlib.sha256(content.encode('utf-8')).hexdigest(),
+                         datetime.now().isoformat(timespec='seconds')),
+                    )
+                if export:
+                    _write_file(self.path(name), content)
+            except Exception as e:
+                self._error = self._error or e
+            finally:
+                if item is None and conn is not None:
+                    conn.close()
+                self._queue.task_done()
+
+    def path(self, name):
+        """Path of an artifact in the legacy layout, e.g. 'version_1/resume_2.md'."""
+        return os.path.join(self.job_dir, *name.split('/'))
+
+    def put(self, name, content, export=False):
+        """
+        Keep an artifact in memory and queue it for the artifact store.
+
+        Args:
+            name (str): Artifact name in the legacy layout, e.g. 'strategies.md'.
+            content (str): Artifact content.
+            export (bool): Also write the legacy file, even when export_legacy is off.
+        """
+        self._artifacts[name] = content
+        self._queue.put((name, content, export or self.export_legacy))
+
+    def get(self, name):
+        """
+        Get an artifact of this run.
+
+        Raises:
+            KeyError: If the artifact was never stored.
+        """
+        if name not in self._artifacts:
+            content = load_artifact(self.job_dir, name)
+            if content is None:
+                raise KeyError(f"Artifact '{name}' does not exist in {self.job_dir}")
+            self._artifacts[name] = content
+        return self._artifacts[name]
+
+    def export(self, name):
+        """
+        Write an artifact to the legacy layout and wait until it is on disk.
+
+        Returns:
+            str: Path of the exported file.
+        """
+        self._queue.put((name, self.get(name), True))
+        self.flush()
+        return self.path(name)
+
+    def flush(self):
+        """
+        Wait until every queued artifact is written.
+
+        Raises:
+            Exception: The first error of the writer thread.
+        """
+        self._queue.join()
+        if self._error:
+            error, self._error = self._error, None
+            raise error
+
+    def close(self):
+        """Write the remaining artifacts and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(None)
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def load_artifact(job_dir, name):
+    """
+    Read an artifact of an earlier run, from its artifact store, the legacy file
+    or, for archived runs, the job archive (utils/job_archive.py).
+
+    Returns:
+        str or None: The content, or None if the artifact does not exist.
+    """
+    if os.path.exists(os.path.join(job_dir, ARTIFACT_STORE_FILE_NAME)):
+        conn = _connect(job_dir)
+        try:
+            row = conn.execute("SELECT content FROM artifacts WHERE name = ?", (name,)).fetchone()
+        finally:
+            conn.close()
+        if row:
+            return row[0]
+    legacy_file = os.path.join(job_dir, *name.split('/'))
+    if os.path.exists(legacy_file):
+        with open(legacy_file, 'r', encoding='utf-8') as f:
+            return f.read()
+    from utils.job_archive import read_archived
+    return read_archived(job_dir, name)
+
+
+def list_artifacts(job_dir):
+    """
+    List the artifacts of a job.
+
+    Returns:
+        list: {'name', 'sha256', 'updated_at', 'chars'} dicts sorted by name.
+    """
+    if not os.path.exists(os.path.join(job_dir, ARTIFACT_STORE_FILE_NAME)):
+        return []
+    conn = _connect(job_dir)
+    try:
+        rows = conn.execute(
+            "SELECT name, sha256, updated_at, length(content) FROM artifacts ORDER BY name"
+        ).fetchall()
+    finally:
+        conn.close()
+    return [{"name": name, "sha256": sha256, "updated_at": updated_at, "chars": chars}
+            for name, sha256, updated_at, chars in rows]
+
+
+def diff_artifacts(job_dir, old_name, new_name):
+    """
+    Unified diff between two artifacts, e.g. a resume in two versions.
+
+    Returns:
+        str: The diff (empty if the artifacts are identical).
+
+    Raises:
+        KeyError: If either artifact does not exist.
+    """
+    contents = []
+    for name in (old_name, new_name):
+        content = load_artifact(job_dir, name)
+        if content is None:
+            raise KeyError(f"Artifact '{name}' does not exist in {job_dir}")
+        contents.append(content.splitlines(keepends=True))
+    return "".join(difflib.unified_diff(contents[0], contents[1], fromfile=old_name, tofile=new_name))
+
+
+def export_artifacts(job_dir, names=None):
+    """
+    Write stored artifacts to the legacy file layout.
+
+    Args:
+        job_dir (str): The data/job-data/<job> directory.
+        names (list): Artifact names to export (defaults to all).
+
+    Returns:
+        list: Paths of the exported files.
+    """
+    exported = []
+    for name in names or [artifact['name'] for artifact in list_artifacts(job_dir)]:
+        content = load_artifact(job_dir, name)
+        if content is not None:
+            path = os.path.join(job_dir, *name.split('/'))
+            _write_file(path, content)
+            exported.append(path)
+    return exported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect a job's artifact store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    listing = commands.add_parser("list", help="List artifacts")
+    listing.add_argument("job_dir")
+    diff = commands.add_parser("diff", help="Diff two artifacts")
+    diff.add_argument("job_dir")
+    diff.add_argument("old_name")
+    diff.add_argument("new_name")
+    export = commands.add_parser("export", help="Write artifacts to the legacy file layout")
+    export.add_argument("job_dir")
+    export.add_argument("names", nargs="*")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for artifact in list_artifacts(args.job_dir):
+            print(f"{artifact['name']:<32} {artifact['chars']:>7} chars  {artifact['sha256'][:12]}  {artifact['updated_at']}")
+    elif args.command == "diff":
+        print(diff_artifacts(args.job_dir, args.old_name, args.new_name) or "Artifacts are identical")
+    else:
+        for path in export_artifacts(args.job_dir, args.names):
+            print(f"✅ Exported {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""
+Local fact verification of resume drafts.
+
+Builds an index of the applicant's facts (employers, titles, institutions,
+degrees, projects, certifications, skills, dates and numbers) from the profile
+JSON or Markdown, extracts the same kinds of facts from each generated draft
+and flags the ones the profile does not support, using normalized and fuzzy
+(difflib) matching. Replaces asking the LLM judge to verify drafts against
+the profile.
+"""
+
+import os
+import re
+import json
+from datetime import datetime
+from difflib import SequenceMatcher
+
+from utils.keywords import extract_skills, load_skills_lexicon
+from utils.resume_sections import parse_resume_sections
+
+
+FACT_CHECK_FILE_NAME = 'fact_check.json'
+
+MONTHS = {
+    name: number
+    for number, names in enumerate((
+        ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"), ("may",), ("jun", "june"),
+        ("jul", "july"), ("aug", "august"), ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"),
+        ("dec", "december"),
+    ), start=1)
+    for name in names
+}
+DATE_PATTERN = re.compile(
+    r"\b(?P<m1>0?[1-9]|1[0-2])[/-](?P<y1>(?:19|20)\d{2})\b"
+    r"|\b(?P<y2>(?:19|20)\d{2})[/-](?P<m2>0?[1-9]|1[0-2])\b"
+    r"|\b(?P<mname>" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.?\s+(?P<y3>(?:19|20)\d{2})\b"
+    r"|\b(?P<y4>(?:19|20)\d{2})\b",
+    re.IGNORECASE,
+)
+NUMBER_PATTERN = re.compile(
+    r"(?<![\w.$])\$?(?P<value>\d[\d,]*(?:\.\d+)?)\s?(?P<unit>%|\+|x\b|k\b|m\b|mm\b|b\b|bn\b|million\b|billion\b|thousand\b)?"
+    r"(?P<years>\+?\s+(?:years?|yrs?)\b)?(?![\w/])",
+    re.IGNORECASE,
+)
+MAGNITUDES = {"k": 1e3, "thousand": 1e3, "m": 1e6, "mm": 1e6, "million": 1e6, "b": 1e9, "bn": 1e9, "billion": 1e9}
+HEADER_SEPARATORS = re.compile(r"\s*(?:\||—|–|\s-\s|,|\bat\b|@)\s*")
+COMPANY_SUFFIXES = frozenset("inc incorporated ltd limited llc llp corp corporation co company plc gmbh the".split())
+# Words that inflate a title, so 'Senior Software Engineer' does not match 'Software Engineer'
+SENIORITY_WORDS = frozenset("senior sr lead principal staff head chief manager director vp president".split())
+
+FACT_LABELS = {
+    "companies": "employer", "titles": "title", "institutions": "institution", "degrees": "degree",
+    "projects": "project", "certifications": "certification",
+}
+
+# Section keys from utils/resume_sections.py whose '###' headers name an entity of the profile
+HEADER_FACTS = {
+    "experience": ("companies", "titles"),
+    "education": ("institutions", "degrees"),
+    "projects": ("projects",),
+}
+
+
+def normalize_name(name):
+    """
+    Normalize an entity name for matching.
+
+    Args:
+        name (str): Company, title, institution or other name.
+
+    Returns:
+        str: Lowercased name without punctuation, Markdown emphasis or company suffixes.
+    """
+    text = re.sub(r"[*_`]", "", name.lower()).replace("&", " and ")
+    words = re.findall(r"[a-z0-9+#]+", text)
+    return " ".join(word for word in words if word not in COMPANY_SUFFIXES)
+
+
+def match_name(value, candidates):
+    """
+    Find the closest candidate for a name.
+
+    Exact and whole-word containment matches score 1.0; anything else is
+    scored with difflib's similarity ratio.
+
+    Args:
+        value (str): The name found in a draft.
+        candidates (list): Names from the profile index.
+
+    Returns:
+        tuple: (closest candidate or None, score between 0 and 1).
+    """
+    normalized = normalize_name(value)
+    best, best_score = None, 0.0
+    for candidate in candidates:
+        target = normalize_name(candidate)
+        if not normalized or not target:
+            continue
+        if normalized == target or f" {normalized} " in f" {target} ":
+            return candidate, 1.0
+        if f" {target} " in f" {normalized} " and not (set(normalized.split()) - set(target.split())) & SENIORITY_WORDS:
+            return candidate, 1.0
+        score = SequenceMatcher(None, normalized, target).ratio()
+        if score > best_score:
+            best, best_score = candidate, score
+    return best, round(best_score, 3)
+
+
+def parse_dates(text):
+    """
+    Extract dates from a text.
+
+    Args:
+        text (str): Text to scan.
+
+    Returns:
+        list: (matched text, year, month or None) tuples.
+    """
+    dates = []
+    for match in DATE_PATTERN.finditer(text):
+        if match.group("y1"):
+            dates.append((match.group(0), int(match.group("y1")), int(match.group("m1"))))
+        elif match.group("y2"):
+            dates.append((match.group(0), int(match.group("y2")), int(match.group("m2"))))
+        elif match.group("y3"):
+            dates.append((match.group(0), int(match.group("y3")), MONTHS[match.group("mname").lower()]))
+        else:
+            dates.append((match.group(0), int(match.group("y4")), None))
+    return dates
+
+
+def parse_numbers(text):
+    """
+    Extract numeric claims from a text, ignoring dates.
+
+    Args:
+        text (str): Text to scan.
+
+    Returns:
+        list: (matched text, value, is_years) tuples, with magnitudes such as 'k' or 'million' applied.
+    """
+    text = DATE_PATTERN.sub(" ", text)
+    lexicon = load_skills_lexicon()
+    numbers = []
+    for match in NUMBER_PATTERN.finditer(text):
+        # Versions such as 'Python 3' are not claims
+        previous = re.search(r"([\w.+#-]+)\s+$", text[:match.start()])
+        if not match.group("unit") and previous and previous.group(1).lower() in lexicon:
+            continue
+        value = float(match.group("value").replace(",", ""))
+        unit = (match.group("unit") or "").lower()
+        value *= MAGNITUDES.get(unit, 1)
+        numbers.append((match.group(0).strip(), value, bool(match.group("years"))))
+    return numbers
+
+
+def _strings(data):
+    """Yield every string value of a nested JSON structure."""
+    if isinstance(data, dict):
+        for value in data.values():
+            yield from _strings(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from _strings(value)
+    elif isinstance(data, str):
+        yield data
+
+
+def build_profile_index(profile_data=None, profile_md=""):
+    """
+    Build the index of facts stated in the applicant's profile.
+
+    Args:
+        profile_data (dict): Profile JSON data as written by profile-gen.py, if available.
+        profile_md (str): Profile in Markdown (or raw JSON text), used for the entities
+            when there is no profile JSON and for the skills, dates and numbers.
+
+    Returns:
+        dict: Lists of 'companies', 'titles', 'institutions', 'degrees', 'projects',
+            'certifications' and 'locations', plus sets of 'skills', 'dates' ((year, month)
+            pairs, month None for year-only dates) and 'numbers', and 'max_years' of
+            experience the profile spans.
+    """
+    index = {key: [] for key in ("companies", "titles", "institutions", "degrees", "projects", "certifications", "locations")}
+
+    if profile_data:
+        info = profile_data.get('personal_info', {})
+        index["titles"] += [info.get('role', ''), profile_data.get('important_info', {}).get('role', '')]
+        index["locations"].append(info.get('location', ''))
+        for exp in profile_data.get('experience', []):
+            index["companies"].append(exp.get('company', ''))
+            index["titles"].append(exp.get('position', ''))
+            index["locations"].append(exp.get('location', ''))
+        for edu in profile_data.get('education', []):
+            index["institutions"].append(edu.get('institute', ''))
+            index["degrees"].append(edu.get('field', ''))
+        for proj in profile_data.get('projects', []):
+            index["projects"].append(proj.get('name', ''))
+        for cert in profile_data.get('certifications', []):
+            index["certifications"].append(cert.get('name', ''))
+            index["companies"].append(cert.get('company', ''))
+        text = "\n".join(_strings(profile_data)) + "\n" + profile_md
+    else:
+        for section in parse_resume_sections(profile_md)["sections"]:
+            for child in section["children"]:
+                parts = [part for part in re.split(r"\s*\|\s*", child["title"]) if part]
+                if section["key"] == "experience":
+                    index["titles"].append(parts[0])
+                    index["companies"] += parts[1:]
+                elif section["key"] == "education":
+                    index["institutions"].append(child["title"])
+                    index["degrees"] += re.findall(r"\*\*(.+?)\*\*", child["body"])
+                elif section["key"] == "projects":
+                    index["projects"].append(parts[0])
+            if section["key"] == "certifications":
+                for name, company in re.findall(r"(?m)^- \*\*(.+?)\*\*\s*-\s*(.+)$", section["body"]):
+                    index["certifications"].append(name)
+                    index["companies"].append(company)
+        text = profile_md
+
+    for key in index:
+        index[key] = sorted({value.strip() for value in index[key] if value and value.strip()})
+
+    dates = {(year, month) for _, year, month in parse_dates(text)}
+    dates |= {(year, None) for year, _ in dates}
+    earliest = min((year for year, _ in dates), default=datetime.now().year)
+    index["skills"] = extract_skills(text)
+    index["dates"] = dates
+    index["numbers"] = {value for _, value, _ in parse_numbers(text)}
+    index["max_years"] = datetime.now().year - earliest + 1
+    return index
+
+
+def _header_parts(title):
+    """Split a '###' header into its named parts, dropping dates."""
+    title = re.sub(r"[*_`]", "", DATE_PATTERN.sub(" ", title))
+    title = re.sub(r"\b(present|current|now)\b", " ", title, flags=re.IGNORECASE)
+    return [part for part in HEADER_SEPARATORS.split(title) if re.search(r"[A-Za-z]", part)]
+
+
+def _date_supported(year, month, dates):
+    """A month is supported by the same month, or by the year when the profile only gives years for it."""
+    if (year, month) in dates:
+        return True
+    return bool(month) and (year, None) in dates and not any(y == year and m for y, m in dates)
+
+
+def verify_resume(content, index, threshold=0.85, exclude=()):
+    """
+    Check the facts of a resume draft against the profile index.
+
+    Args:
+        content (str): Resume content in Markdown format.
+        index (dict): Profile index from build_profile_index.
+        threshold (float): Minimum fuzzy match score for names.
+        exclude (tuple): Canonical section names to skip (e.g. locally rendered sections).
+
+    Returns:
+        dict: {'checked': int, 'flags': [{'type', 'value', 'section', 'closest', 'score'}]}
+    """
+    flags = []
+    checked = 0
+
+    def flag(kind, value, section, closest=None, score=0.0):
+        if not any(f["type"] == kind and f["value"] == value and f["section"] == section for f in flags):
+            flags.append({"type": kind, "value": value, "section": section, "closest": closest, "score": score})
+
+    # The preamble holds the name and contact details, which are not claims to verify
+    for section in parse_resume_sections(content)["sections"]:
+        if section["key"] in exclude:
+            continue
+        title, body = section["title"], section["body"]
+
+        kinds = HEADER_FACTS.get(section["key"])
+        if kinds:
+            for child in section["children"]:
+                parts = _header_parts(child["title"])
+                if section["key"] == "projects":
+                    parts = parts[:1]
+                for part in parts:
+                    if match_name(part, index["locations"])[1] >= threshold:
+                        continue
+                    checked += 1
+                    candidates = [name for kind in kinds for name in index[kind]]
+                    closest, score = match_name(part, candidates)
+                    if score < threshold:
+                        flag(" or ".join(FACT_LABELS[kind] for kind in kinds), part, title, closest, score)
+
+        if section["key"] == "certifications":
+            for line in body.splitlines():
+                name = re.match(r"^\s*[-*+•]\s+(?:\*\*(.+?)\*\*|([^-–—|(]+))", line)
+                if name:
+                    checked += 1
+                    closest, score = match_name(name.group(1) or name.group(2), index["certifications"])
+                    if score < threshold:
+                        flag("certification", (name.group(1) or name.group(2)).strip(), title, closest, score)
+
+        skills = extract_skills(body) if section["key"] != "certifications" else set()
+        for skill in sorted(skills):
+            checked += 1
+            if skill not in index["skills"]:
+                flag("skill", skill, title)
+
+        for text, year, month in parse_dates(body):
+            checked += 1
+            if not _date_supported(year, month, index["dates"]):
+                flag("date", text, title)
+
+        for text, value, is_years in parse_numbers(body):
+            checked += 1
+            if is_years and value <= index["max_years"]:
+                continue
+            if value not in index["numbers"]:
+                flag("number", text, title)
+
+    return {"checked": checked, "flags": flags}
+
+
+def format_fact_report(report):
+    """
+    Summarize a verification report in one line.
+
+    Args:
+        report (dict): Result of verify_resume.
+
+    Returns:
+        str: Unsupported facts grouped by section, or '' if every fact was verified.
+    """
+    by_section = {}
+    for item in report["flags"]:
+        by_section.setdefault(item["section"], []).append(f"{item['type']} '{item['value']}'")
+    return "; ".join(f"in {section}: {', '.join(items)}" for section, items in by_section.items())
+
+
+def save_fact_check(reports, job_dir):
+    """
+    Save the verification reports of a version.
+
+    Args:
+        reports (dict): Resume number to verify_resume result.
+        job_dir (str): Directory of the version.
+
+    Returns:
+        str: Path of the saved file.
+    """
+    fact_file = os.path.join(job_dir, FACT_CHECK_FILE_NAME)
+    with open(fact_file, 'w', encoding='utf-8') as f:
+        json.dump(reports, f, indent=2)
+    return fact_file
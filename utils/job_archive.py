@@ -0,0 +1,597 @@
+"""
+Compressed archive of finished job runs.
+
+Finished runs (recorded in data/job-data/run-index.json) are packed into
+bundles in data/job-data/archive/ and their job directories removed. Every
+artifact (the artifact store's strategies, resumes and evaluations, and the
+files of the job directory) is one independently compressed zstd frame, so a
+read decompresses only the requested artifact. Identical artifacts are stored
+once across all jobs, and each bundle carries a zstd dictionary trained on
+its artifacts, which lets small, similar Markdown drafts compress well on
+their own. index.json maps jobs to artifact hashes and hashes to
+(bundle, offset, length).
+
+Retention: the 'best' policy keeps the job-level files plus only the
+best-scored and the final version (resumes, evaluation and rendered files);
+'all' keeps every version. The final version is the one that was rendered and
+that the run index and the near-duplicate index point to, so archived runs
+remain memo hits and can be reused. Applying 'best' to archived jobs later and compacting the
+bundles reclaims the space of dropped versions.
+
+zstandard is optional; without it zlib is used.
+
+Usage:
+    python -m utils.job_archive archive --older-than 30 --policy best
+    python -m utils.job_archive list
+    python -m utils.job_archive cat <job> version_2/resume_1.md
+    python -m utils.job_archive extract <job> --out restored/
+    python -m utils.job_archive retain --policy best --older-than 90
+"""
+
+import os
+import re
+import json
+import zlib
+import shutil
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from utils.run_index import load_run_index
+
+
+JOB_DATA_DIR = os.path.join('data', 'job-data')
+ARCHIVE_DIR_NAME = 'archive'
+ARCHIVE_INDEX_FILE_NAME = 'index.json'
+RETENTION_POLICIES = ('all', 'best')
+
+# Files that are not artifacts of a run
+_SKIPPED_FILES = re.compile(r"(^|/)artifacts\.sqlite3(-wal|-shm)?$|\.tmp$")
+_VERSION_NAME = re.compile(r"^version_(\d+)/")
+_AVERAGE_SCORE = re.compile(r"average(?:\s+score)?\**\s*[:=\-–]?\s*\**\s*(\d{1,3}(?:\.\d+)?)", re.IGNORECASE)
+
+# A dictionary only helps with enough samples to learn from
+DICT_MIN_SAMPLES = 8
+DICT_SIZE = 16 * 1024
+
+# One reader per archive directory; dropped whenever the archive changes
+_readers = {}
+_archive_lock = threading.RLock()
+
+
+def archive_dir_for(job_data_dir=JOB_DATA_DIR):
+    return os.path.join(job_data_dir, ARCHIVE_DIR_NAME)
+
+
+def load_archive_index(archive_dir):
+    """
+    Load the archive index.
+
+    Returns:
+        dict: {'jobs': job name to {'archived_at', 'policy', 'best_version', 'artifacts'},
+            'blobs': hash to {'bundle', 'offset', 'length', 'size', 'codec'},
+            'dicts': bundle name to {'offset', 'length'}}
+    """
+    index_file = os.path.join(archive_dir, ARCHIVE_INDEX_FILE_NAME)
+    if os.path.exists(index_file):
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            pass
+    return {"jobs": {}, "blobs": {}, "dicts": {}}
+
+
+def _save_archive_index(index, archive_dir):
+    os.makedirs(archive_dir, exist_ok=True)
+    index_file = os.path.join(archive_dir, ARCHIVE_INDEX_FILE_NAME)
+    temp_file = f"{index_file}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(temp_file, index_file)
+
+
+def version_score(evaluation):
+    """
+    Mean of the average scores in an evaluation, or None if it has none.
+
+    The evaluation agent reports an average score (0-100) per resume.
+    """
+    scores = [float(score) for score in _AVERAGE_SCORE.findall(evaluation or "") if float(score) <= 100]
+    return sum(scores) / len(scores) if scores else None
+
+
+def best_version(artifacts):
+    """
+    Pick the version with the highest evaluation score.
+
+    Args:
+        artifacts (dict): Artifact name to content (bytes).
+
+    Returns:
+        int or None: Version number (the latest version when no evaluation has
+            scores), or None if there are no versions.
+    """
+    versions = {int(match.group(1)) for match in map(_VERSION_NAME.match, artifacts) if match}
+    if not versions:
+        return None
+    scores = {}
+    for version in versions:
+        evaluation = artifacts.get(f"version_{version}/evaluation.md")
+        score = version_score(evaluation.decode('utf-8', 'replace')) if evaluation else None
+        if score is not None:
+            scores[version] = score
+    if not scores:
+        return max(versions)
+    # Later versions win ties, they had more feedback
+    return max(scores, key=lambda version: (scores[version], version))
+
+
+def apply_policy(names, policy, best):
+    """
+    Select the artifact names a retention policy keeps.
+
+    The final (latest) version is always kept: it is the rendered one and the
+    version the run index and the near-duplicate index refer to.
+
+    Args:
+        names (iterable): Artifact names.
+        policy (str): 'all' or 'best'.
+        best (int): Best version number (see best_version).
+
+    Returns:
+        list: Kept names.
+    """
+    if policy not in RETENTION_POLICIES:
+        raise ValueError(f"Invalid retention policy: {policy}. Supported policies are {RETENTION_POLICIES}.")
+    names = list(names)
+    if policy == 'all' or best is None:
+        return names
+    versions = {name: int(match.group(1)) for name, match in zip(names, map(_VERSION_NAME.match, names)) if match}
+    final = max(versions.values(), default=None)
+    return [name for name in names if name not in versions or versions[name] in (best, final)]
+
+
+def collect_artifacts(job_dir):
+    """
+    Read every artifact of a job directory.
+
+    Returns:
+        dict: Artifact name (e.g. 'version_1/resume_2.md') to content bytes; the
+            artifact store's content wins over a legacy file of the same name.
+    """
+    from utils.artifact_store import list_artifacts, load_artifact
+
+    artifacts = {}
+    for root, _, files in os.walk(job_dir):
+        for file_name in files:
+            path = os.path.join(root, file_name)
+            name = os.path.relpath(path, job_dir).replace(os.sep, '/')
+            if not _SKIPPED_FILES.search(name):
+                with open(path, 'rb') as f:
+                    artifacts[name] = f.read()
+    for artifact in list_artifacts(job_dir):
+        artifacts[artifact['name']] = load_artifact(job_dir, artifact['name']).encode('utf-8')
+    return artifacts
+
+
+def _compress(data, codec, compressor):
+    return compressor.compress(data) if codec == 'zstd' else zlib.compress(data, 9)
+
+
+def _write_bundle(blobs, archive_dir, level=19):
+    """
+    Write new blobs to a new bundle file.
+
+    Args:
+        blobs (dict): Hash to content bytes.
+        archive_dir (str): Archive directory.
+        level (int): zstd compression level.
+
+    Returns:
+        tuple: (bundle name, blob index entries, dictionary entry or None)
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    bundle = f"bundle-{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.pack"
+    codec = 'zstd' if zstandard else 'zlib'
+    dict_data = None
+    compressor = None
+    if codec == 'zstd':
+        if len(blobs) >= DICT_MIN_SAMPLES:
+            try:
+                dict_data = zstandard.train_dictionary(DICT_SIZE, list(blobs.values()))
+            except zstandard.ZstdError:
+                dict_data = None
+        compressor = zstandard.ZstdCompressor(level=level, dict_data=dict_data)
+
+    entries, dict_entry = {}, None
+    path = os.path.join(archive_dir, bundle)
+    with open(path, 'wb') as f:
+        if dict_data is not None:
+            raw = dict_data.as_bytes()
+            dict_entry = {"offset": 0, "length": len(raw)}
+            f.write(raw)
+        for digest, data in blobs.items():
+            frame = _compress(data, codec, compressor)
+            entries[digest] = {"bundle": bundle, "offset": f.tell(), "length": len(frame), "size": len(data),
+                               "codec": codec, "dict": dict_entry is not None}
+            f.write(frame)
+        f.flush()
+        os.fsync(f.fileno())
+    return bundle, entries, dict_entry
+
+
+def archive_job(job_dir, policy='best', level=19, archive_dir=None):
+    """
+    Pack a job directory into the archive and remove it.
+
+    Args:
+        job_dir (str): The data/job-data/<job> directory.
+        policy (str): Retention policy, 'all' or 'best'.
+        level (int): zstd compression level.
+        archive_dir (str): Archive directory (defaults to data/job-data/archive next to the job).
+
+    Returns:
+        dict: {'job', 'artifacts', 'new_blobs', 'bytes_before', 'bytes_after', 'best_version'}
+    """
+    job_dir = os.path.normpath(job_dir)
+    archive_dir = archive_dir or os.path.join(os.path.dirname(job_dir), ARCHIVE_DIR_NAME)
+    job = os.path.basename(job_dir)
+    with _archive_lock:
+        index = load_archive_index(archive_dir)
+        artifacts = collect_artifacts(job_dir)
+        best = best_version(artifacts)
+        kept = apply_policy(artifacts, policy, best)
+
+        references, new_blobs = {}, {}
+        for name in kept:
+            digest = hashlib.sha256(artifacts[name]).hexdigest()
+            references[name] = digest
+            if digest not in index["blobs"]:
+                new_blobs[digest] = artifacts[name]
+
+        bytes_after = 0
+        if new_blobs:
+            bundle, entries, dict_entry = _write_bundle(new_blobs, archive_dir, level)
+            index["blobs"].update(entries)
+            if dict_entry:
+                index["dicts"][bundle] = dict_entry
+            bytes_after = sum(entry["length"] for entry in entries.values()) + (dict_entry or {}).get("length", 0)
+        index["jobs"][job] = {
+            "archived_at": datetime.now().isoformat(timespec='seconds'),
+            "policy": policy,
+            "best_version": best,
+            "artifacts": references,
+        }
+        _save_archive_index(index, archive_dir)
+        # The job directory is only removed once the bundle and the index are on disk
+        shutil.rmtree(job_dir)
+        _readers.pop(os.path.abspath(archive_dir), None)
+
+    return {
+        "job": job,
+        "artifacts": len(kept),
+        "new_blobs": len(new_blobs),
+        "bytes_before": sum(len(data) for data in artifacts.values()),
+        "bytes_after": bytes_after,
+        "best_version": best,
+    }
+
+
+def finished_runs(job_data_dir=JOB_DATA_DIR, older_than_days=0):
+    """
+    List job directories of finished runs old enough to archive.
+
+    Returns:
+        list: Job directory paths recorded in the run index and still on disk.
+    """
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    job_dirs = []
+    for record in load_run_index(os.path.join(job_data_dir, 'run-index.json')).values():
+        job_dir = record.get('job_dir')
+        created = datetime.fromisoformat(record.get('created', datetime.now().isoformat()))
+        if job_dir and os.path.isdir(job_dir) and created <= cutoff and job_dir not in job_dirs:
+            job_dirs.append(job_dir)
+    return job_dirs
+
+
+def archive_runs(older_than_days=30, policy='best', level=19, job_data_dir=JOB_DATA_DIR, dry_run=False):
+    """
+    Archive every finished run older than a number of days.
+
+    Returns:
+        list: archive_job results (job directories only, when dry_run is True).
+    """
+    job_dirs = finished_runs(job_data_dir, older_than_days)
+    if dry_run:
+        return job_dirs
+    return [archive_job(job_dir, policy, level, archive_dir_for(job_data_dir)) for job_dir in job_dirs]
+
+
+def retain(policy='best', older_than_days=0, archive_dir=None):
+    """
+    Apply a retention policy to archived jobs, then compact the bundles.
+
+    Returns:
+        dict: {'jobs': jobs changed, 'bytes_reclaimed': bytes freed by compaction}
+    """
+    archive_dir = archive_dir or archive_dir_for()
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    changed = 0
+    with _archive_lock:
+        index = load_archive_index(archive_dir)
+        for job, record in index["jobs"].items():
+            if datetime.fromisoformat(record["archived_at"]) > cutoff or record["policy"] == policy:
+                continue
+            kept = apply_policy(record["artifacts"], policy, record["best_version"])
+            record["artifacts"] = {name: record["artifacts"][name] for name in kept}
+            record["policy"] = policy
+            changed += 1
+        _save_archive_index(index, archive_dir)
+    return {"jobs": changed, "bytes_reclaimed": compact(archive_dir)}
+
+
+def compact(archive_dir=None):
+    """
+    Drop blobs no job references and rewrite bundles that contain them.
+
+    The rewritten bundle keeps its dictionary and the compressed frames as they
+    are; the old bundle is deleted after the index points to the new one.
+
+    Returns:
+        int: Bytes reclaimed.
+    """
+    archive_dir = archive_dir or archive_dir_for()
+    with _archive_lock:
+        index = load_archive_index(archive_dir)
+        referenced = {digest for record in index["jobs"].values() for digest in record["artifacts"].values()}
+        by_bundle = {}
+        for digest, entry in index["blobs"].items():
+            by_bundle.setdefault(entry["bundle"], []).append(digest)
+
+        reclaimed, obsolete = 0, []
+        for bundle, digests in by_bundle.items():
+            live = [digest for digest in digests if digest in referenced]
+            if len(live) == len(digests):
+                continue
+            old_path = os.path.join(archive_dir, bundle)
+            reclaimed += os.path.getsize(old_path)
+            obsolete.append(old_path)
+            for digest in digests:
+                if digest not in referenced:
+                    del index["blobs"][digest]
+            dict_entry = index["dicts"].pop(bundle, None)
+            if not live:
+                continue
+            new_bundle = f"bundle-{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.pack"
+            new_path = os.path.join(archive_dir, new_bundle)
+            with open(old_path, 'rb') as src, open(new_path, 'wb') as dst:
+                if dict_entry:
+                    src.seek(dict_entry["offset"])
+                    dst.write(src.read(dict_entry["length"]))
+                    index["dicts"][new_bundle] = {"offset": 0, "length": dict_entry["length"]}
+                for digest in live:
+                    entry = index["blobs"][digest]
+                    src.seek(entry["offset"])
+                    frame = src.read(entry["length"])
+                    entry.update(bundle=new_bundle, offset=dst.tell())
+                    dst.write(frame)
+                dst.flush()
+                os.fsync(dst.fileno())
+            reclaimed -= os.path.getsize(new_path)
+
+        _save_archive_index(index, archive_dir)
+        for path in obsolete:
+            os.remove(path)
+        _readers.pop(os.path.abspath(archive_dir), None)
+    return reclaimed
+
+
+class ArchiveReader:
+    """
+    Lazy access to archived artifacts: only the requested frame is read and decompressed.
+    """
+
+    def __init__(self, archive_dir=None):
+        self.archive_dir = archive_dir or archive_dir_for()
+        self.index = load_archive_index(self.archive_dir)
+        self._decompressors = {}
+
+    def jobs(self):
+        """Names of the archived jobs."""
+        return sorted(self.index["jobs"])
+
+    def list(self, job):
+        """
+        List a job's archived artifacts.
+
+        Returns:
+            list: {'name', 'size', 'stored'} dicts sorted by name ('stored' is the compressed size).
+        """
+        artifacts = self.index["jobs"].get(job, {}).get("artifacts", {})
+        return [{"name": name, "size": self.index["blobs"][digest]["size"], "stored": self.index["blobs"][digest]["length"]}
+                for name, digest in sorted(artifacts.items())]
+
+    def _decompressor(self, bundle, f):
+        if bundle not in self._decompressors:
+            dict_entry = self.index["dicts"].get(bundle)
+            dict_data = None
+            if dict_entry:
+                f.seek(dict_entry["offset"])
+                dict_data = zstandard.ZstdCompressionDict(f.read(dict_entry["length"]))
+            self._decompressors[bundle] = zstandard.ZstdDecompressor(dict_data=dict_data)
+        return self._decompressors[bundle]
+
+    def read_bytes(self, job, name):
+        """
+        Read one archived artifact.
+
+        Returns:
+            bytes or None: The content, or None if the job or artifact is not archived.
+
+        Raises:
+            RuntimeError: If the artifact is zstd-compressed and zstandard is not installed.
+        """
+        digest = self.index["jobs"].get(job, {}).get("artifacts", {}).get(name)
+        if digest is None:
+            return None
+        entry = self.index["blobs"][digest]
+        with open(os.path.join(self.archive_dir, entry["bundle"]), 'rb') as f:
+            if entry["codec"] == 'zlib':
+                f.seek(entry["offset"])
+                return zlib.decompress(f.read(entry["length"]))
+            if zstandard is None:
+                raise RuntimeError("The archive is zstd-compressed; install zstandard to read it")
+            decompressor = self._decompressor(entry["bundle"], f)
+            f.seek(entry["offset"])
+            return decompressor.decompress(f.read(entry["length"]), max_output_size=entry["size"])
+
+    def read_text(self, job, name):
+        """Read one archived artifact as UTF-8 text, or None if it is not archived."""
+        data = self.read_bytes(job, name)
+        return data.decode('utf-8') if data is not None else None
+
+    def extract(self, job, out_dir):
+        """
+        Restore a job's artifacts to the legacy file layout.
+
+        Returns:
+            list: Paths of the written files.
+        """
+        paths = []
+        for artifact in self.list(job):
+            path = os.path.join(out_dir, *artifact["name"].split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(self.read_bytes(job, artifact["name"]))
+            paths.append(path)
+        return paths
+
+
+def _reader_for(job_dir):
+    """The shared ArchiveReader of the archive next to a job directory, or None if there is no archive."""
+    archive_dir = os.path.abspath(os.path.join(os.path.dirname(job_dir), ARCHIVE_DIR_NAME))
+    if not os.path.exists(os.path.join(archive_dir, ARCHIVE_INDEX_FILE_NAME)):
+        return None
+    with _archive_lock:
+        if archive_dir not in _readers:
+            _readers[archive_dir] = ArchiveReader(archive_dir)
+        return _readers[archive_dir]
+
+
+def read_archived(job_dir, name):
+    """
+    Read an artifact of an archived job directory.
+
+    Args:
+        job_dir (str): The data/job-data/<job> directory the job had before it was archived.
+        name (str): Artifact name, e.g. 'strategies.md'.
+
+    Returns:
+        str or None: The content, or None if it is not archived.
+    """
+    job_dir = os.path.normpath(job_dir)
+    reader = _reader_for(job_dir)
+    return reader.read_text(os.path.basename(job_dir), name) if reader else None
+
+
+def is_archived(job_dir, paths=()):
+    """
+    Check whether a job directory was archived, with the given files of it.
+
+    Args:
+        job_dir (str): The data/job-data/<job> directory the job had before it was archived.
+        paths (iterable): Paths of files in the job directory, e.g. the run index's resumes.
+
+    Returns:
+        bool: True if the job and every one of the files are in the archive.
+    """
+    job_dir = os.path.normpath(job_dir)
+    reader = _reader_for(job_dir)
+    record = reader.index["jobs"].get(os.path.basename(job_dir)) if reader else None
+    if record is None:
+        return False
+    return all(os.path.relpath(path, job_dir).replace(os.sep, '/') in record["artifacts"] for path in paths)
+
+
+def restore_archived(job_dir):
+    """
+    Restore an archived job to its original directory (e.g. for a run index hit).
+
+    Returns:
+        list: Paths of the restored files.
+    """
+    job_dir = os.path.normpath(job_dir)
+    reader = _reader_for(job_dir)
+    return reader.extract(os.path.basename(job_dir), job_dir) if reader else []
+
+
+def _format_bytes(size):
+    return f"{size / 1024:.1f} KB" if size < 1024 * 1024 else f"{size / (1024 * 1024):.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive finished job runs")
+    parser.add_argument("--job-data-dir", default=JOB_DATA_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+    archive = commands.add_parser("archive", help="Pack finished runs and remove their directories")
+    archive.add_argument("--older-than", type=float, default=30, help="Only runs finished at least this many days ago")
+    archive.add_argument("--policy", choices=RETENTION_POLICIES, default="best")
+    archive.add_argument("--level", type=int, default=19, help="zstd compression level")
+    archive.add_argument("--job", help="Archive this job directory name only, finished or not")
+    archive.add_argument("--dry-run", action="store_true")
+    listing = commands.add_parser("list", help="List archived jobs, or the artifacts of one job")
+    listing.add_argument("job", nargs="?")
+    cat = commands.add_parser("cat", help="Print one archived artifact")
+    cat.add_argument("job")
+    cat.add_argument("name")
+    extract = commands.add_parser("extract", help="Restore an archived job's files")
+    extract.add_argument("job")
+    extract.add_argument("--out", help="Target directory (defaults to the job's original directory)")
+    retention = commands.add_parser("retain", help="Apply a retention policy to archived jobs and compact")
+    retention.add_argument("--policy", choices=RETENTION_POLICIES, default="best")
+    retention.add_argument("--older-than", type=float, default=0, help="Only jobs archived at least this many days ago")
+    args = parser.parse_args()
+
+    archive_dir = archive_dir_for(args.job_data_dir)
+    if args.command == "archive":
+        if args.job:
+            job_dirs = [os.path.join(args.job_data_dir, args.job)]
+        else:
+            job_dirs = archive_runs(args.older_than, args.policy, job_data_dir=args.job_data_dir, dry_run=True)
+        if args.dry_run:
+            print("\n".join(job_dirs) or "No finished runs to archive")
+            return
+        for job_dir in job_dirs:
+            result = archive_job(job_dir, args.policy, args.level, archive_dir)
+            print(f"✅ Archived {result['job']}: {result['artifacts']} artifacts, {_format_bytes(result['bytes_before'])} -> "
+                  f"{_format_bytes(result['bytes_after'])} new ({result['new_blobs']} new blobs, best version {result['best_version']})")
+    elif args.command == "list":
+        reader = ArchiveReader(archive_dir)
+        if args.job:
+            for artifact in reader.list(args.job):
+                print(f"{artifact['name']:<40} {_format_bytes(artifact['size']):>10} -> {_format_bytes(artifact['stored'])}")
+        else:
+            for job in reader.jobs():
+                record = reader.index["jobs"][job]
+                print(f"{job}  ({len(record['artifacts'])} artifacts, policy {record['policy']}, archived {record['archived_at']})")
+    elif args.command == "cat":
+        content = ArchiveReader(archive_dir).read_text(args.job, args.name)
+        print(content if content is not None else f"❌ {args.name} is not archived for {args.job}")
+    elif args.command == "extract":
+        out_dir = args.out or os.path.join(args.job_data_dir, args.job)
+        paths = ArchiveReader(archive_dir).extract(args.job, out_dir)
+        print(f"✅ Restored {len(paths)} files to {out_dir}")
+    else:
+        result = retain(args.policy, args.older_than, archive_dir)
+        print(f"✅ Applied '{args.policy}' to {result['jobs']} jobs, reclaimed {_format_bytes(result['bytes_reclaimed'])}")
+
+
+if __name__ == "__main__":
+    main()
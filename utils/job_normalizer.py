@@ -0,0 +1,206 @@
+"""
+Job description normalization.
+
+Cleans the Markdown written by the scrapers before it is sent to any prompt:
+collapses whitespace and duplicated lines, removes navigation, cookie, EEO
+and benefits boilerplate using a hand-curated phrase set, and segments the
+description into responsibilities, requirements, nice-to-have and
+about-company sections.
+"""
+
+import os
+import re
+from functools import lru_cache
+
+from utils.profile_slicer import estimate_tokens
+
+
+BOILERPLATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'keyword-data', 'boilerplate_phrases.txt')
+
+NORMALIZED_JOB_FILE_NAME = 'job_normalized.md'
+
+# Canonical sections in output order. Sections not listed in KEEP_SECTIONS are dropped.
+SECTION_TITLES = {
+    "about_company": "About the Company",
+    "responsibilities": "Responsibilities",
+    "requirements": "Requirements",
+    "nice_to_have": "Nice to Have",
+    "other": "Other Details",
+    "benefits": "Benefits",
+    "legal": "Legal",
+}
+KEEP_SECTIONS = ("about_company", "responsibilities", "requirements", "nice_to_have", "other")
+
+# Heading cues, matched as whole words and checked in order: nice-to-have before requirements
+# ("preferred qualifications"), and the kept sections before the dropped benefits and legal
+# ones, so "Accessibility Engineering Responsibilities" stays a responsibilities section
+SECTION_CUES = [
+    ("nice_to_have", ("nice to have", "nice-to-have", "preferred", "bonus", "assets", "an asset", "pluses", "good to have")),
+    ("responsibilities", ("responsibilities", "responsibility", "what you'll do", "what you will do", "what you’ll do",
+                          "the role", "your role", "duties", "day to day", "day-to-day", "your impact", "you will",
+                          "the opportunity")),
+    ("requirements", ("requirements", "requirement", "qualifications", "qualification", "what you bring",
+                      "what you'll bring", "what we're looking for", "what we are looking for", "who you are",
+                      "must have", "skills", "experience", "about you")),
+    ("benefits", ("benefits", "benefit", "perks", "what we offer", "what's in it for you", "compensation", "why join",
+                  "why work")),
+    ("legal", ("equal opportunity", "eeo", "diversity", "inclusion", "accommodation", "accommodations", "accessibility")),
+    ("about_company", ("about us", "about the company", "who we are", "our mission", "our story", "company overview",
+                       "about the team", "about")),
+    ("other", ("job description", "description", "content", "overview")),
+]
+SECTION_CUE_PATTERNS = [
+    (section, re.compile(r"\b(?:" + "|".join(re.escape(cue) for cue in cues) + r")\b"))
+    for section, cues in SECTION_CUES
+]
+
+HEADING_PATTERN = re.compile(r"^(?:#{1,6}\s+(?P<md>.+?)|\*\*(?P<bold>[^*]{2,80})\*\*:?|(?P<colon>[A-Z][^.!?]{2,60}):)\s*$")
+LINK_ONLY_PATTERN = re.compile(r"^[-*\s]*(?:!?\[[^\]]*\]\([^)]*\)[\s|·•-]*)+$")
+URL_ONLY_PATTERN = re.compile(r"^[-*\s]*(?:https?://\S+|www\.\S+)\s*$")
+META_PATTERN = re.compile(r"^\*\*(Company|Location|Salary|Source|URL):\*\*")
+
+
+@lru_cache(maxsize=None)
+def load_boilerplate_phrases():
+    """
+    Load the hand-curated boilerplate phrase set.
+
+    Returns:
+        tuple: (phrases removed wherever they appear, navigation phrases removed only
+            when a short line consists of the phrase alone)
+    """
+    phrases, nav_phrases = [], set()
+    if not os.path.exists(BOILERPLATE_FILE):
+        return tuple(phrases), frozenset(nav_phrases)
+    with open(BOILERPLATE_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip().lower()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('nav:'):
+                nav_phrases.add(line[4:].strip())
+            else:
+                phrases.append(line)
+    return tuple(phrases), frozenset(nav_phrases)
+
+
+def _line_key(line):
+    """Normalized form of a line used for duplicate detection."""
+    return re.sub(r'[\W_]+', ' ', line.lower()).strip()
+
+
+def _is_boilerplate(line):
+    phrases, nav_phrases = load_boilerplate_phrases()
+    lowered = line.lower()
+    key = _line_key(line)
+    if key in nav_phrases or lowered.strip('#*-: ') in nav_phrases:
+        return True
+    if LINK_ONLY_PATTERN.match(line) or URL_ONLY_PATTERN.match(line):
+        return True
+    return any(phrase in lowered for phrase in phrases)
+
+
+def _classify_heading(text):
+    lowered = text.lower().strip()
+    for section, pattern in SECTION_CUE_PATTERNS:
+        if pattern.search(lowered):
+            return section
+    return None
+
+
+def normalize_job_markdown(job_md):
+    """
+    Normalize a scraped job description.
+
+    Args:
+        job_md (str): Job description in Markdown format, as written by the scrapers.
+
+    Returns:
+        tuple: (normalized Markdown, report dict with token counts, removed lines and
+            per-section token counts)
+    """
+    text = job_md.replace('\u00a0', ' ').replace('\u200b', '').replace('\r\n', '\n').replace('\r', '\n')
+
+    header_lines = []
+    sections = {name: [] for name in SECTION_TITLES}
+    current = "other"
+    seen = set()
+    removed = {"boilerplate": 0, "duplicate": 0}
+    title_seen = False
+
+    for raw_line in text.split('\n'):
+        line = re.sub(r'[ \t]+', ' ', raw_line).strip()
+        if not line:
+            if sections[current] and sections[current][-1] != "":
+                sections[current].append("")
+            continue
+
+        # Keep the scraper's title and metadata lines as the header
+        if not title_seen and line.startswith('# '):
+            header_lines.append(line)
+            title_seen = True
+            continue
+        if META_PATTERN.match(line) or line.startswith(('Title:', 'URL Source:')):
+            if line not in header_lines:
+                header_lines.append(line)
+            continue
+
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            heading_text = next(group for group in heading.groups() if group)
+            section = _classify_heading(heading_text) if len(heading_text.split()) <= 8 else None
+            if section:
+                current = section
+                continue
+
+        if _is_boilerplate(line):
+            removed["boilerplate"] += 1
+            continue
+
+        key = _line_key(line)
+        if key and key in seen:
+            removed["duplicate"] += 1
+            continue
+        seen.add(key)
+        sections[current].append(line)
+
+    output = header_lines[:]
+    section_tokens = {}
+    for name in SECTION_TITLES:
+        body = "\n".join(sections[name]).strip()
+        if not body:
+            continue
+        section_tokens[name] = estimate_tokens(body)
+        if name not in KEEP_SECTIONS:
+            removed["boilerplate"] += len([l for l in sections[name] if l])
+            continue
+        output.append(f"\n## {SECTION_TITLES[name]}\n\n{body}")
+
+    normalized = "\n".join(output).strip() + "\n"
+    original_tokens = estimate_tokens(job_md)
+    normalized_tokens = estimate_tokens(normalized)
+    report = {
+        "original_tokens": original_tokens,
+        "normalized_tokens": normalized_tokens,
+        "tokens_saved": original_tokens - normalized_tokens,
+        "removed_lines": removed,
+        "sections": section_tokens,
+    }
+    return normalized, report
+
+
+def save_normalized_job(normalized, job_dir):
+    """
+    Save a normalized job description in the job directory.
+
+    Args:
+        normalized (str): Normalized job Markdown.
+        job_dir (str): The data/job-data/<job> directory.
+
+    Returns:
+        str: Path of the saved file.
+    """
+    normalized_file = os.path.join(job_dir, NORMALIZED_JOB_FILE_NAME)
+    with open(normalized_file, 'w', encoding='utf-8') as f:
+        f.write(normalized)
+    return normalized_file
@@ -0,0 +1,331 @@
+"""
+Local job keyword extraction.
+
+Builds a compact keyword index for a scraped job description using n-gram
+TF-IDF against a bundled corpus of generic job postings, plus a skills lexicon.
+The index is computed once per job, saved as keywords.json next to
+strategies.md and referenced by every prompt instead of asking the LLM to
+re-extract keywords.
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+from collections import Counter
+from functools import lru_cache
+
+
+KEYWORD_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'keyword-data')
+CORPUS_FILE = os.path.join(KEYWORD_DATA_DIR, 'job_corpus.txt')
+LEXICON_FILE = os.path.join(KEYWORD_DATA_DIR, 'skills_lexicon.txt')
+
+KEYWORDS_FILE_NAME = 'keywords.json'
+
+STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each either etc few for from further
+had has have having he her here hers him his how i if in into is it its itself just may me might more
+most must my no nor not now of off on once only or other our ours out over own per same shall she should
+so some such than that the their them then there these they this those through to too under until up
+upon us very via was we were what when where which while who whom why will with within without would
+you your yours
+""".split())
+
+# Words that are frequent in postings but never useful as keywords on their own,
+# including the section titles of normalized jobs (utils/job_normalizer.py)
+GENERIC_TERMS = frozenset("""
+ability able applicants apply candidate candidates company role position team teams job work working
+looking join years year plus including include includes new strong excellent good great well using
+use used related relevant preferred required requirements responsibilities qualifications experience
+experienced opportunity opportunities environment based within across key help ensure understanding
+knowledge skills skill equivalent minimum least one two three four five title description
+location salary nice have details
+""".split())
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./-][a-z0-9+#]+)*\+*|\.net")
+BOUNDARY_PATTERN = re.compile(r"[\n;:!?()\[\]{}|•·]|\.(?:\s|$)|,\s")
+NUMERIC_PATTERN = re.compile(r"[0-9.,%+/-]+k?")
+
+
+def _tokenize_segments(text):
+    """
+    Split text into lowercase token segments that n-grams must not cross.
+
+    Args:
+        text (str): Raw text.
+
+    Returns:
+        list: A list of token lists, one per sentence/line fragment.
+    """
+    segments = []
+    for fragment in BOUNDARY_PATTERN.split(text.lower()):
+        tokens = TOKEN_PATTERN.findall(fragment)
+        if tokens:
+            segments.append(tokens)
+    return segments
+
+
+def _ngrams(segments, max_n, strict=True):
+    """
+    Generate n-grams from token segments.
+
+    Args:
+        segments (list): Token segments from _tokenize_segments.
+        max_n (int): Largest n-gram size.
+        strict (bool): Skip n-grams containing stopwords, generic terms or
+            numbers. Lexicon matching uses strict=False so skills such as
+            "ruby on rails" are still found.
+
+    Returns:
+        list: A list of n-gram strings.
+    """
+    grams = []
+    for tokens in segments:
+        for n in range(1, max_n + 1):
+            for i in range(len(tokens) - n + 1):
+                gram = tokens[i:i + n]
+                if strict and any(t in STOPWORDS or t in GENERIC_TERMS or NUMERIC_PATTERN.fullmatch(t) for t in gram):
+                    continue
+                grams.append(" ".join(gram))
+    return grams
+
+
+@lru_cache(maxsize=None)
+def load_skills_lexicon():
+    """
+    Load the bundled skills lexicon.
+
+    Returns:
+        dict: Mapping of every skill name and alias to its canonical skill name.
+    """
+    lexicon = {}
+    if not os.path.exists(LEXICON_FILE):
+        return lexicon
+    with open(LEXICON_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            names = [name.strip().lower() for name in line.split('|') if name.strip()]
+            for name in names:
+                lexicon[" ".join(TOKEN_PATTERN.findall(name)) or name] = names[0]
+    return lexicon
+
+
+@lru_cache(maxsize=None)
+def load_corpus_stats(max_n=3):
+    """
+    Compute n-gram document frequencies over the bundled job corpus.
+
+    Args:
+        max_n (int): Largest n-gram size.
+
+    Returns:
+        tuple: (number of documents, Counter of n-gram document frequencies)
+    """
+    if not os.path.exists(CORPUS_FILE):
+        return 0, Counter()
+    with open(CORPUS_FILE, 'r', encoding='utf-8') as f:
+        documents = [doc for doc in f.read().split('\n\n') if doc.strip()]
+    doc_freq = Counter()
+    for doc in documents:
+        doc_freq.update(set(_ngrams(_tokenize_segments(doc), max_n)))
+    return len(documents), doc_freq
+
+
+def build_keyword_index(job_content, top_k=25, max_n=3):
+    """
+    Build the keyword index for a job description.
+
+    Args:
+        job_content (str): Job description in Markdown format.
+        top_k (int): Number of TF-IDF keywords to keep.
+        max_n (int): Largest n-gram size considered.
+
+    Returns:
+        dict: Keyword index with the matched skills and the top TF-IDF keywords.
+    """
+    num_docs, doc_freq = load_corpus_stats(max_n)
+    lexicon = load_skills_lexicon()
+
+    segments = _tokenize_segments(job_content)
+    counts = Counter(_ngrams(segments, max_n))
+    lexicon_counts = Counter(gram for gram in _ngrams(segments, max_n, strict=False) if gram in lexicon)
+
+    def tf_idf(gram, count):
+        idf = math.log((num_docs + 1) / (doc_freq.get(gram, 0) + 1)) + 1
+        # Prefer multi-word phrases slightly over their single-word parts
+        length_boost = 1 + 0.25 * gram.count(' ')
+        return (1 + math.log(count)) * idf * length_boost
+
+    scores = {gram: tf_idf(gram, count) for gram, count in counts.items()}
+
+    skills = {}
+    for gram, count in lexicon_counts.items():
+        canonical = lexicon[gram]
+        skills[canonical] = max(skills.get(canonical, 0), tf_idf(gram, count))
+
+    # Drop skills and n-grams fully contained in a skill or a higher scoring n-gram
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    keywords = []
+    for gram, score in ranked:
+        if any(f" {gram} " in f" {skill_gram} " for skill_gram in lexicon_counts):
+            continue
+        if any(f" {gram} " in f" {kept} " for kept, _ in keywords):
+            continue
+        keywords.append((gram, score))
+        if len(keywords) >= top_k:
+            break
+
+    max_score = max(scores.values()) if scores else 1.0
+    return {
+        "job_hash": hashlib.sha256(job_content.encode('utf-8')).hexdigest()[:16],
+        "ngram_max": max_n,
+        "skills": [skill for skill, _ in sorted(skills.items(), key=lambda item: (-item[1], item[0]))],
+        "keywords": [[gram, round(score / max_score, 3)] for gram, score in keywords],
+    }
+
+
+def save_keyword_index(index, job_dir):
+    """
+    Save the keyword index as keywords.json in the job directory.
+
+    Args:
+        index (dict): Keyword index from build_keyword_index.
+        job_dir (str): The data/job-data/<job> directory.
+
+    Returns:
+        str: Path of the written keywords.json file.
+    """
+    keywords_file = os.path.join(job_dir, KEYWORDS_FILE_NAME)
+    with open(keywords_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    return keywords_file
+
+
+def load_keyword_index(job_dir):
+    """
+    Load a previously saved keyword index.
+
+    Args:
+        job_dir (str): The data/job-data/<job> directory.
+
+    Returns:
+        dict or None: The keyword index, or None if it has not been built yet.
+    """
+    keywords_file = os.path.join(job_dir, KEYWORDS_FILE_NAME)
+    if not os.path.exists(keywords_file):
+        return None
+    with open(keywords_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def get_or_build_keyword_index(job_content, job_dir, cfg=None):
+    """
+    Return the job's keyword index, building and saving it only when missing
+    or when the job description or the n-gram size changed.
+
+    Args:
+        job_content (str): Job description in Markdown format.
+        job_dir (str): The data/job-data/<job> directory.
+        cfg (dict): Configuration dictionary (uses the optional 'keywords' section).
+
+    Returns:
+        dict: The keyword index.
+    """
+    settings = (cfg or {}).get('keywords', {}) or {}
+    job_hash = hashlib.sha256(job_content.encode('utf-8')).hexdigest()[:16]
+
+    max_n = settings.get('ngram_max', 3)
+    index = load_keyword_index(job_dir)
+    if index and index.get('job_hash') == job_hash and index.get('ngram_max', 3) == max_n:
+        return index
+
+    index = build_keyword_index(
+        job_content,
+        top_k=settings.get('top_k', 25),
+        max_n=max_n,
+    )
+    save_keyword_index(index, job_dir)
+    return index
+
+
+def format_keywords_for_prompt(index):
+    """
+    Format the keyword index as a short Markdown block for prompts.
+
+    Args:
+        index (dict): Keyword index.
+
+    Returns:
+        str: Markdown listing the job's skills and key terms.
+    """
+    if not index:
+        return ""
+    lines = []
+    if index.get('skills'):
+        lines.append(f"- **Skills/Tools:** {', '.join(index['skills'])}")
+    if index.get('keywords'):
+        lines.append(f"- **Key Terms:** {', '.join(term for term, _ in index['keywords'])}")
+    return "\n".join(lines)
+
+
+def extract_skills(text, max_n=3):
+    """
+    Find the lexicon skills mentioned in a text.
+
+    Args:
+        text (str): Text in Markdown format.
+        max_n (int): Largest n-gram size considered.
+
+    Returns:
+        set: Canonical names of the skills found.
+    """
+    lexicon = load_skills_lexicon()
+    return {lexicon[gram] for gram in _ngrams(_tokenize_segments(text), max_n, strict=False) if gram in lexicon}
+
+
+def score_keyword_coverage(index, text):
+    """
+    Locally score how well a resume covers the job's keywords.
+
+    Skills count twice as much as other key terms. Terms are weighted by their
+    normalized TF-IDF score.
+
+    Args:
+        index (dict): Keyword index.
+        text (str): Resume content in Markdown format.
+
+    Returns:
+        dict: Coverage score (0-100) with the matched and missing skills and terms.
+    """
+    # Match with the n-gram size the index was built with
+    max_n = index.get('ngram_max', 3)
+    present = set(_ngrams(_tokenize_segments(text), max_n))
+    present_skills = extract_skills(text, max_n)
+
+    total = 0.0
+    covered = 0.0
+    matched, missing = [], []
+    for skill in index.get('skills', []):
+        total += 2.0
+        if skill in present_skills:
+            covered += 2.0
+            matched.append(skill)
+        else:
+            missing.append(skill)
+    for term, weight in index.get('keywords', []):
+        total += weight
+        if term in present:
+            covered += weight
+            matched.append(term)
+        else:
+            missing.append(term)
+
+    return {
+        "score": round(100 * covered / total, 1) if total else 0.0,
+        "matched": matched,
+        "missing": missing,
+    }
@@ -0,0 +1,192 @@
+"""
+Near-duplicate job detection.
+
+The same role is often posted on several job boards with small wording
+differences. Normalized job descriptions are shingled into word 3-grams and
+summarized with MinHash signatures, which are banded into an LSH index
+(data/job-data/near-dup-index.json) so a new posting is compared only with
+candidate postings instead of every job seen so far. A near-duplicate's
+strategies and final resumes can be reused for the new job.
+"""
+
+import os
+import sys
+import re
+import json
+import struct
+import hashlib
+import random
+from datetime import datetime
+
+
+NEAR_DUP_INDEX_FILE = os.path.join('data', 'job-data', 'near-dup-index.json')
+
+NUM_PERM = 128
+BANDS = 32
+SHINGLE_SIZE = 3
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+# Fixed seed so signatures stay comparable across runs
+_rng = random.Random(1)
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """
+    Split a text into word shingles.
+
+    Args:
+        text (str): Normalized job description.
+        size (int): Words per shingle.
+
+    Returns:
+        set: Space-joined word n-grams (the whole text for texts shorter than size).
+    """
+    words = re.findall(r"[a-z0-9+#]+", text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text):
+    """
+    Compute the MinHash signature of a text.
+
+    Args:
+        text (str): Normalized job description.
+
+    Returns:
+        list: NUM_PERM minimum hash values.
+    """
+    hashes = [struct.unpack('<I', hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest())[0]
+              for shingle in shingles(text)]
+    if not hashes:
+        return [MAX_HASH] * NUM_PERM
+    return [min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes) for a, b in PERMUTATIONS]
+
+
+def estimate_similarity(signature, other):
+    """
+    Estimate the Jaccard similarity of two texts from their signatures.
+
+    Returns:
+        float: Fraction of equal signature values (0-1).
+    """
+    return sum(1 for x, y in zip(signature, other) if x == y) / float(len(signature))
+
+
+def band_keys(signature, bands=BANDS):
+    """
+    Hash the bands of a signature into LSH bucket keys.
+
+    Args:
+        signature (list): MinHash signature.
+        bands (int): Number of bands.
+
+    Returns:
+        list: One bucket key per band.
+    """
+    rows = len(signature) // bands
+    return [
+        f"{band}:" + hashlib.md5(json.dumps(signature[band * rows:(band + 1) * rows]).encode('utf-8')).hexdigest()[:12]
+        for band in range(bands)
+    ]
+
+
+def load_near_dup_index(index_file=NEAR_DUP_INDEX_FILE):
+    """
+    Load the near-duplicate index.
+
+    Returns:
+        dict: {'jobs': {job_id: record}, 'buckets': {band key: [job_id, ...]}}
+    """
+    if os.path.exists(index_file):
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            pass
+    return {"jobs": {}, "buckets": {}}
+
+
+def find_near_duplicates(signature, profile_hash, threshold=0.8, min_strategies=0, index_file=NEAR_DUP_INDEX_FILE):
+    """
+    Find indexed jobs that are near-duplicates of a new job.
+
+    Only jobs generated for the same profile are returned, since their
+    strategies and resumes are reused as they are.
+
+    Args:
+        signature (list): MinHash signature of the new job.
+        profile_hash (str): Hash of the profile the new job is generated for.
+        threshold (float): Minimum estimated Jaccard similarity.
+        min_strategies (int): Minimum number of strategies the job must have (the new run's content-gen.iter).
+        index_file (str): Path of the near-duplicate index.
+
+    Returns:
+        list: Matching job records with a 'similarity' key, most similar first. Archived jobs
+            (utils/job_archive.py) are included; their artifacts are read from the archive.
+    """
+    from utils.job_archive import is_archived
+
+    index = load_near_dup_index(index_file)
+    candidates = {job_id for key in band_keys(signature) for job_id in index["buckets"].get(key, [])}
+
+    matches = []
+    for job_id in candidates:
+        record = index["jobs"].get(job_id)
+        if not record or record.get("profile_hash") != profile_hash:
+            continue
+        # Its strategies are reused one per resume, so it needs at least as many as the new run
+        if record.get("strategies", 0) < min_strategies:
+            continue
+        if not os.path.isdir(record["job_dir"]) and not is_archived(record["job_dir"]):
+            continue
+        similarity = estimate_similarity(signature, record["signature"])
+        if similarity >= threshold:
+            matches.append(dict(record, job_id=job_id, similarity=round(similarity, 3)))
+    return sorted(matches, key=lambda match: -match["similarity"])
+
+
+def add_job(job_id, signature, record, index_file=NEAR_DUP_INDEX_FILE):
+    """
+    Add a finished job to the near-duplicate index.
+
+    Args:
+        job_id (str): Job identifier (the data/job-data/<job> directory name).
+        signature (list): MinHash signature of the job.
+        record (dict): Job details ('job_dir', 'version_dir', 'profile_hash', 'strategies', ...).
+        index_file (str): Path of the near-duplicate index.
+    """
+    index = load_near_dup_index(index_file)
+    index["jobs"][job_id] = dict(record, signature=signature, created=datetime.now().isoformat(timespec='seconds'))
+    for key in band_keys(signature):
+        bucket = index["buckets"].setdefault(key, [])
+        if job_id not in bucket:
+            bucket.append(job_id)
+    os.makedirs(os.path.dirname(index_file), exist_ok=True)
+    temp_file = f"{index_file}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+    os.replace(temp_file, index_file)
+
+
+def confirm_reuse(match, mode="ask"):
+    """
+    Decide whether to reuse a near-duplicate job's strategies and resumes.
+
+    Args:
+        match (dict): Matching job record from find_near_duplicates.
+        mode (str): 'always', 'never' or 'ask' (prompt on an interactive terminal, otherwise do not reuse).
+
+    Returns:
+        bool: True if the job should be reused.
+    """
+    print(f"🔁 Near-duplicate of {match['job_dir']} found (similarity {match['similarity']:.0%}).")
+    if mode == "always":
+        return True
+    if mode == "never" or not sys.stdin.isatty():
+        return False
+    answer = input("Reuse its strategies and final resumes as the starting drafts? [y/N] ")
+    return answer.strip().lower() in ("y", "yes")
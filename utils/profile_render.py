@@ -0,0 +1,145 @@
+"""
+Local rendering of the factual resume sections.
+
+The name/contact header, Education and Certifications are taken straight from
+the profile JSON written by profile-gen.py, so they are rendered locally
+(in the same style as profile-gen.py's convert_to_markdown) and merged into
+each generated resume instead of being written by the LLM.
+"""
+
+import os
+import json
+
+from utils.resume_sections import parse_resume_sections, render_resume_sections
+
+
+# Canonical resume sections rendered locally (see utils/resume_sections.py)
+LOCAL_SECTIONS = ("education", "certifications")
+
+
+def find_profile_json(profile_file):
+    """
+    Find the profile JSON for a profile file.
+
+    Markdown profiles are matched to the JSON file with the same name in
+    profiles/json, as written together by profile-gen.py.
+
+    Args:
+        profile_file (str): Path of the profile file (.json or .md).
+
+    Returns:
+        str or None: Path of the profile JSON, or None if there is none.
+    """
+    if profile_file.endswith('.json'):
+        return profile_file if os.path.exists(profile_file) else None
+    base_name = os.path.splitext(os.path.basename(profile_file))[0]
+    profiles_dir = os.path.dirname(os.path.dirname(os.path.abspath(profile_file)))
+    json_file = os.path.join(profiles_dir, 'json', f'{base_name}.json')
+    return json_file if os.path.exists(json_file) else None
+
+
+def load_profile_json(profile_json_file):
+    """
+    Load a profile JSON file.
+
+    Args:
+        profile_json_file (str): Path of the profile JSON.
+
+    Returns:
+        dict: The profile data.
+    """
+    with open(profile_json_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def render_header(data):
+    """
+    Render the resume name and contact block.
+
+    Args:
+        data (dict): Profile data.
+
+    Returns:
+        str: Markdown header with the name and a single contact line.
+    """
+    info = data.get('personal_info', {})
+    name = f"{info.get('first_name', '')} {info.get('last_name', '')}".strip()
+    contact = [info.get(key, '').strip() for key in ('email', 'phone', 'location', 'linkedin', 'github')]
+    md_content = f"# {name}\n"
+    if any(contact):
+        md_content += "\n" + " | ".join(item for item in contact if item) + "\n"
+    return md_content
+
+
+def render_education(data):
+    """
+    Render the Education section.
+
+    Args:
+        data (dict): Profile data.
+
+    Returns:
+        str: Markdown body of the Education section (without the '##' header), or '' if empty.
+    """
+    md_content = ""
+    for edu in data.get('education', []):
+        md_content += f"### {edu['field']} | {edu['institute']}\n"
+        md_content += f"{edu['start_date']} - {edu['graduation_date']}\n\n"
+    return md_content.strip()
+
+
+def render_certifications(data):
+    """
+    Render the Certifications section.
+
+    Args:
+        data (dict): Profile data.
+
+    Returns:
+        str: Markdown body of the Certifications section (without the '##' header), or '' if empty.
+    """
+    md_content = ""
+    for cert in data.get('certifications', []):
+        md_content += f"- **{cert['name']}** - {cert['company']}\n"
+    return md_content.strip()
+
+
+def render_factual_sections(data):
+    """
+    Render every locally rendered section.
+
+    Args:
+        data (dict): Profile data.
+
+    Returns:
+        dict: {'header': str, 'education': str, 'certifications': str}
+    """
+    return {
+        "header": render_header(data),
+        "education": render_education(data),
+        "certifications": render_certifications(data),
+    }
+
+
+def merge_factual_sections(resume_content, factual):
+    """
+    Merge locally rendered sections into a generated resume.
+
+    Any header, Education or Certifications section written by the LLM is
+    replaced. Education and Certifications are placed after the generated
+    sections.
+
+    Args:
+        resume_content (str): Generated resume content in Markdown format.
+        factual (dict): Sections from render_factual_sections.
+
+    Returns:
+        str: Resume content in Markdown format.
+    """
+    tree = parse_resume_sections(resume_content)
+    tree["preamble"] = factual["header"].strip()
+    tree["sections"] = [section for section in tree["sections"] if section["key"] not in LOCAL_SECTIONS]
+    for key, title in (("education", "Education"), ("certifications", "Certifications")):
+        if factual.get(key):
+            tree["sections"].append({"title": title, "key": key, "body": factual[key] + "\n", "children": []})
+    return render_resume_sections(tree)
@@ -0,0 +1,304 @@
+"""
+Relevance-based profile slicing.
+
+Splits a profile Markdown file (as written by profile-gen.py) into sections,
+indexes experience entries, projects, skill groups and certifications with
+BM25, and selects the most relevant subset for a job or strategy within a
+token budget. Identity and education are always kept. The selection is
+recorded in profile_slices.json so the evaluation sees the same slice.
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+from collections import Counter
+
+from utils.keywords import TOKEN_PATTERN, STOPWORDS
+
+
+PROFILE_SLICES_FILE_NAME = 'profile_slices.json'
+
+# Sections that are always kept in full
+ALWAYS_KEEP_SECTIONS = ('personal information', 'contact', 'summary', 'education', 'additional information')
+
+# Sections whose entries are ranked individually. Bullet sections are split per bullet.
+ENTRY_SECTIONS = ('experience', 'work experience', 'projects', 'skills')
+BULLET_SECTIONS = ('certifications',)
+
+
+def estimate_tokens(text):
+    """
+    Roughly estimate the number of tokens in a text (about 4 characters per token).
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: Estimated token count.
+    """
+    return (len(text) + 3) // 4
+
+
+def _tokenize(text):
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def parse_profile_units(profile_md):
+    """
+    Split a profile Markdown document into selectable units.
+
+    Args:
+        profile_md (str): Applicant profile in Markdown format.
+
+    Returns:
+        list: Units as dicts with 'id', 'section', 'text' and 'always' (always kept).
+            Returns an empty list if the profile has no '##' sections (e.g. JSON).
+    """
+    lines = profile_md.splitlines()
+    if not any(line.startswith('## ') for line in lines):
+        return []
+
+    # Group lines into top-level sections; the preamble holds the name heading
+    sections = [('identity', [])]
+    for line in lines:
+        if line.startswith('## '):
+            sections.append((line[3:].strip().rstrip(':'), [line]))
+        else:
+            sections[-1][1].append(line)
+
+    units = []
+    for name, section_lines in sections:
+        key = name.lower()
+        slug = re.sub(r'[^a-z0-9]+', '-', key).strip('-')
+        always = key == 'identity' or key in ALWAYS_KEEP_SECTIONS
+
+        if not always and key in ENTRY_SECTIONS:
+            header, entries = [section_lines[0]], []
+            for line in section_lines[1:]:
+                if line.startswith('### '):
+                    entries.append([line])
+                elif entries:
+                    entries[-1].append(line)
+                else:
+                    header.append(line)
+            if entries:
+                units.append({"id": f"{slug}", "section": name, "text": "\n".join(header).rstrip() + "\n", "always": True, "header": True})
+                for i, entry in enumerate(entries):
+                    units.append({"id": f"{slug}:{i}", "section": name, "text": "\n".join(entry).rstrip() + "\n", "always": False})
+                continue
+
+        if not always and key in BULLET_SECTIONS:
+            header = [section_lines[0]]
+            bullets = [line for line in section_lines[1:] if line.lstrip().startswith(('- ', '* '))]
+            if bullets:
+                units.append({"id": f"{slug}", "section": name, "text": "\n".join(header) + "\n", "always": True, "header": True})
+                for i, bullet in enumerate(bullets):
+                    units.append({"id": f"{slug}:{i}", "section": name, "text": bullet + "\n", "always": False, "bullet": True})
+                continue
+
+        text = "\n".join(section_lines).rstrip()
+        if text:
+            units.append({"id": slug, "section": name, "text": text + "\n", "always": always})
+
+    return units
+
+
+class ProfileSlicer:
+    """
+    BM25 index over the selectable units of a profile.
+    """
+
+    def __init__(self, profile_md, token_budget=1500, k1=1.5, b=0.75, token_counter=None):
+        """
+        Index the profile.
+
+        Args:
+            profile_md (str): Applicant profile in Markdown format.
+            token_budget (int): Maximum tokens of a slice.
+            k1 (float): BM25 term frequency saturation.
+            b (float): BM25 length normalization.
+            token_counter (callable): Optional text -> token count function
+                (defaults to estimate_tokens).
+        """
+        self.profile_md = profile_md
+        self.token_budget = token_budget
+        self.count_tokens = token_counter or estimate_tokens
+        self.k1 = k1
+        self.b = b
+        self.units = parse_profile_units(profile_md)
+        self.units_by_id = {unit['id']: unit for unit in self.units}
+
+        self._term_freqs = {}
+        doc_freq = Counter()
+        for unit in self.units:
+            if unit['always']:
+                continue
+            tf = Counter(_tokenize(unit['text']))
+            self._term_freqs[unit['id']] = (tf, sum(tf.values()))
+            doc_freq.update(tf.keys())
+        self._num_docs = len(self._term_freqs)
+        self._avg_len = (sum(length for _, length in self._term_freqs.values()) / self._num_docs) if self._num_docs else 0
+        self._idf = {
+            term: math.log(1 + (self._num_docs - df + 0.5) / (df + 0.5))
+            for term, df in doc_freq.items()
+        }
+
+    @property
+    def enabled(self):
+        """bool: Whether the profile could be split into units."""
+        return bool(self.units)
+
+    def score(self, query):
+        """
+        Score every rankable unit against a query.
+
+        Args:
+            query (str): Free text query (job keywords and/or strategy).
+
+        Returns:
+            dict: Mapping of unit id to BM25 score.
+        """
+        query_terms = Counter(_tokenize(query))
+        scores = {}
+        for unit_id, (tf, length) in self._term_freqs.items():
+            score = 0.0
+            for term, query_count in query_terms.items():
+                freq = tf.get(term)
+                if not freq:
+                    continue
+                norm = freq * (self.k1 + 1) / (freq + self.k1 * (1 - self.b + self.b * length / (self._avg_len or 1)))
+                score += self._idf[term] * norm * query_count
+            scores[unit_id] = score
+        return scores
+
+    def select(self, query, token_budget=None):
+        """
+        Select the always-kept units plus the most relevant units within the token budget.
+
+        Args:
+            query (str): Free text query (job keywords and/or strategy).
+            token_budget (int): Optional override of the slicer's token budget.
+
+        Returns:
+            list: Selected unit ids in profile order.
+        """
+        if not self.enabled:
+            return []
+        budget = self.token_budget if token_budget is None else token_budget
+
+        selected = {unit['id'] for unit in self.units if unit['always'] and not unit.get('header')}
+        used = sum(self.count_tokens(self.units_by_id[unit_id]['text']) for unit_id in selected)
+
+        scores = self.score(query)
+        for unit_id in sorted(scores, key=lambda uid: (-scores[uid], self._position(uid))):
+            unit = self.units_by_id[unit_id]
+            cost = self.count_tokens(unit['text'])
+            header_id = unit['id'].split(':')[0]
+            if header_id != unit_id and header_id not in selected:
+                cost += self.count_tokens(self.units_by_id[header_id]['text'])
+            if used + cost > budget:
+                continue
+            selected.update((unit_id, header_id))
+            used += cost
+
+        return [unit['id'] for unit in self.units if unit['id'] in selected]
+
+    def render(self, unit_ids):
+        """
+        Render selected units back to Markdown.
+
+        Args:
+            unit_ids (list): Unit ids to render.
+
+        Returns:
+            str: The profile slice in Markdown format, or the full profile if
+                the profile could not be split.
+        """
+        if not self.enabled:
+            return self.profile_md
+        wanted = set(unit_ids)
+        rendered = ""
+        for unit in self.units:
+            if unit['id'] not in wanted:
+                continue
+            # Keep consecutive bullets together, separate everything else by a blank line
+            rendered += unit['text'] if unit.get('bullet') and rendered.endswith('\n') and rendered[-2:] != '\n\n' else "\n" + unit['text']
+        return rendered.strip() + "\n"
+
+    def _position(self, unit_id):
+        return next(i for i, unit in enumerate(self.units) if unit['id'] == unit_id)
+
+
+def build_profile_slices(profile_md, keyword_index, strategies, cfg=None, token_counter=None):
+    """
+    Select the profile slice for the job and for each strategy.
+
+    Args:
+        profile_md (str): Applicant profile in Markdown format.
+        keyword_index (dict): Job keyword index from utils/keywords.py.
+        strategies (list): Strategy texts, or an empty list before strategies exist.
+        cfg (dict): Configuration dictionary (uses the optional 'profile-slice' section).
+        token_counter (callable): Optional text -> token count function.
+
+    Returns:
+        dict: Slice record with the 'job' slice, per-strategy slices and the
+            'eval' slice (union of all strategy slices).
+    """
+    settings = (cfg or {}).get('profile-slice', {}) or {}
+    slicer = ProfileSlicer(profile_md, token_budget=settings.get('token_budget', 1500), token_counter=token_counter)
+
+    job_query = " ".join(keyword_index.get('skills', []) + [term for term, _ in keyword_index.get('keywords', [])])
+    record = {
+        "profile_hash": hashlib.sha256(profile_md.encode('utf-8')).hexdigest()[:16],
+        "token_budget": slicer.token_budget,
+        "enabled": slicer.enabled and settings.get('enabled', True),
+        "job": slicer.select(job_query),
+        "strategies": {},
+    }
+    for i, strategy in enumerate(strategies):
+        record["strategies"][str(i + 1)] = slicer.select(f"{job_query} {strategy}")
+
+    eval_ids = set(record["job"])
+    for unit_ids in record["strategies"].values():
+        eval_ids.update(unit_ids)
+    record["eval"] = [unit['id'] for unit in slicer.units if unit['id'] in eval_ids]
+    return record
+
+
+def render_profile_slice(profile_md, record, key):
+    """
+    Render a recorded profile slice.
+
+    Args:
+        profile_md (str): Applicant profile in Markdown format.
+        record (dict): Slice record from build_profile_slices.
+        key (str or int): 'job', 'eval' or a 1-based strategy number.
+
+    Returns:
+        str: The profile slice in Markdown format (the full profile when slicing is disabled).
+    """
+    if not record or not record.get('enabled'):
+        return profile_md
+    unit_ids = record['strategies'].get(str(key)) if str(key).isdigit() else record.get(key)
+    if not unit_ids:
+        return profile_md
+    return ProfileSlicer(profile_md).render(unit_ids)
+
+
+def save_profile_slices(record, job_dir):
+    """
+    Save the slice record as profile_slices.json in the job directory.
+
+    Args:
+        record (dict): Slice record from build_profile_slices.
+        job_dir (str): The data/job-data/<job> directory.
+
+    Returns:
+        str: Path of the written file.
+    """
+    slices_file = os.path.join(job_dir, PROFILE_SLICES_FILE_NAME)
+    with open(slices_file, 'w', encoding='utf-8') as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+    return slices_file
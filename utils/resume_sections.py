@@ -0,0 +1,267 @@
+"""
+Resume section tree and section-level patching.
+
+Represents a generated resume as a tree of '##' sections (with '###' children)
+parsed from its Markdown headers, finds the sections an evaluation flagged
+for a resume, and applies section replacements returned by the LLM locally so
+improvement iterations only regenerate what changed.
+"""
+
+import re
+
+from utils.md_parser import parse_code_from_md
+
+
+# Canonical section names and the header titles that map to them
+SECTION_ALIASES = {
+    "summary": ("professional summary", "summary", "profile summary", "objective", "about me", "career summary"),
+    "skills": ("technical skills", "core competencies", "skills", "competencies", "technologies"),
+    "experience": ("work experience", "professional experience", "employment history", "experience", "work history"),
+    "projects": ("projects", "personal projects", "key projects", "academic projects"),
+    "education": ("education", "academic background"),
+    "certifications": ("certifications", "certificates", "licenses", "certification"),
+}
+
+
+def canonical_section(title):
+    """
+    Map a section title to its canonical name.
+
+    Args:
+        title (str): Section header text.
+
+    Returns:
+        str: Canonical section name, or the lowercased title if it is not a known section.
+    """
+    lowered = re.sub(r'[^a-z0-9& ]+', ' ', title.lower()).strip()
+    lowered = re.sub(r'\s+', ' ', lowered)
+    for canonical, aliases in SECTION_ALIASES.items():
+        if lowered in aliases:
+            return canonical
+    for canonical, aliases in SECTION_ALIASES.items():
+        if any(alias in lowered for alias in aliases):
+            return canonical
+    return lowered
+
+
+def unwrap_markdown(content):
+    """
+    Return the resume Markdown without a surrounding ```markdown code fence.
+
+    Args:
+        content (str): Resume content, possibly wrapped in a code block.
+
+    Returns:
+        str: Plain resume Markdown.
+    """
+    stripped = content.strip()
+    if stripped.startswith("```"):
+        blocks = parse_code_from_md(stripped)
+        if blocks:
+            return max(blocks, key=len).strip()
+    return stripped
+
+
+def parse_resume_sections(content):
+    """
+    Parse resume Markdown into a section tree.
+
+    Args:
+        content (str): Resume content in Markdown format.
+
+    Returns:
+        dict: {'preamble': str, 'sections': [{'title', 'key', 'body', 'children': [{'title', 'body'}]}]}
+            where 'body' is the text under the header (without the header line).
+    """
+    tree = {"preamble": "", "sections": []}
+    preamble = []
+    current = None
+    for line in unwrap_markdown(content).splitlines():
+        if line.startswith("## "):
+            title = line[3:].strip()
+            current = {"title": title, "key": canonical_section(title), "body": "", "children": []}
+            tree["sections"].append(current)
+        elif current is None:
+            preamble.append(line)
+        else:
+            current["body"] += line + "\n"
+            if line.startswith("### "):
+                current["children"].append({"title": line[4:].strip(), "body": ""})
+            elif current["children"]:
+                current["children"][-1]["body"] += line + "\n"
+    tree["preamble"] = "\n".join(preamble).strip()
+    return tree
+
+
+def render_resume_sections(tree):
+    """
+    Render a section tree back to Markdown.
+
+    Args:
+        tree (dict): Section tree from parse_resume_sections.
+
+    Returns:
+        str: Resume content in Markdown format.
+    """
+    parts = [tree["preamble"]] if tree["preamble"] else []
+    for section in tree["sections"]:
+        parts.append(f"## {section['title']}\n\n{section['body'].strip()}".rstrip())
+    return "\n\n".join(parts).strip() + "\n"
+
+
+def extract_resume_feedback(eval_response, resume_number):
+    """
+    Extract the part of a combined evaluation that is about one resume.
+
+    Args:
+        eval_response (str): Evaluation feedback for all resumes in Markdown format.
+        resume_number (int): 1-based resume number.
+
+    Returns:
+        str: The resume's evaluation blocks plus any summary lines mentioning it,
+            or the whole evaluation if the resume could not be located.
+    """
+    mention = re.compile(rf"resume\s*#?\s*{resume_number}\b", re.IGNORECASE)
+    any_resume = re.compile(r"resume\s*#?\s*\d+\b", re.IGNORECASE)
+
+    blocks = re.split(r"(?m)^(?=#{1,6} )", eval_response)
+    selected = []
+    for block in blocks:
+        heading = block.splitlines()[0] if block.strip() else ""
+        if heading.startswith("#") and mention.search(heading):
+            selected.append(block.strip())
+        elif not (heading.startswith("#") and any_resume.search(heading)):
+            # Ranked lists and summaries mention every resume on their own line
+            lines = [line for line in block.splitlines() if mention.search(line)]
+            if lines:
+                selected.append("\n".join(lines))
+    return "\n\n".join(selected) if selected else eval_response
+
+
+# Leading heading marks, bullets, numbering and bold/italic markers of a feedback line
+_LINE_LEAD = re.compile(r"^\s*(?:#{1,6}\s+|[-*+]\s+|\d+[.)]\s+)*(?:[*_]{1,2}\s*)?")
+
+
+def _addressed_names(feedback):
+    """
+    Collect the text of the feedback that addresses a section directly.
+
+    Returns:
+        tuple: (lowercased heading lines, lowercased line starts with list and
+            emphasis markers removed, lowercased 'Section: ...' references)
+    """
+    headings, line_starts, references = [], [], []
+    for line in feedback.lower().splitlines():
+        if not line.strip():
+            continue
+        if line.lstrip().startswith("#"):
+            headings.append(line.strip("# \t"))
+        line_starts.append(_LINE_LEAD.sub("", line))
+        references += re.findall(r"\bsections?\s*[*_]*\s*:\s*[*_]*\s*([^\n.;]+)", line)
+    return headings, line_starts, references
+
+
+def flagged_sections(feedback, tree, exclude=()):
+    r"""
+    Find the resume sections the feedback addresses directly.
+
+    A section counts when a feedback heading names it, a suggestion line starts
+    with it ("- **Skills:** add Kafka") or a "Section: Skills" reference names
+    it. The evaluation prompt (llm/agent/eval.py) ends each resume's feedback
+    with such "Section:" lines. Names inside ordinary sentences ("Move Projects
+    above Education") do not count; feedback without any direct reference
+    flags nothing and the caller falls back to a full rewrite.
+
+    Args:
+        feedback (str): Evaluation feedback for one resume.
+        tree (dict): Section tree of that resume.
+        exclude (tuple): Canonical section names that must never be flagged.
+
+    Returns:
+        list: Titles of the flagged sections, in resume order.
+
+    Example:
+        >>> tree = parse_resume_sections(
+        ...     "# Jane Doe\n\n## Summary\n\nEngineer.\n\n## Skills\n\nPython\n\n"
+        ...     "## Experience\n\n- Built things\n\n## Projects\n\n- Tool\n\n## Education\n\nBSc")
+        >>> feedback = (
+        ...     "### Resume 1\n"
+        ...     "**ATS Compatibility:** 78. The skills listed match the experience required.\n"
+        ...     "Suggestions:\n"
+        ...     "- **Skills:** add Kafka and Airflow from the job keywords.\n"
+        ...     "- Move Projects above Education to highlight recent work.\n"
+        ...     "- Section: Experience - quantify the pipeline latency results.\n")
+        >>> flagged_sections(feedback, tree)
+        ['Skills', 'Experience']
+
+        An evaluation response with the "Section:" lines the eval prompt asks for:
+
+        >>> eval_response = (
+        ...     "### 1. Resume 1\n"
+        ...     "**Match with Job Keywords (72):** Kafka and Airflow are missing.\n"
+        ...     "- Add Kafka and Airflow to the Skills section.\n"
+        ...     "- Quantify the achievements in the Experience section.\n"
+        ...     "Section: Skills\n"
+        ...     "Section: Experience\n\n"
+        ...     "### 2. Resume 2\n"
+        ...     "- Shorten the Summary.\n"
+        ...     "Section: Summary\n\n"
+        ...     "## Ranked List\n"
+        ...     "1. Resume 2 - 84\n"
+        ...     "2. Resume 1 - 80\n")
+        >>> flagged_sections(extract_resume_feedback(eval_response, 1), tree)
+        ['Skills', 'Experience']
+        >>> flagged_sections("- Add Kafka and Airflow to the Skills section.", tree)
+        []
+    """
+    headings, line_starts, references = _addressed_names(feedback)
+    flagged = []
+    for section in tree["sections"]:
+        if section["key"] in exclude:
+            continue
+        names = SECTION_ALIASES.get(section["key"], ()) + (section["title"].lower(),)
+        patterns = [re.compile(rf"\b{re.escape(name)}\b") for name in names]
+        starts = [re.compile(rf"{re.escape(name)}\b") for name in names]
+        if (any(pattern.search(heading) for pattern in patterns for heading in headings if not re.search(r"resume\s*#?\s*\d", heading))
+                or any(start.match(line) for start in starts for line in line_starts)
+                or any(start.match(reference.strip()) for start in starts for reference in references)):
+            flagged.append(section["title"])
+    return flagged
+
+
+def apply_section_patches(previous_content, patch_content, allowed_titles):
+    """
+    Apply section replacements to a resume.
+
+    Sections in the patch replace the section with the same canonical name in
+    the previous resume. Sections that do not exist yet are appended. Patches
+    for sections that were not requested are ignored.
+
+    Args:
+        previous_content (str): Previous resume content in Markdown format.
+        patch_content (str): LLM response containing replacement '##' sections.
+        allowed_titles (list): Titles of the sections that were requested.
+
+    Returns:
+        tuple: (patched resume Markdown, list of applied section titles). The
+            resume is None if the patch contained no usable section.
+    """
+    tree = parse_resume_sections(previous_content)
+    patch = parse_resume_sections(patch_content)
+    allowed = {canonical_section(title) for title in allowed_titles}
+
+    applied = []
+    for replacement in patch["sections"]:
+        if replacement["key"] not in allowed or not replacement["body"].strip():
+            continue
+        target = next((section for section in tree["sections"] if section["key"] == replacement["key"]), None)
+        if target is None:
+            tree["sections"].append(replacement)
+        else:
+            target["body"] = replacement["body"]
+            target["children"] = replacement["children"]
+        applied.append(replacement["title"])
+
+    if not applied:
+        return None, []
+    return render_resume_sections(tree), applied
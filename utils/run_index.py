@@ -0,0 +1,143 @@
+"""
+Run-level memoization.
+
+Each pipeline run is fingerprinted by hashes of the normalized job
+description, the profile and the configuration that affects the generated
+resumes. Finished runs are recorded in data/job-data/run-index.json so the
+same posting and profile submitted again return the existing results instead
+of rerunning the pipeline.
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+
+
+RUN_INDEX_FILE = os.path.join('data', 'job-data', 'run-index.json')
+
+# Config sections that change the generated resumes (output.workers only changes speed)
+RUN_CONFIG_KEYS = (
+    'agent', 'improv-rate', 'output', 'keywords', 'profile-slice', 'profile-render',
+    'budget', 'layout', 'verify', 'normalize',
+)
+
+
+def _sha256(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def config_subset(cfg):
+    """
+    Select the part of the configuration that affects the generated resumes.
+
+    Args:
+        cfg (dict): Configuration dictionary.
+
+    Returns:
+        dict: The relevant config sections.
+    """
+    subset = {key: cfg[key] for key in RUN_CONFIG_KEYS if key in cfg}
+    if isinstance(subset.get('output'), dict):
+        subset['output'] = {key: value for key, value in subset['output'].items() if key != 'workers'}
+    return subset
+
+
+def profile_fingerprint(profile_content, profile_data=None):
+    """
+    Hash the applicant's profile.
+
+    Args:
+        profile_content (str): Content of the profile file.
+        profile_data (dict): Profile JSON data used alongside a Markdown profile, if any.
+
+    Returns:
+        str: Hex hash of the profile.
+    """
+    return _sha256(profile_content + json.dumps(profile_data, sort_keys=True))
+
+
+def compute_run_fingerprint(job_content, profile_content, cfg, profile_data=None):
+    """
+    Fingerprint a pipeline run.
+
+    Args:
+        job_content (str): Normalized job description.
+        profile_content (str): Content of the profile file.
+        cfg (dict): Configuration dictionary.
+        profile_data (dict): Profile JSON data used alongside a Markdown profile, if any.
+
+    Returns:
+        str: Hex fingerprint of the job, profile and config hashes.
+    """
+    parts = {
+        "job": _sha256(job_content.strip()),
+        "profile": profile_fingerprint(profile_content, profile_data),
+        "config": _sha256(json.dumps(config_subset(cfg), sort_keys=True, default=str)),
+    }
+    return _sha256(json.dumps(parts, sort_keys=True))[:24]
+
+
+def load_run_index(index_file=RUN_INDEX_FILE):
+    """
+    Load the run index.
+
+    Returns:
+        dict: Fingerprint to run record (empty if there is no index yet).
+    """
+    if not os.path.exists(index_file):
+        return {}
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+
+def lookup_run(fingerprint, index_file=RUN_INDEX_FILE):
+    """
+    Find a finished run with the same fingerprint.
+
+    Args:
+        fingerprint (str): Run fingerprint.
+        index_file (str): Path of the run index.
+
+    Returns:
+        dict or None: The run record, or None if there is none or its resume files no longer exist.
+            Records of archived runs (utils/job_archive.py) have 'archived' set to True.
+    """
+    from utils.job_archive import is_archived
+
+    record = load_run_index(index_file).get(fingerprint)
+    if not record:
+        return None
+    files = record.get('resumes', []) + record.get('rendered', [])
+    if not files:
+        return None
+    if all(os.path.exists(path) for path in files):
+        return dict(record, archived=False)
+    if is_archived(record['job_dir'], files):
+        return dict(record, archived=True)
+    return None
+
+
+def record_run(fingerprint, record, index_file=RUN_INDEX_FILE):
+    """
+    Record a finished run in the run index.
+
+    Args:
+        fingerprint (str): Run fingerprint.
+        record (dict): Run details ('job_dir', 'version_dir', 'resumes', 'rendered', ...).
+        index_file (str): Path of the run index.
+
+    Returns:
+        dict: The stored record.
+    """
+    index = load_run_index(index_file)
+    index[fingerprint] = dict(record, created=datetime.now().isoformat(timespec='seconds'))
+    os.makedirs(os.path.dirname(index_file), exist_ok=True)
+    temp_file = f"{index_file}.tmp"
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+    os.replace(temp_file, index_file)
+    return index[fingerprint]